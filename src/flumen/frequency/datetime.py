@@ -1,31 +1,187 @@
-from typing import Optional
+import threading
+from collections import OrderedDict
+from datetime import tzinfo
+from functools import lru_cache
+from typing import Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
-import pandas_market_calendars as mcal
 import pendulum
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
 
-from flumen.models.frequency import PANDAS_FREQ_UNIT, Frequency
+from flumen.frequency.session import (
+    get_bars,
+    get_exchange,
+    get_session_bounds,
+    get_sessions,
+    is_daily_frequency,
+)
+from flumen.models.frequency import MARKET_FREQ_UNIT, PANDAS_FREQ_UNIT, Frequency
+
+CALENDAR_CACHE_SIZE = 64
+
+_CachedCalendar = Tuple[pendulum.DateTime, pendulum.DateTime, np.ndarray]
+_calendars: "OrderedDict[Frequency, _CachedCalendar]" = OrderedDict()
+_calendars_lock = threading.Lock()
+_EMPTY_RANGE = np.empty(0, dtype=np.int64)
+_EMPTY_RANGE.flags.writeable = False
+
+
+def is_right_labelled(freq: Frequency) -> bool:
+    return freq.unit.unit_type == MARKET_FREQ_UNIT and not is_daily_frequency(
+        freq.to_str()
+    )
+
+
+def _session_dates(
+    start_datetime: pendulum.DateTime, end_datetime: pendulum.DateTime
+) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    return (
+        pd.Timestamp(start_datetime.in_tz("UTC").to_date_string()),
+        pd.Timestamp(end_datetime.in_tz("UTC").to_date_string()),
+    )
+
+
+def session_range(
+    freq: Frequency,
+    start_datetime: pendulum.DateTime,
+    end_datetime: pendulum.DateTime,
+) -> np.ndarray:
+    start_date, end_date = _session_dates(start_datetime, end_datetime)
+    return get_sessions(freq.unit.market_exchange, start_date, end_date)
 
 
 def date_range(
     freq: Frequency,
     start_datetime: pendulum.DateTime,
     end_datetime: pendulum.DateTime,
-    from_tz: Optional[str] = "UTC",
+    from_tz: Optional[Union[str, tzinfo]] = "UTC",
 ) -> pd.DatetimeIndex:
+    if freq.unit.unit_type == PANDAS_FREQ_UNIT:
+        dts = pd.date_range(
+            start_datetime.in_tz("UTC").to_datetime_string(),
+            end_datetime.in_tz("UTC").to_datetime_string(),
+            freq=freq.raw_str,
+            tz=from_tz,
+        )
+    else:
+        start_date, end_date = _session_dates(start_datetime, end_datetime)
+        bars = get_bars(freq.unit.market_exchange, freq.to_str(), start_date, end_date)
+        dts = pd.DatetimeIndex(bars, tz="UTC")
+    return dts.tz_convert("UTC")
 
-    start_datetime = start_datetime.in_tz("UTC").to_datetime_string()
-    end_datetime = end_datetime.in_tz("UTC").to_datetime_string()
 
+def _read_only_range(
+    freq: Frequency,
+    start_datetime: pendulum.DateTime,
+    end_datetime: pendulum.DateTime,
+    from_tz: Optional[Union[str, tzinfo]] = "UTC",
+) -> np.ndarray:
+    values = date_range(freq, start_datetime, end_datetime, from_tz=from_tz).asi8
+    values.flags.writeable = False
+    return values
+
+
+def _slice_calendar(
+    values: np.ndarray, bounds: Tuple[int, int]
+) -> Optional[np.ndarray]:
+    start = int(values.searchsorted(bounds[0], "left"))
+    stop = int(values.searchsorted(bounds[1], "right"))
+    if stop <= start or values[start] != bounds[0] or values[stop - 1] != bounds[1]:
+        return None
+    return values[start:stop]
+
+
+def date_range_values(
+    freq: Frequency,
+    start_datetime: pendulum.DateTime,
+    end_datetime: pendulum.DateTime,
+    from_tz: Optional[Union[str, tzinfo]] = "UTC",
+) -> np.ndarray:
+    if str(from_tz) != "UTC":
+        return _local_date_range_values(freq, start_datetime, end_datetime, from_tz)
+    bounds = date_range_bounds(freq, start_datetime, end_datetime)
+    if bounds is None:
+        return _EMPTY_RANGE
+    # One calendar per frequency is extended to cover the requested ranges and
+    # sliced, so overlapping windows share memory instead of regenerating.
+    with _calendars_lock:
+        cached = _calendars.get(freq)
+        if cached is not None:
+            _calendars.move_to_end(freq)
+    if cached is not None:
+        calendar_start, calendar_end, values = cached
+        if calendar_start <= start_datetime and end_datetime <= calendar_end:
+            rv = _slice_calendar(values, bounds)
+            if rv is not None:
+                return rv
+        if calendar_start <= end_datetime and start_datetime <= calendar_end:
+            calendar_start = min(calendar_start, start_datetime)
+            calendar_end = max(calendar_end, end_datetime)
+            values = _read_only_range(freq, calendar_start, calendar_end)
+            rv = _slice_calendar(values, bounds)
+            if rv is not None:
+                _cache_calendar(freq, calendar_start, calendar_end, values)
+                return rv
+    values = _read_only_range(freq, start_datetime, end_datetime)
+    _cache_calendar(freq, start_datetime, end_datetime, values)
+    return values
+
+
+def _cache_calendar(
+    freq: Frequency,
+    start_datetime: pendulum.DateTime,
+    end_datetime: pendulum.DateTime,
+    values: np.ndarray,
+) -> None:
+    with _calendars_lock:
+        _calendars[freq] = (start_datetime, end_datetime, values)
+        _calendars.move_to_end(freq)
+        while len(_calendars) > CALENDAR_CACHE_SIZE:
+            _calendars.popitem(last=False)
+
+
+def clear_date_range_cache() -> None:
+    with _calendars_lock:
+        _calendars.clear()
+    _local_date_range_values.cache_clear()
+
+
+_local_date_range_values = lru_cache(maxsize=128)(_read_only_range)
+
+
+def date_range_bounds(
+    freq: Frequency,
+    start_datetime: pendulum.DateTime,
+    end_datetime: pendulum.DateTime,
+) -> Optional[Tuple[int, int]]:
     if freq.unit.unit_type == PANDAS_FREQ_UNIT:
-        dts = pd.date_range(start_datetime, end_datetime, freq=freq.raw_str, tz=from_tz)
-    else:
-        exchange = mcal.get_calendar(freq.unit.market_exchange)
-        if pd.Timedelta(freq.to_str()) >= pd.Timedelta("1D"):
-            dts = exchange.valid_days(
-                start_date=start_datetime, end_date=end_datetime, tz=exchange.tz
-            )
+        start = pd.Timestamp(start_datetime.in_tz("UTC").to_datetime_string(), tz="UTC")
+        end = pd.Timestamp(end_datetime.in_tz("UTC").to_datetime_string(), tz="UTC")
+        offset = to_offset(freq.raw_str)
+        if isinstance(offset, Tick):
+            first = start
+            last = start + (end - start) // offset.delta * offset.delta
         else:
-            schedule = exchange.schedule(start_datetime, end_datetime)
-            dts = mcal.date_range(schedule, frequency=freq.to_str(), tz=exchange.tz)
-    return dts.tz_convert("UTC")
+            first, last = offset.rollforward(start), offset.rollback(end)
+        bounds = (first.value, last.value)
+    else:
+        table = session_range(freq, start_datetime, end_datetime)
+        if not len(table):
+            return None
+        exchange = get_exchange(freq.unit.market_exchange)
+        firsts, lasts = get_session_bounds(table, freq.to_str(), exchange.tz)
+        bounds = (int(firsts[0]), int(lasts[-1]))
+    return bounds if bounds[0] <= bounds[1] else None
+
+
+def index_bounds(
+    freq: Frequency, index: pd.DatetimeIndex
+) -> Tuple[pendulum.DateTime, pendulum.DateTime]:
+    bounds = index[[0, -1]]
+    if freq.unit.unit_type == MARKET_FREQ_UNIT:
+        bounds = bounds.tz_convert(get_exchange(freq.unit.market_exchange).tz)
+        bounds = pd.DatetimeIndex(bounds.date, tz="UTC")
+    start_datetime, end_datetime = (pendulum.instance(dt) for dt in bounds)
+    return start_datetime, end_datetime
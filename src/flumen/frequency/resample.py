@@ -0,0 +1,81 @@
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from flumen.frequency.datetime import is_right_labelled
+from flumen.models.frequency import Frequency
+
+OHLC = "ohlc"
+OHLC_COLUMNS = ["open", "high", "low", "close"]
+RESAMPLE_METHODS = ["first", "last", "min", "max", "sum", "mean", OHLC]
+
+
+def get_bucket_ids(
+    freq: Frequency, bucket_datetimes: np.ndarray, datetimes: np.ndarray
+) -> np.ndarray:
+    if is_right_labelled(freq):
+        return np.searchsorted(bucket_datetimes, datetimes, "left")
+    return np.searchsorted(bucket_datetimes, datetimes, "right") - 1
+
+
+class ResampleAccumulator:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.count = np.zeros(size, dtype=np.int64)
+        self.sum = np.zeros(size, dtype=np.float64)
+        self.min = np.full(size, np.inf, dtype=np.float64)
+        self.max = np.full(size, -np.inf, dtype=np.float64)
+        self.first = np.full(size, np.nan, dtype=np.float64)
+        self.last = np.full(size, np.nan, dtype=np.float64)
+
+    def update(self, bucket_ids: np.ndarray, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        mask = (bucket_ids >= 0) & (bucket_ids < self.size) & ~np.isnan(values)
+        bucket_ids, values = bucket_ids[mask], values[mask]
+        if not len(values):
+            return
+        starts = np.flatnonzero(np.diff(bucket_ids, prepend=-1))
+        buckets = bucket_ids[starts]
+        counts = np.diff(np.append(starts, len(values)))
+        self.first[buckets] = np.where(
+            self.count[buckets] == 0, values[starts], self.first[buckets]
+        )
+        self.last[buckets] = values[starts + counts - 1]
+        self.count[buckets] += counts
+        self.sum[buckets] += np.add.reduceat(values, starts)
+        self.min[buckets] = np.minimum(
+            self.min[buckets], np.minimum.reduceat(values, starts)
+        )
+        self.max[buckets] = np.maximum(
+            self.max[buckets], np.maximum.reduceat(values, starts)
+        )
+
+    def result(self, method: str) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        if method not in RESAMPLE_METHODS:
+            raise ValueError(f"Invalid resample method: {method}")
+        if method == OHLC:
+            return {
+                column: self._values(column_method)
+                for column, column_method in zip(
+                    OHLC_COLUMNS, ["first", "max", "min", "last"]
+                )
+            }
+        return self._values(method)
+
+    def _values(self, method: str) -> np.ndarray:
+        empty = self.count == 0
+        if method == "mean":
+            values = self.sum / np.where(empty, 1, self.count)
+        else:
+            values = getattr(self, method).copy()
+        values[empty] = np.nan
+        return values
+
+    def to_pandas(
+        self, method: str, index: pd.DatetimeIndex, dtype: np.dtype
+    ) -> Union[pd.Series, pd.DataFrame]:
+        values = self.result(method)
+        if isinstance(values, dict):
+            return pd.DataFrame(values, index=index, dtype=dtype)
+        return pd.Series(values, index=index, dtype=dtype)
@@ -0,0 +1,188 @@
+import os
+import pathlib
+from datetime import tzinfo
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pandas_market_calendars as mcal
+
+from flumen.utils.path import ensure_dir_exists
+
+CACHE_DIR_ENV = "FLUMEN_CACHE_DIR"
+DEFAULT_CACHE_DIR = "~/.cache/flumen"
+SESSION_TABLE_EXTENSION = ".session"
+SESSION_COLUMNS = ["market_open", "break_start", "break_end", "market_close"]
+SESSION_TABLE_WIDTH = len(SESSION_COLUMNS) + 1
+SESSION_DAY = 0
+SESSION_OPEN = 1
+SESSION_BREAK_START = 2
+SESSION_BREAK_END = 3
+SESSION_CLOSE = 4
+NAT = np.iinfo(np.int64).min
+
+_cache_dir: Optional[pathlib.Path] = None
+
+
+def get_cache_dir() -> pathlib.Path:
+    if _cache_dir is not None:
+        return _cache_dir
+    return pathlib.Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)).expanduser()
+
+
+def set_cache_dir(cache_dir: Optional[pathlib.Path]) -> None:
+    global _cache_dir
+    _cache_dir = cache_dir
+    clear_cache()
+
+
+def clear_cache() -> None:
+    get_year_sessions.cache_clear()
+    get_year_bars.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_exchange(name: str) -> mcal.MarketCalendar:
+    return mcal.get_calendar(name)
+
+
+def get_session_table_uri(exchange: str, year: int) -> pathlib.Path:
+    return (
+        get_cache_dir()
+        / "sessions"
+        / mcal.__version__
+        / exchange
+        / f"{year}{SESSION_TABLE_EXTENSION}"
+    )
+
+
+def build_year_sessions(exchange: str, year: int) -> np.ndarray:
+    schedule = get_exchange(exchange).schedule(f"{year}-01-01", f"{year}-12-31")
+    table = np.full((len(schedule), SESSION_TABLE_WIDTH), NAT, dtype=np.int64)
+    table[:, SESSION_DAY] = schedule.index.asi8
+    for column_index, column in enumerate(SESSION_COLUMNS, start=SESSION_OPEN):
+        if column in schedule.columns:
+            table[:, column_index] = pd.DatetimeIndex(schedule[column]).asi8
+    return table
+
+
+@lru_cache(maxsize=256)
+def get_year_sessions(exchange: str, year: int) -> np.ndarray:
+    uri = get_session_table_uri(exchange, year)
+    if uri.exists():
+        table = np.fromfile(uri, dtype=np.int64).reshape(-1, SESSION_TABLE_WIDTH)
+    else:
+        table = build_year_sessions(exchange, year)
+        ensure_dir_exists(uri.parent)
+        tmp_uri = uri.with_name(f"{uri.name}.{os.getpid()}.tmp")
+        table.tofile(tmp_uri)
+        tmp_uri.replace(uri)
+    table.flags.writeable = False
+    return table
+
+
+def to_schedule(table: np.ndarray) -> pd.DataFrame:
+    columns = {
+        column: pd.DatetimeIndex(table[:, column_index], tz="UTC")
+        for column_index, column in enumerate(SESSION_COLUMNS, start=SESSION_OPEN)
+        if column in ("market_open", "market_close")
+        or np.any(table[:, column_index] != NAT)
+    }
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(table[:, SESSION_DAY]))
+
+
+def is_daily_frequency(frequency: str) -> bool:
+    return pd.Timedelta(frequency) >= pd.Timedelta("1D")
+
+
+def _session_segments(table: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    has_break = table[:, SESSION_BREAK_START] != NAT
+    starts = np.stack([table[:, SESSION_OPEN], table[:, SESSION_BREAK_END]], axis=1)
+    ends = np.stack(
+        [
+            np.where(has_break, table[:, SESSION_BREAK_START], table[:, SESSION_CLOSE]),
+            table[:, SESSION_CLOSE],
+        ],
+        axis=1,
+    )
+    starts[~has_break, 1] = ends[~has_break, 1] = 0
+    return starts, ends
+
+
+def count_session_bars(table: np.ndarray, frequency: str) -> np.ndarray:
+    if is_daily_frequency(frequency):
+        return np.ones(len(table), dtype=np.int64)
+    starts, ends = _session_segments(table)
+    return (-((starts - ends) // pd.Timedelta(frequency).value)).sum(axis=1)
+
+
+def get_session_bounds(
+    table: np.ndarray, frequency: str, tz: tzinfo
+) -> Tuple[np.ndarray, np.ndarray]:
+    if is_daily_frequency(frequency):
+        days = generate_session_bars(table, frequency, tz)
+        return days, days
+    starts, ends = _session_segments(table)
+    first = np.minimum(starts[:, 0] + pd.Timedelta(frequency).value, ends[:, 0])
+    return first, table[:, SESSION_CLOSE]
+
+
+def generate_session_bars(table: np.ndarray, frequency: str, tz: tzinfo) -> np.ndarray:
+    if is_daily_frequency(frequency):
+        days = pd.DatetimeIndex(table[:, SESSION_DAY]).tz_localize(tz)
+        return days.tz_convert("UTC").asi8
+    step = pd.Timedelta(frequency).value
+    starts, ends = _session_segments(table)
+    starts, ends = starts.ravel(), ends.ravel()
+    counts = -((starts - ends) // step)
+    segment_offsets = np.cumsum(counts) - counts
+    steps = np.arange(counts.sum()) - np.repeat(segment_offsets, counts) + 1
+    bars = np.repeat(starts, counts) + steps * step
+    return np.minimum(bars, np.repeat(ends, counts))
+
+
+@lru_cache(maxsize=64)
+def get_year_bars(
+    exchange: str, frequency: str, year: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    table = get_year_sessions(exchange, year)
+    bars = generate_session_bars(table, frequency, get_exchange(exchange).tz)
+    offsets = np.append(0, np.cumsum(count_session_bars(table, frequency)))
+    bars.flags.writeable = False
+    return bars, offsets
+
+
+def _session_locs(
+    exchange: str, year: int, start_date: pd.Timestamp, end_date: pd.Timestamp
+) -> Tuple[int, int]:
+    days = get_year_sessions(exchange, year)[:, SESSION_DAY]
+    return (
+        int(np.searchsorted(days, start_date.value, "left")),
+        int(np.searchsorted(days, end_date.value, "right")),
+    )
+
+
+def get_sessions(
+    exchange: str, start_date: pd.Timestamp, end_date: pd.Timestamp
+) -> np.ndarray:
+    tables: List[np.ndarray] = []
+    for year in range(start_date.year, end_date.year + 1):
+        start, stop = _session_locs(exchange, year, start_date, end_date)
+        tables.append(get_year_sessions(exchange, year)[start:stop])
+    if len(tables) == 1:
+        return tables[0]
+    return np.concatenate(tables or [np.empty((0, SESSION_TABLE_WIDTH), np.int64)])
+
+
+def get_bars(
+    exchange: str, frequency: str, start_date: pd.Timestamp, end_date: pd.Timestamp
+) -> np.ndarray:
+    parts: List[np.ndarray] = []
+    for year in range(start_date.year, end_date.year + 1):
+        start, stop = _session_locs(exchange, year, start_date, end_date)
+        bars, offsets = get_year_bars(exchange, frequency, year)
+        parts.append(bars[slice(offsets[start], offsets[stop])])
+    if len(parts) == 1:
+        return parts[0]
+    return np.concatenate(parts or [np.array([], dtype=np.int64)])
@@ -1,8 +1,8 @@
 import re
-from typing import List
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
 
 from aenum import Enum
-from pydantic import BaseModel
 
 _MARKET_EXCHANGE_SLICE = slice(0, -1)
 _MARKET_UNIT_SLICE = slice(-1, None)
@@ -45,32 +45,99 @@ class FrequencyUnit(Enum):
         raise ValueError(f"Frequency unit {self.value} is not an exchange frequency")
 
 
-class Frequency(BaseModel):
+class Frequency:
+    __slots__ = ("raw_str", "step", "unit")
+
     raw_str: str
     step: int
     unit: FrequencyUnit
 
-    @classmethod
-    def from_str(cls, freq: str) -> "Frequency":
-        freq = freq.upper()
-        match = FREQUENCY_REGEX.match(freq)
-        if match:
-            step = int(match.group("step") or 1)
-            unit = match.group("unit")
-            if unit not in FrequencyUnit.values():
-                raise ValueError(f"Invalid frequency unit: {unit}")
-            return Frequency(
-                raw_str=freq,
-                step=step,
-                unit=unit,
+    _instances: Dict[str, "Frequency"] = {}
+    _aliases: Dict[str, "Frequency"] = {}
+    _lock = threading.Lock()
+
+    def __new__(
+        cls, raw_str: str, step: int, unit: Union[FrequencyUnit, str]
+    ) -> "Frequency":
+        raw_str, parsed_step, parsed_unit = cls._parse(raw_str)
+        step, unit = int(step), FrequencyUnit(unit)
+        if step != parsed_step or unit is not parsed_unit:
+            raise ValueError(
+                f"Frequency {raw_str} is {parsed_step}{parsed_unit.value},"
+                f" not {step}{unit.value}"
             )
-        else:
+        freq = cls._instances.get(raw_str)
+        if freq is None:
+            with cls._lock:
+                freq = cls._instances.get(raw_str)
+                if freq is None:
+                    freq = super().__new__(cls)
+                    object.__setattr__(freq, "raw_str", raw_str)
+                    object.__setattr__(freq, "step", step)
+                    object.__setattr__(freq, "unit", unit)
+                    cls._instances[raw_str] = freq
+        return freq
+
+    @staticmethod
+    def _parse(freq: str) -> Tuple[str, int, FrequencyUnit]:
+        raw_str = freq.upper()
+        match = FREQUENCY_REGEX.match(raw_str)
+        if not match:
             raise ValueError(f"Invalid frequency: {freq}")
+        unit = match.group("unit")
+        if unit not in FrequencyUnit.__members__:
+            raise ValueError(f"Invalid frequency unit: {unit}")
+        return raw_str, int(match.group("step") or 1), FrequencyUnit(unit)
+
+    @classmethod
+    def from_str(cls, freq: str) -> "Frequency":
+        rv = cls._aliases.get(freq)
+        if rv is None:
+            rv = cls(*cls._parse(freq))
+            cls._aliases[freq] = rv
+        return rv
+
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable[[Any], "Frequency"]]:
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
+        field_schema.update(type="string")
+
+    @classmethod
+    def validate(cls, value: Any) -> "Frequency":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls.from_str(value)
+        raise TypeError(f"Invalid frequency: {value!r}")
 
     def to_str(self) -> str:
         if self.unit.unit_type == PANDAS_FREQ_UNIT:
             return self.raw_str
         return f"{self.step}{self.unit.market_unit}"
 
-    def __hash__(self) -> int:
-        return hash(self.raw_str)
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[Callable[[str], "Frequency"], Tuple[str]]:
+        return Frequency.from_str, (self.raw_str,)
+
+    def __copy__(self) -> "Frequency":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Frequency":
+        return self
+
+    def __repr__(self) -> str:
+        return (
+            f"Frequency(raw_str={self.raw_str!r}, step={self.step}, "
+            f"unit={self.unit.value!r})"
+        )
+
+    def __str__(self) -> str:
+        return self.raw_str
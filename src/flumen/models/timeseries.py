@@ -1,13 +1,19 @@
-from typing import Any, Dict
+from datetime import tzinfo
+from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 from pendulum import DateTime
 from pydantic import BaseModel, root_validator, validator
 
-from flumen.frequency.datetime import date_range
+from flumen.frequency.datetime import date_range_values
 from flumen.models.frequency import Frequency
 
 
+def is_utc(tz: Optional[tzinfo]) -> bool:
+    return tz is not None and str(tz) == "UTC"
+
+
 class TimeSeries(BaseModel):
     entity: str
     field: str
@@ -27,19 +33,55 @@ class TimeSeries(BaseModel):
 
     @validator("values")
     def validate_values(cls, v: pd.Series, values: Dict[str, Any]) -> pd.Series:
+        return cls.check_values(
+            v, values["freq"], values["start_datetime"], values["end_datetime"]
+        )
+
+    @staticmethod
+    def check_values(
+        v: pd.Series,
+        freq: Frequency,
+        start_datetime: DateTime,
+        end_datetime: DateTime,
+    ) -> pd.Series:
         if not isinstance(v.index.dtype, pd.DatetimeTZDtype):
             raise ValueError("series index must be datetime with timezone")
 
-        datetime_index = date_range(
-            freq=values["freq"],
-            start_datetime=values["start_datetime"],
-            end_datetime=values["end_datetime"],
-            from_tz=v.index.tz,
+        datetime_values = date_range_values(
+            freq, start_datetime, end_datetime, from_tz=v.index.tz
         )
+        index_values = v.index.asi8
+        if len(index_values) != len(datetime_values) or not np.array_equal(
+            index_values, datetime_values
+        ):
+            raise ValueError("series index must match date_range")
 
-        if v.index.tz != "UTC":
+        if not is_utc(v.index.tz):
             v.index = v.index.tz_convert("UTC")
-
-        if not v.index.equals(datetime_index):
-            raise ValueError("series index must match date_range")
         return v
+
+    @classmethod
+    def from_aligned(
+        cls,
+        entity: str,
+        field: str,
+        freq: Frequency,
+        start_datetime: DateTime,
+        end_datetime: DateTime,
+        values: pd.Series,
+        validate: bool = True,
+    ) -> "TimeSeries":
+        if validate:
+            if end_datetime < start_datetime:
+                raise ValueError("start_datetime must be less than end_datetime")
+            values = cls.check_values(values, freq, start_datetime, end_datetime)
+        elif not is_utc(values.index.tz):
+            values.index = values.index.tz_convert("UTC")
+        return cls.construct(
+            entity=entity,
+            field=field,
+            freq=freq,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            values=values,
+        )
@@ -1,10 +1,22 @@
 import pathlib
 import struct
-from typing import Generic, Iterable, MutableSequence, Tuple, TypeVar, Union, overload
+from typing import (
+    Generic,
+    Iterable,
+    Literal,
+    MutableSequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import numpy as np
 
+from flumen.utils.path import get_file_signature
+
 _T = TypeVar("_T")
+StorageSignature = Tuple[int, int, int]
 
 
 class BigArrayStorage(Generic[_T], MutableSequence):
@@ -36,9 +48,7 @@ class BigArrayStorage(Generic[_T], MutableSequence):
             else:
                 start, stop = self.get_slice_index(index)
                 f.seek(start * self._size)
-                return np.frombuffer(
-                    f.read((stop - start) * self._size), dtype=self._dtype
-                )
+                return np.fromfile(f, dtype=self._dtype, count=max(stop - start, -1))
 
     @overload
     def __setitem__(self, index: int, item: _T) -> None:
@@ -49,6 +59,14 @@ class BigArrayStorage(Generic[_T], MutableSequence):
         ...
 
     def __setitem__(self, index: Union[int, slice], item: Union[_T, np.array]) -> None:
+        if isinstance(index, slice) and index.step in (None, 1):
+            start, stop, _ = index.indices(len(self))
+            values = np.asarray(item, dtype=self._dtype)
+            if values.shape == (max(stop - start, 0),):
+                with open(self._uri, "r+b") as f:
+                    f.seek(start * self._size)
+                    values.tofile(f)
+                return
         data = np.array(self[:])
         data[index] = item
         data.tofile(self._uri)
@@ -81,6 +99,9 @@ class BigArrayStorage(Generic[_T], MutableSequence):
         with open(self._uri, "a+b") as f:
             np.array(values).tofile(f)
 
+    def signature(self) -> StorageSignature:
+        return get_file_signature(self._uri) or (0, 0, 0)
+
     def get_slice_index(self, index: slice) -> Tuple[int, int]:
         start, stop = index.start, index.stop
         if start is None:
@@ -90,3 +111,40 @@ class BigArrayStorage(Generic[_T], MutableSequence):
         if stop < 0:
             stop = len(self) + 1 + stop
         return start, stop
+
+
+class MemmapArrayStorage(BigArrayStorage[_T]):
+    def _memmap(self, mode: Literal["r", "r+"] = "r") -> np.memmap:
+        return np.memmap(self._uri, dtype=self._dtype, mode=mode)
+
+    @overload
+    def __getitem__(self, index: int) -> _T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> MutableSequence[_T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_T, np.array]:
+        if len(self) == 0:
+            return super().__getitem__(index)
+        data = self._memmap()
+        if isinstance(index, int):
+            return data[index]
+        start, stop = self.get_slice_index(index)
+        return data[start:stop]
+
+    @overload
+    def __setitem__(self, index: int, item: _T) -> None:
+        ...
+
+    @overload
+    def __setitem__(self, index: slice, item: Iterable[_T]) -> None:
+        ...
+
+    def __setitem__(self, index: Union[int, slice], item: Union[_T, np.array]) -> None:
+        if len(self) == 0:
+            return super().__setitem__(index, item)  # type: ignore[index]
+        data = self._memmap("r+")
+        data[index] = item
+        data.flush()
@@ -0,0 +1,230 @@
+import operator
+import pathlib
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from flumen.storage.big_array import BigArrayStorage, StorageSignature
+
+SUMMARY_COUNT = 0
+SUMMARY_SUM = 1
+SUMMARY_MIN = 2
+SUMMARY_MAX = 3
+SUMMARY_WIDTH = 4
+HEADER_ROWS = 2
+AGGREGATE_OPS = ("count", "sum", "mean", "min", "max")
+NULL_OPS = ("isnan", "notnan")
+COMPARISON_OPS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+Predicate = Union[str, Tuple[str, float]]
+
+
+def summarize(values: np.ndarray, block_size: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return np.empty((0, SUMMARY_WIDTH), dtype=np.float64)
+    starts = np.arange(0, len(values), block_size)
+    valid = ~np.isnan(values)
+    summary = np.empty((len(starts), SUMMARY_WIDTH), dtype=np.float64)
+    summary[:, SUMMARY_COUNT] = np.add.reduceat(valid, starts)
+    summary[:, SUMMARY_SUM] = np.add.reduceat(np.where(valid, values, 0), starts)
+    summary[:, SUMMARY_MIN] = np.minimum.reduceat(
+        np.where(valid, values, np.inf), starts
+    )
+    summary[:, SUMMARY_MAX] = np.maximum.reduceat(
+        np.where(valid, values, -np.inf), starts
+    )
+    return summary
+
+
+def combine(summary: np.ndarray, op: str) -> float:
+    if op not in AGGREGATE_OPS:
+        raise ValueError(f"Invalid aggregate op: {op}")
+    count = summary[:, SUMMARY_COUNT].sum()
+    if op == "count":
+        return float(count)
+    if op == "sum":
+        return float(summary[:, SUMMARY_SUM].sum())
+    if not count:
+        return float("nan")
+    if op == "mean":
+        return float(summary[:, SUMMARY_SUM].sum() / count)
+    if op == "min":
+        return float(summary[:, SUMMARY_MIN].min())
+    return float(summary[:, SUMMARY_MAX].max())
+
+
+def parse_predicate(predicate: Predicate) -> Tuple[str, Optional[float]]:
+    op, value = (predicate, None) if isinstance(predicate, str) else predicate
+    if op in NULL_OPS:
+        return op, None
+    if op not in COMPARISON_OPS or value is None or np.isnan(value):
+        raise ValueError(f"Invalid predicate: {predicate}")
+    return op, float(value)
+
+
+def match_values(values: np.ndarray, op: str, value: Optional[float]) -> np.ndarray:
+    if op == "isnan":
+        return np.isnan(values)
+    if op == "notnan":
+        return ~np.isnan(values)
+    assert value is not None
+    return COMPARISON_OPS[op](values, value)
+
+
+def match_blocks(
+    summary: np.ndarray, sizes: np.ndarray, op: str, value: Optional[float]
+) -> np.ndarray:
+    count = summary[:, SUMMARY_COUNT]
+    if op == "isnan":
+        return count < sizes
+    if op == "notnan":
+        return count > 0
+    assert value is not None
+    low, high = summary[:, SUMMARY_MIN], summary[:, SUMMARY_MAX]
+    if op in (">", ">="):
+        return COMPARISON_OPS[op](high, value)
+    if op in ("<", "<="):
+        return COMPARISON_OPS[op](low, value)
+    if op == "==":
+        return (low <= value) & (value <= high)
+    return (count > 0) & ((low != value) | (high != value))
+
+
+def read_values(storage: BigArrayStorage, start: int, stop: int) -> np.ndarray:
+    return np.asarray(storage[slice(start, stop)])
+
+
+class BlockSummaryStorage:
+    DEFAULT_BLOCK_SIZE = 4096
+
+    def __init__(self, uri: pathlib.Path, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        self._uri = uri
+        self._block_size = block_size
+        self._length = 0
+        self._signature: StorageSignature = (0, 0, 0)
+        self._blocks = np.empty((0, SUMMARY_WIDTH), dtype=np.float64)
+        self.load()
+
+    @property
+    def block_size(self) -> int:
+        return self._block_size
+
+    @property
+    def blocks(self) -> np.ndarray:
+        return self._blocks
+
+    def __len__(self) -> int:
+        return self._length
+
+    def load(self) -> None:
+        if not self._uri.exists():
+            return
+        data = np.fromfile(self._uri, dtype=np.float64).reshape(-1, SUMMARY_WIDTH)
+        header = data[:HEADER_ROWS].view(np.int64).ravel()
+        if len(header) == HEADER_ROWS * SUMMARY_WIDTH and header[0] == self._block_size:
+            self._length = int(header[1])
+            self._signature = (int(header[2]), int(header[3]), int(header[4]))
+            self._blocks = data[HEADER_ROWS:]
+
+    def dump(self) -> None:
+        header = np.zeros(HEADER_ROWS * SUMMARY_WIDTH, dtype=np.int64)
+        header[:5] = self._block_size, self._length, *self._signature
+        tmp_uri = self._uri.with_suffix(".tmp")
+        np.concatenate(
+            [header.view(np.float64).reshape(HEADER_ROWS, SUMMARY_WIDTH), self._blocks]
+        ).tofile(tmp_uri)
+        tmp_uri.replace(self._uri)
+
+    def delete(self) -> None:
+        self._length = 0
+        self._signature = (0, 0, 0)
+        self._blocks = self._blocks[:0]
+        self._uri.unlink(missing_ok=True)
+
+    def refresh(self, storage: BigArrayStorage, start: int, stop: int) -> None:
+        length = len(storage)
+        low = min(start, self._length, length)
+        high = stop if length == self._length else length
+        high = min(max(high, low), length)
+        first = low // self._block_size
+        last = -(-high // self._block_size)
+        values = read_values(
+            storage, first * self._block_size, min(last * self._block_size, length)
+        )
+        self._blocks = np.concatenate(
+            [
+                self._blocks[:first],
+                summarize(values, self._block_size),
+                self._blocks[slice(last, -(-length // self._block_size))],
+            ]
+        )
+        self._length = length
+        self._signature = storage.signature()
+        self.dump()
+
+    def is_synced(self, storage: BigArrayStorage) -> bool:
+        return self._length == len(storage) and self._signature == storage.signature()
+
+    def sync(self, storage: BigArrayStorage) -> None:
+        if not self.is_synced(storage):
+            self.refresh(storage, 0, len(storage))
+
+    def aggregate(
+        self, storage: BigArrayStorage, start: int, stop: int, op: str
+    ) -> float:
+        first = -(-start // self._block_size)
+        last = stop // self._block_size
+        if first >= last:
+            return combine(
+                summarize(read_values(storage, start, stop), stop - start or 1), op
+            )
+        head = read_values(storage, start, first * self._block_size)
+        tail = read_values(storage, last * self._block_size, stop)
+        summary = np.concatenate(
+            [
+                summarize(head, self._block_size),
+                self._blocks[first:last],
+                summarize(tail, self._block_size),
+            ]
+        )
+        return combine(summary, op)
+
+    def scan(
+        self,
+        storage: BigArrayStorage,
+        start: int,
+        stop: int,
+        predicate: Predicate,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        op, value = parse_predicate(predicate)
+        first = start // self._block_size
+        last = -(-stop // self._block_size)
+        sizes = np.full(last - first, self._block_size)
+        if len(sizes):
+            sizes[-1] = min(
+                self._block_size, self._length - (last - 1) * self._block_size
+            )
+        candidates = np.flatnonzero(
+            match_blocks(self._blocks[first:last], sizes, op, value)
+        )
+        run_breaks = np.flatnonzero(np.diff(candidates) != 1) + 1
+        positions, values = [], []
+        for run in np.split(candidates, run_breaks):
+            if not len(run):
+                continue
+            run_start = max((first + run[0]) * self._block_size, start)
+            run_stop = min((first + run[-1] + 1) * self._block_size, stop)
+            data = read_values(storage, run_start, run_stop)
+            matched = np.flatnonzero(match_values(data, op, value))
+            positions.append(matched + run_start)
+            values.append(data[matched])
+        if not positions:
+            return np.array([], dtype=np.int64), read_values(storage, start, start)
+        return np.concatenate(positions), np.concatenate(values)
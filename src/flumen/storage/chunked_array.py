@@ -0,0 +1,246 @@
+import pathlib
+import pickle
+import shutil
+from typing import Iterable, List, MutableSequence, Tuple, TypeVar, Union, overload
+
+import numpy as np
+
+from flumen.storage.big_array import BigArrayStorage, StorageSignature
+from flumen.storage.codec import RAW_CODEC, Codec
+
+_T = TypeVar("_T")
+
+
+class ChunkedArrayStorage(BigArrayStorage[_T]):
+    DIRECTORY_FILE = "chunks.dir"
+    CHUNK_EXTENSION = ".chunk"
+    DEFAULT_CHUNK_SIZE = 65536
+
+    def __init__(
+        self,
+        uri: pathlib.Path,
+        dtype: np.dtype,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        codec: str = RAW_CODEC,
+    ) -> None:
+        super().__init__(uri, dtype)
+        self._chunk_size = chunk_size
+        self._codec = Codec(codec)
+        self._chunk_ids: List[int] = []
+        self._chunk_lengths: List[int] = []
+        self.load()
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @property
+    def codec(self) -> str:
+        return self._codec.name
+
+    @property
+    def directory_uri(self) -> pathlib.Path:
+        return self._uri / self.DIRECTORY_FILE
+
+    def get_chunk_uri(self, chunk_id: int) -> pathlib.Path:
+        return self._uri / f"{chunk_id:08d}{self.CHUNK_EXTENSION}"
+
+    def signature(self) -> StorageSignature:
+        uris = [self.directory_uri, *map(self.get_chunk_uri, self._chunk_ids)]
+        stats = [uri.stat() for uri in uris if uri.exists()]
+        return (
+            len(stats),
+            sum(stat.st_size for stat in stats),
+            max((stat.st_mtime_ns for stat in stats), default=0),
+        )
+
+    def load(self) -> None:
+        if self.directory_uri.exists():
+            with open(self.directory_uri, "rb") as f:
+                directory = pickle.load(f)
+            self._chunk_size = directory["chunk_size"]
+            self._codec = Codec(directory.get("codec", RAW_CODEC))
+            self._chunk_ids = [chunk_id for chunk_id, _ in directory["chunks"]]
+            self._chunk_lengths = [length for _, length in directory["chunks"]]
+        else:
+            self._chunk_ids, self._chunk_lengths = [], []
+
+    def save(self) -> None:
+        if not self._chunk_ids:
+            shutil.rmtree(self._uri, ignore_errors=True)
+            return
+        self._uri.mkdir(parents=True, exist_ok=True)
+        directory = {
+            "chunk_size": self._chunk_size,
+            "codec": self._codec.name,
+            "chunks": list(zip(self._chunk_ids, self._chunk_lengths)),
+        }
+        tmp_uri = self.directory_uri.with_suffix(".tmp")
+        with open(tmp_uri, "wb") as f:
+            pickle.dump(directory, f)
+        tmp_uri.replace(self.directory_uri)
+
+    def _next_chunk_id(self) -> int:
+        return max(self._chunk_ids, default=-1) + 1
+
+    def _chunk_offsets(self) -> np.ndarray:
+        return np.cumsum([0] + self._chunk_lengths)
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        offsets = self._chunk_offsets()
+        chunk = int(np.searchsorted(offsets, index, side="right")) - 1
+        chunk = min(chunk, len(self._chunk_ids) - 1)
+        return chunk, index - int(offsets[chunk])
+
+    def _read_chunk(self, chunk: int) -> np.ndarray:
+        uri = self.get_chunk_uri(self._chunk_ids[chunk])
+        if self._codec.is_raw:
+            return np.fromfile(uri, dtype=self._dtype)
+        return self._codec.decode(uri.read_bytes(), self._dtype)
+
+    def _write_chunk(self, chunk: int, data: np.ndarray) -> None:
+        uri = self.get_chunk_uri(self._chunk_ids[chunk])
+        data = np.asarray(data, dtype=self._dtype)
+        if self._codec.is_raw:
+            data.tofile(uri)
+        else:
+            uri.write_bytes(self._codec.encode(data))
+
+    def _replace_chunks(self, chunk: int, count: int, pieces: List[np.ndarray]) -> None:
+        replaced = slice(chunk, chunk + count)
+        old_ids = self._chunk_ids[replaced]
+        next_id = self._next_chunk_id()
+        self._chunk_ids[replaced] = list(range(next_id, next_id + len(pieces)))
+        self._chunk_lengths[replaced] = [len(piece) for piece in pieces]
+        self._uri.mkdir(parents=True, exist_ok=True)
+        for i, piece in enumerate(pieces):
+            self._write_chunk(chunk + i, piece)
+        self.save()
+        for chunk_id in old_ids:
+            self.get_chunk_uri(chunk_id).unlink(missing_ok=True)
+
+    def _split(self, data: np.ndarray) -> List[np.ndarray]:
+        if len(data) <= 2 * self._chunk_size:
+            return [data]
+        return np.array_split(
+            data, range(self._chunk_size, len(data), self._chunk_size)
+        )
+
+    def _normalize_range(self, index: Union[int, slice]) -> Tuple[int, int]:
+        length = len(self)
+        if isinstance(index, int):
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("chunked array index out of range")
+            return index, index + 1
+        start, stop, step = index.indices(length)
+        if step != 1:
+            raise ValueError("chunked array only supports contiguous slices")
+        return start, max(start, stop)
+
+    def _iter_chunks(self, start: int, stop: int) -> Iterable[Tuple[int, int, int]]:
+        offsets = self._chunk_offsets()
+        first = int(np.searchsorted(offsets, start, side="right")) - 1
+        for chunk in range(max(first, 0), len(self._chunk_ids)):
+            chunk_start, chunk_stop = int(offsets[chunk]), int(offsets[chunk + 1])
+            if chunk_start >= stop:
+                break
+            yield chunk, max(start - chunk_start, 0), min(
+                stop, chunk_stop
+            ) - chunk_start
+
+    def insert(self, index: int, item: Union[_T, np.array]) -> None:
+        values = np.atleast_1d(np.asarray(item, dtype=self._dtype))
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        index = min(index, length)
+        if not self._chunk_ids:
+            self.extend(values)
+            return
+        chunk, offset = self._locate(index)
+        data = np.insert(self._read_chunk(chunk), offset, values)
+        self._replace_chunks(chunk, 1, self._split(data))
+
+    @overload
+    def __getitem__(self, index: int) -> _T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> MutableSequence[_T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_T, np.array]:
+        if isinstance(index, int):
+            start, _ = self._normalize_range(index)
+            chunk, offset = self._locate(start)
+            return self._read_chunk(chunk)[offset]
+        # Reads follow the BigArrayStorage.get_slice_index convention shared
+        # by every backend; writes and deletes use plain slice semantics.
+        start, stop = self._normalize_range(slice(*self.get_slice_index(index)))
+        pieces = [
+            self._read_chunk(chunk)[chunk_start:chunk_stop]
+            for chunk, chunk_start, chunk_stop in self._iter_chunks(start, stop)
+        ]
+        if not pieces:
+            return np.array([], dtype=self._dtype)
+        return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+
+    def __setitem__(self, index: Union[int, slice], item: Union[_T, np.array]) -> None:
+        start, stop = self._normalize_range(index)
+        values = np.broadcast_to(np.asarray(item, dtype=self._dtype), (stop - start,))
+        position = 0
+        for chunk, chunk_start, chunk_stop in self._iter_chunks(start, stop):
+            data = self._read_chunk(chunk)
+            next_position = position + chunk_stop - chunk_start
+            data[chunk_start:chunk_stop] = values[position:next_position]
+            self._write_chunk(chunk, data)
+            position = next_position
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        start, stop = self._normalize_range(index)
+        touched = list(self._iter_chunks(start, stop))
+        if not touched:
+            return
+        first = touched[0][0]
+        pieces = []
+        for chunk, chunk_start, chunk_stop in touched:
+            data = self._read_chunk(chunk)
+            pieces.append(np.delete(data, slice(chunk_start, chunk_stop)))
+        data = np.concatenate(pieces)
+        count = len(touched)
+        neighbour = first + count
+        if 0 < len(data) < self._chunk_size // 2 and neighbour < len(self._chunk_ids):
+            if len(data) + self._chunk_lengths[neighbour] <= 2 * self._chunk_size:
+                data = np.concatenate([data, self._read_chunk(neighbour)])
+                count += 1
+        self._replace_chunks(first, count, self._split(data) if len(data) else [])
+
+    def __len__(self) -> int:
+        return sum(self._chunk_lengths)
+
+    def append(self, item: _T) -> None:
+        self.extend([item])
+
+    def extend(self, values: Iterable[_T]) -> None:
+        values = np.asarray(values, dtype=self._dtype).ravel()
+        if values.size == 0:
+            return
+        self._uri.mkdir(parents=True, exist_ok=True)
+        if self._chunk_ids and self._chunk_lengths[-1] < self._chunk_size:
+            last = len(self._chunk_ids) - 1
+            free = self._chunk_size - self._chunk_lengths[-1]
+            data = np.concatenate([self._read_chunk(last), values[:free]])
+            self._write_chunk(last, data)
+            self._chunk_lengths[-1] = len(data)
+            values = values[free:]
+        for piece in np.array_split(
+            values, range(self._chunk_size, len(values), self._chunk_size)
+        ):
+            if piece.size == 0:
+                continue
+            self._chunk_ids.append(self._next_chunk_id())
+            self._chunk_lengths.append(len(piece))
+            self._write_chunk(len(self._chunk_ids) - 1, piece)
+        self.save()
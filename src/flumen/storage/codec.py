@@ -0,0 +1,109 @@
+import lzma
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+CODEC_SEPARATOR = "+"
+RAW_CODEC = "raw"
+
+
+class Filter(ABC):
+    @abstractmethod
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        ...
+
+    @abstractmethod
+    def decode(self, data: np.ndarray) -> np.ndarray:
+        ...
+
+
+class DeltaFilter(Filter):
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        rv = data.copy()
+        rv[1:] -= data[:-1]
+        return rv
+
+    def decode(self, data: np.ndarray) -> np.ndarray:
+        return np.cumsum(data, dtype=data.dtype)
+
+
+class XorFilter(Filter):
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        rv = data.copy()
+        rv[1:] ^= data[:-1]
+        return rv
+
+    def decode(self, data: np.ndarray) -> np.ndarray:
+        return np.bitwise_xor.accumulate(data)
+
+
+class ShuffleFilter(Filter):
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        shuffled = data.view(np.uint8).reshape(-1, data.itemsize).T
+        return np.ascontiguousarray(shuffled).view(data.dtype).ravel()
+
+    def decode(self, data: np.ndarray) -> np.ndarray:
+        shuffled = data.view(np.uint8).reshape(data.itemsize, -1).T
+        return np.ascontiguousarray(shuffled).view(data.dtype).ravel()
+
+
+FILTERS: Dict[str, Filter] = {
+    "delta": DeltaFilter(),
+    "xor": XorFilter(),
+    "shuffle": ShuffleFilter(),
+}
+Compressor = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+COMPRESSORS: Dict[str, Compressor] = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+class Codec:
+    def __init__(self, name: str = RAW_CODEC) -> None:
+        self.name = name
+        self._filters: List[Filter] = []
+        self._compressor: Optional[Compressor] = None
+        if name == RAW_CODEC:
+            return
+        *filters, compressor = name.split(CODEC_SEPARATOR)
+        for filter_name in filters:
+            if filter_name not in FILTERS:
+                raise ValueError(f"Invalid codec filter: {filter_name}")
+            self._filters.append(FILTERS[filter_name])
+        if compressor in FILTERS:
+            self._filters.append(FILTERS[compressor])
+        elif compressor in COMPRESSORS:
+            self._compressor = COMPRESSORS[compressor]
+        else:
+            raise ValueError(f"Invalid codec: {name}")
+
+    @property
+    def is_raw(self) -> bool:
+        return self.name == RAW_CODEC
+
+    @staticmethod
+    def get_word_dtype(dtype: np.dtype) -> np.dtype:
+        return np.dtype(f"u{dtype.itemsize}")
+
+    def encode(self, data: np.ndarray) -> bytes:
+        data = np.ascontiguousarray(data)
+        words = data.view(self.get_word_dtype(data.dtype))
+        for codec_filter in self._filters:
+            words = codec_filter.encode(words)
+        buffer = words.tobytes()
+        if self._compressor is not None:
+            buffer = self._compressor[0](buffer)
+        return buffer
+
+    def decode(self, buffer: bytes, dtype: np.dtype) -> np.ndarray:
+        if self._compressor is not None:
+            buffer = self._compressor[1](buffer)
+        words = np.frombuffer(buffer, dtype=self.get_word_dtype(dtype))
+        for codec_filter in reversed(self._filters):
+            words = codec_filter.decode(words)
+        if not words.flags.writeable:
+            words = words.copy()
+        return words.view(dtype)
@@ -1,25 +1,58 @@
 import pathlib
 import pickle
 from collections.abc import MutableMapping
-from typing import Dict, Generic, Iterator, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from flumen.utils.executor import IOExecutor, get_io_executor
+from flumen.utils.path import get_file_signature
 
 _KT = TypeVar("_KT")
 _VT = TypeVar("_VT")
+_SET = "set"
+_DELETE = "delete"
+Signature = Tuple[Optional[Tuple[int, int, int]], ...]
+Record = Tuple[str, Any, Any]
 
 
 class DictStorage(Generic[_KT, _VT], MutableMapping):
     def __init__(
         self,
         uri: pathlib.Path,
+        io_executor: Optional[IOExecutor] = None,
+        merge: Optional[Callable[[_VT, _VT, Optional[_VT]], _VT]] = None,
     ) -> None:
         self._uri = uri
-        self._data = self.load()
+        self._io_executor = io_executor or get_io_executor()
+        self._merge = merge
+        self._pending: List[Record] = []
+        self._bases: Dict[_KT, Optional[_VT]] = {}
+        with self._io_executor.lock(self._uri):
+            self._data = self.load()
+            self._signature = self.get_signature()
+
+    def _track_base(self, key: _KT) -> None:
+        if key not in self._bases:
+            self._bases[key] = self._data.get(key)
 
     def __setitem__(self, key: _KT, item: _VT) -> None:
+        self._track_base(key)
         self._data[key] = item
+        self._pending.append((_SET, key, item))
 
     def __delitem__(self, key: _KT) -> None:
+        self._track_base(key)
         del self._data[key]
+        self._pending.append((_DELETE, key, None))
 
     def __getitem__(self, key: _KT) -> _VT:
         if key in self._data:
@@ -49,8 +82,143 @@ class DictStorage(Generic[_KT, _VT], MutableMapping):
         return rv
 
     def reload(self) -> None:
-        self._data = self.load()
+        self._pending = []
+        self._bases = {}
+        with self._io_executor.lock(self._uri):
+            self._data = self.load()
+            self._signature = self.get_signature()
+
+    def get_signature(self) -> Signature:
+        return (get_file_signature(self._uri),)
+
+    @staticmethod
+    def _apply(
+        data: Dict[_KT, _VT],
+        records: List[Record],
+        merge: Optional[Callable[[_VT, _VT, Optional[_VT]], _VT]] = None,
+        bases: Optional[Dict[_KT, Optional[_VT]]] = None,
+    ) -> None:
+        for op, key, item in records:
+            if op == _DELETE:
+                data.pop(key, None)
+            elif merge is not None and key in data:
+                base = bases.get(key) if bases is not None else None
+                data[key] = merge(data[key], item, base)
+            else:
+                data[key] = item
+
+    def merge_external(
+        self, records: List[Record], bases: Dict[_KT, Optional[_VT]]
+    ) -> Optional[Dict[_KT, _VT]]:
+        if self.get_signature() == self._signature:
+            return None
+        data = self.load()
+        self._apply(data, records, self._merge, bases)
+        return data
+
+    def _reconcile(self, data: Optional[Dict[_KT, _VT]]) -> None:
+        if data is not None:
+            self._apply(data, self._pending)
+            self._data = data
+
+    def dump(self, data: Dict[_KT, _VT]) -> None:
+        tmp_uri = self._uri.with_name(self._uri.name + ".tmp")
+        with open(tmp_uri, "wb") as f:
+            pickle.dump(data, f)
+        tmp_uri.replace(self._uri)
+
+    def _save(
+        self,
+        records: List[Record],
+        bases: Dict[_KT, Optional[_VT]],
+        data: Dict[_KT, _VT],
+    ) -> Optional[Dict[_KT, _VT]]:
+        merged = self.merge_external(records, bases)
+        self.dump(data if merged is None else merged)
+        self._signature = self.get_signature()
+        return merged
+
+    async def save(self) -> None:
+        records, self._pending = self._pending, []
+        bases, self._bases = self._bases, {}
+        merged = await self._io_executor.run(
+            self._save, records, bases, dict(self._data), uri=self._uri, exclusive=True
+        )
+        self._reconcile(merged)
+
+
+class LogDictStorage(DictStorage[_KT, _VT]):
+    LOG_EXTENSION = ".log"
+    DEFAULT_COMPACT_THRESHOLD = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        uri: pathlib.Path,
+        io_executor: Optional[IOExecutor] = None,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        merge: Optional[Callable[[_VT, _VT, Optional[_VT]], _VT]] = None,
+    ) -> None:
+        self._log_uri = uri.with_name(uri.name + self.LOG_EXTENSION)
+        self._log_size = 0
+        self._compact_threshold = compact_threshold
+        super().__init__(uri, io_executor=io_executor, merge=merge)
+
+    def load(self) -> Dict[_KT, _VT]:
+        rv = super().load()
+        self._log_size = 0
+        if self._log_uri.exists():
+            with open(self._log_uri, "rb") as f:
+                while True:
+                    try:
+                        op, key, item = pickle.load(f)
+                    except (EOFError, pickle.UnpicklingError):
+                        break
+                    if op == _SET:
+                        rv[key] = item
+                    else:
+                        rv.pop(key, None)
+                    self._log_size = f.tell()
+        return rv
+
+    def get_signature(self) -> Signature:
+        return get_file_signature(self._uri), get_file_signature(self._log_uri)
+
+    def append_log(
+        self,
+        records: List[Record],
+        bases: Dict[_KT, Optional[_VT]],
+        data: Optional[Dict[_KT, _VT]],
+    ) -> Optional[Dict[_KT, _VT]]:
+        merged = self.merge_external(records, bases)
+        if merged is not None:
+            keys = dict.fromkeys(key for _, key, _ in records)
+            records = [
+                (_SET, key, merged[key]) if key in merged else (_DELETE, key, None)
+                for key in keys
+            ]
+            if data is not None:
+                data = merged
+        with open(self._log_uri, "ab") as f:
+            f.truncate(self._log_size)
+            f.write(b"".join(pickle.dumps(record) for record in records))
+            self._log_size = f.tell()
+        if data is not None:
+            self.compact(data)
+        self._signature = self.get_signature()
+        return merged
+
+    def compact(self, data: Dict[_KT, _VT]) -> None:
+        self.dump(data)
+        self._log_uri.unlink(missing_ok=True)
+        self._log_size = 0
 
     async def save(self) -> None:
-        with open(self._uri, "wb") as f:
-            pickle.dump(self._data, f)
+        if not self._pending:
+            return
+        records, self._pending = self._pending, []
+        bases, self._bases = self._bases, {}
+        data = dict(self._data) if self._log_size >= self._compact_threshold else None
+        merged = await self._io_executor.run(
+            self.append_log, records, bases, data, uri=self._uri, exclusive=True
+        )
+        self._reconcile(merged)
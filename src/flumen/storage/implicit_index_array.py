@@ -0,0 +1,168 @@
+import pathlib
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from flumen.utils.datetime import utc_index
+from flumen.utils.executor import IOExecutor, get_io_executor
+
+
+class ImplicitIndexArrayStorage(ABC):
+    ARRAY_DTYPE = np.dtype("datetime64[ns]")
+    SERIES_DTYPE = "datetime64[ns, UTC]"
+
+    def __init__(
+        self,
+        uri: pathlib.Path,
+        io_executor: Optional[IOExecutor] = None,
+    ) -> None:
+        self._uri = uri
+        self._io_executor = io_executor or get_io_executor()
+
+    @staticmethod
+    def _to_key(label: Any) -> int:
+        timestamp = pd.Timestamp(label)
+        if timestamp.tz is not None:
+            timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+        return int(timestamp.value)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def _label_locs(self, index: slice) -> Tuple[int, int]:
+        ...
+
+    @abstractmethod
+    def _get_positions(self, start: int, stop: int) -> np.ndarray:
+        ...
+
+    @abstractmethod
+    def searchsorted(self, values: np.ndarray, side: str = "left") -> np.ndarray:
+        ...
+
+    @abstractmethod
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        ...
+
+    def slice_locs(self, start: Optional[Any], stop: Optional[Any]) -> Tuple[int, int]:
+        return self._label_locs(slice(start, stop))
+
+    def __getitem__(self, index: Union[int, slice, Any]) -> Union[Any, pd.Series]:
+        if isinstance(index, int):
+            position = index + len(self) if index < 0 else index
+            if not 0 <= position < len(self):
+                raise IndexError("Index out of range")
+            return self._get_positions(position, position + 1)[0]
+        if not isinstance(index, slice):
+            start, stop = self._label_locs(slice(index, index))
+            if start == stop:
+                raise KeyError(index)
+            return start
+        if isinstance(index.start, int) or isinstance(index.stop, int):
+            start, stop, _ = index.indices(len(self))
+            return self._get_positions(start, stop)
+        start, stop = self._label_locs(index)
+        return pd.Series(
+            np.arange(start, stop),
+            index=utc_index(self._get_positions(start, stop)),
+        )
+
+    def load(self) -> np.ndarray:
+        if self._uri.exists():
+            return np.fromfile(self._uri, dtype=np.int64)
+        return np.array([], dtype=np.int64)
+
+    @abstractmethod
+    def dump(self) -> None:
+        ...
+
+    async def save(self) -> None:
+        await self._io_executor.run(self.dump, uri=self._uri, exclusive=True)
+
+
+class RangeIndexArrayStorage(ImplicitIndexArrayStorage):
+    def __init__(
+        self,
+        uri: pathlib.Path,
+        step: int,
+        io_executor: Optional[IOExecutor] = None,
+    ) -> None:
+        super().__init__(uri, io_executor=io_executor)
+        self._step = step
+        self._origin = 0
+        self._size = 0
+        self.reload()
+
+    @property
+    def origin(self) -> int:
+        return self._origin
+
+    @property
+    def step(self) -> int:
+        return self._step
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _label_locs(self, index: slice) -> Tuple[int, int]:
+        start, stop = 0, self._size
+        if index.start is not None:
+            offset = self._to_key(index.start) - self._origin
+            start = min(max(-(-offset // self._step), 0), self._size)
+        if index.stop is not None:
+            offset = self._to_key(index.stop) - self._origin
+            stop = min(max(offset // self._step + 1, 0), self._size)
+        return start, max(start, stop)
+
+    def _get_positions(self, start: int, stop: int) -> np.ndarray:
+        positions = np.arange(start, max(start, stop), dtype=np.int64)
+        return (self._origin + positions * self._step).view(self.ARRAY_DTYPE)
+
+    def searchsorted(self, values: np.ndarray, side: str = "left") -> np.ndarray:
+        offsets = (
+            np.asarray(values, dtype=self.ARRAY_DTYPE).view(np.int64) - self._origin
+        )
+        if side == "left":
+            positions = -(-offsets // self._step)
+        else:
+            positions = offsets // self._step + 1
+        return np.clip(positions, 0, self._size)
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.int64)
+        return (self._origin + positions * self._step).view(self.ARRAY_DTYPE)
+
+    def __delitem__(self, index: slice) -> None:
+        start, stop, _ = index.indices(self._size)
+        stop = max(start, stop)
+        if start == 0:
+            self._origin += stop * self._step
+        elif stop != self._size:
+            raise ValueError("Only a head or tail range can be deleted")
+        self._size -= stop - start
+        if self._size == 0:
+            self._origin = 0
+
+    def extend_range(self, start: int, stop: int) -> None:
+        if self._size == 0:
+            self._origin = start
+        self._size = max(self._size, (stop - self._origin) // self._step + 1)
+
+    def reload(self) -> None:
+        data = self.load()
+        if len(data):
+            origin, step, size = data
+            if step != self._step:
+                raise ValueError(f"Range step {step} does not match {self._step}")
+            self._origin, self._size = int(origin), int(size)
+
+    def dump(self) -> None:
+        if self._size == 0:
+            self._uri.unlink(missing_ok=True)
+        else:
+            data = np.array([self._origin, self._step, self._size], dtype=np.int64)
+            data.tofile(self._uri)
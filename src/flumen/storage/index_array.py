@@ -1,33 +1,63 @@
 import pathlib
 from collections.abc import MutableSequence
-from typing import Generic, Iterable, TypeVar, Union, overload
+from typing import Any, Generic, Iterable, Optional, Tuple, TypeVar, Union, overload
 
 import numpy as np
 import pandas as pd
 
+from flumen.utils.datetime import utc_index
+from flumen.utils.executor import IOExecutor, get_io_executor
+from flumen.utils.path import get_file_signature
+
 _T = TypeVar("_T")
 
 
 class IndexArrayStorage(Generic[_T], MutableSequence):
+    GROWTH_FACTOR = 1.5
+
     def __init__(
         self,
         uri: pathlib.Path,
         dtype: np.dtype,
+        io_executor: Optional[IOExecutor] = None,
+        series_dtype: Optional[Union[np.dtype, str]] = None,
     ) -> None:
         self._dtype = dtype
+        self._series_dtype = series_dtype or dtype
         self._uri = uri
-        self._keys: np.array = self.load()
-        self._values: pd.Series = self.get_data_series(self._keys, self._dtype)
+        self._io_executor = io_executor or get_io_executor()
+        self._keys = self.load()
+        self._mark_persisted()
 
-    @staticmethod
+    @property
+    def _keys(self) -> np.ndarray:
+        return self._buffer[: self._size]
+
+    @_keys.setter
+    def _keys(self, keys: np.ndarray) -> None:
+        self._buffer = np.asarray(keys, dtype=self._dtype)
+        self._size = len(self._buffer)
+        self._order: Optional[np.ndarray] = None
+        self._is_sorted = self.is_sorted(self._buffer)
+        self._rewrite = True
+
+    @property
+    def _values(self) -> pd.Series:
+        return self.get_data_series(self._keys, self._series_dtype)
+
+    @classmethod
     def get_data_series(
-        array: np.array, dtype: str, index_offset: int = 0
+        cls, array: np.array, dtype: str, index_offset: int = 0
     ) -> pd.Series:
         return pd.Series(
             np.arange(index_offset, len(array) + index_offset),
-            index=pd.Index(array, dtype=dtype),
+            index=cls.get_index(array, dtype),
         )
 
+    @staticmethod
+    def get_index(array: np.array, dtype: str) -> pd.Index:
+        return pd.Index(array, dtype=dtype)
+
     @staticmethod
     def is_integer_index(index: Union[int, slice, _T]) -> bool:
         return isinstance(index, int) or (
@@ -35,25 +65,97 @@ class IndexArrayStorage(Generic[_T], MutableSequence):
             and any([isinstance(index.start, int), isinstance(index.stop, int)])
         )
 
-    def _set_data_series(self) -> None:
-        self._values = self.get_data_series(self._keys, self._dtype)
+    @staticmethod
+    def is_sorted(array: np.ndarray) -> bool:
+        return bool(np.all(array[:-1] <= array[1:]))
+
+    def _to_key(self, label: Any) -> np.ndarray:
+        if self._dtype.kind == "M":
+            timestamp = pd.Timestamp(label)
+            if timestamp.tz is not None:
+                timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+            return np.asarray(timestamp.to_datetime64(), dtype=self._dtype)
+        return np.asarray(label, dtype=self._dtype)
+
+    def _sorted_keys(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self._is_sorted:
+            return self._keys, None
+        if self._order is None:
+            self._order = np.argsort(self._keys, kind="stable")
+        return self._keys[self._order], self._order
+
+    def _mark_persisted(self) -> None:
+        self._persisted_size = self._size
+        self._persisted_signature = get_file_signature(self._uri)
+        self._rewrite = False
+
+    def _mark_modified(self, start: int, stop: int) -> None:
+        self._order = None
+        if start < self._persisted_size:
+            self._rewrite = True
+        if self._is_sorted:
+            window = slice(max(start - 1, 0), stop + 1)
+            self._is_sorted = self.is_sorted(self._keys[window])
+        else:
+            self._is_sorted = self.is_sorted(self._keys)
+
+    def _label_locs(self, index: slice) -> Tuple[int, int]:
+        keys, _ = self._sorted_keys()
+        start, stop = 0, len(keys)
+        if index.start is not None:
+            start = int(np.searchsorted(keys, self._to_key(index.start), "left"))
+        if index.stop is not None:
+            stop = int(np.searchsorted(keys, self._to_key(index.stop), "right"))
+        return start, max(start, stop)
+
+    def _label_position(self, label: _T) -> int:
+        keys, order = self._sorted_keys()
+        key = self._to_key(label)
+        position = int(np.searchsorted(keys, key, "left"))
+        if position == len(keys) or keys[position] != key:
+            raise KeyError(label)
+        return position if order is None else int(order[position])
+
+    def _label_positions(self, index: Union[slice, _T]) -> Union[int, np.ndarray]:
+        if not isinstance(index, slice):
+            return self._label_position(index)
+        start, stop = self._label_locs(index)
+        if self._is_sorted:
+            return np.arange(start, stop)
+        _, order = self._sorted_keys()
+        return order[start:stop]
+
+    def slice_locs(self, start: Optional[_T], stop: Optional[_T]) -> Tuple[int, int]:
+        if not self._is_sorted:
+            raise ValueError("Index array is not sorted")
+        return self._label_locs(slice(start, stop))
+
+    def searchsorted(self, values: np.ndarray, side: str = "left") -> np.ndarray:
+        if not self._is_sorted:
+            raise ValueError("Index array is not sorted")
+        return np.searchsorted(self._keys, np.asarray(values, dtype=self._dtype), side)
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        return self._keys[np.asarray(positions, dtype=np.int64)]
 
     def insert(self, index: Union[int, _T], item: Union[_T, np.array]) -> None:
         if not self.is_integer_index(index):
             try:
-                value_index = self._values[index]
+                value_index = self._label_position(index)
             except KeyError:
-                if len(self._values) == 0:
+                if len(self) == 0:
                     value_index = 0
                 else:
                     raise ValueError(f"Index {index} not found")
         else:
             value_index = index
-        self._keys = np.insert(self._keys, value_index, item)
-        self._set_data_series()
+        values = np.atleast_1d(np.asarray(item, dtype=self._dtype))
+        if value_index < 0:
+            value_index += len(self)
+        self._keys = np.insert(self._keys, value_index, values)
 
     def __len__(self) -> int:
-        return len(self._keys)
+        return self._size
 
     @overload
     def __getitem__(self, index: int) -> _T:
@@ -70,16 +172,33 @@ class IndexArrayStorage(Generic[_T], MutableSequence):
     def __getitem__(self, index: Union[int, slice, _T]) -> Union[int, _T, pd.Series]:
         if self.is_integer_index(index):
             return self._keys[index]
-        return self._values[index]
+        if not isinstance(index, slice):
+            return self._label_position(index)
+        start, stop = self._label_locs(index)
+        keys, order = self._sorted_keys()
+        if order is None:
+            return self.get_data_series(keys[start:stop], self._series_dtype, start)
+        return pd.Series(
+            order[start:stop],
+            index=self.get_index(keys[start:stop], self._series_dtype),
+        )
 
     def __setitem__(
         self, index: Union[int, slice, _T], item: Union[int, np.array]
     ) -> None:
         if self.is_integer_index(index):
             self._keys[index] = item
-        else:
-            self._keys[self._values.sort_index().loc[index]] = item
-        self._set_data_series()
+            if isinstance(index, int):
+                index = slice(index, index + 1 if index != -1 else None)
+            start, stop, _ = index.indices(len(self))
+            self._mark_modified(start, stop)
+            return
+        positions = self._label_positions(index)
+        self._keys[positions] = item
+        self._order = None
+        self._is_sorted = self.is_sorted(self._keys)
+        if np.size(positions) and np.min(positions) < self._persisted_size:
+            self._rewrite = True
 
     @overload
     def __delitem__(self, index: int) -> None:
@@ -97,18 +216,25 @@ class IndexArrayStorage(Generic[_T], MutableSequence):
         if self.is_integer_index(index):
             self._keys = np.delete(self._keys, index)
         else:
-            self._keys = np.delete(self._keys, self._values[index])
-        self._set_data_series()
+            self._keys = np.delete(self._keys, self._label_positions(index))
 
     def append(self, item: _T) -> None:
-        self._keys = np.append(self._keys, np.array([item], dtype=self._dtype))
-        self._set_data_series()
+        self.extend(np.array([item], dtype=self._dtype).ravel())
 
     def extend(self, values: Iterable[_T]) -> None:
-        self._keys = np.concatenate([self._keys, values])
-        self._set_data_series()
+        values = np.asarray(values, dtype=self._dtype).ravel()
+        size = self._size + len(values)
+        if size > len(self._buffer):
+            capacity = max(size, int(len(self._buffer) * self.GROWTH_FACTOR))
+            buffer = np.empty(capacity, dtype=self._dtype)
+            buffer[: self._size] = self._keys
+            self._buffer = buffer
+        start = self._size
+        self._buffer[start:size] = values
+        self._size = size
+        self._mark_modified(start, size)
 
-    def load(self) -> pd.Series:
+    def load(self) -> np.array:
         if self._uri.exists():
             return np.fromfile(self._uri, dtype=self._dtype)
         else:
@@ -117,13 +243,29 @@ class IndexArrayStorage(Generic[_T], MutableSequence):
 
     def reload(self) -> None:
         self._keys = self.load()
-        self._set_data_series()
+        self._mark_persisted()
 
-    async def save(self) -> None:
-        if self._keys.size > 0:
-            self._keys.tofile(self._uri)
-        else:
+    def _is_tail_append(self) -> bool:
+        # Any external change since the last load or dump, even one that keeps
+        # the file size, falls back to a full rewrite.
+        if self._rewrite or self._persisted_signature is None:
+            return False
+        return get_file_signature(self._uri) == self._persisted_signature
+
+    def dump(self) -> None:
+        if self._size == 0:
             self._uri.unlink(missing_ok=True)
+        elif self._is_tail_append():
+            persisted_size = self._persisted_size
+            if self._size > persisted_size:
+                with open(self._uri, "ab") as f:
+                    self._keys[persisted_size:].tofile(f)
+        else:
+            self._keys.tofile(self._uri)
+        self._mark_persisted()
+
+    async def save(self) -> None:
+        await self._io_executor.run(self.dump, uri=self._uri, exclusive=True)
 
 
 class DatetimeIndexArrayStorage(IndexArrayStorage):
@@ -133,9 +275,17 @@ class DatetimeIndexArrayStorage(IndexArrayStorage):
     def __init__(
         self,
         uri: pathlib.Path,
+        io_executor: Optional[IOExecutor] = None,
     ) -> None:
-        super().__init__(uri, self.ARRAY_DTYPE)
-        self._values: pd.Series = self.get_data_series(self._keys, self.SERIES_DTYPE)
+        super().__init__(
+            uri,
+            self.ARRAY_DTYPE,
+            io_executor=io_executor,
+            series_dtype=self.SERIES_DTYPE,
+        )
 
-    def _set_data_series(self) -> None:
-        self._values = self.get_data_series(self._keys, self.SERIES_DTYPE)
+    @staticmethod
+    def get_index(array: np.array, dtype: str) -> pd.Index:
+        if dtype == DatetimeIndexArrayStorage.SERIES_DTYPE:
+            return utc_index(array)
+        return pd.Index(array, dtype=dtype)
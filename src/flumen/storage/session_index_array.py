@@ -0,0 +1,127 @@
+import pathlib
+from typing import Optional, Tuple
+
+import numpy as np
+
+from flumen.frequency.session import (
+    SESSION_DAY,
+    SESSION_TABLE_WIDTH,
+    count_session_bars,
+    generate_session_bars,
+    get_exchange,
+    get_session_bounds,
+)
+from flumen.storage.implicit_index_array import ImplicitIndexArrayStorage
+from flumen.utils.executor import IOExecutor
+
+
+class SessionIndexArrayStorage(ImplicitIndexArrayStorage):
+    def __init__(
+        self,
+        uri: pathlib.Path,
+        exchange: str,
+        frequency: str,
+        io_executor: Optional[IOExecutor] = None,
+    ) -> None:
+        super().__init__(uri, io_executor=io_executor)
+        self._frequency = frequency
+        self._tz = get_exchange(exchange).tz
+        self._table = self.load()
+
+    @property
+    def _table(self) -> np.ndarray:
+        return self._sessions
+
+    @_table.setter
+    def _table(self, table: np.ndarray) -> None:
+        self._sessions = np.asarray(table, dtype=np.int64).reshape(
+            -1, SESSION_TABLE_WIDTH
+        )
+        counts = count_session_bars(self._sessions, self._frequency)
+        self._offsets = np.append(0, np.cumsum(counts))
+        self._first, self._last = get_session_bounds(
+            self._sessions, self._frequency, self._tz
+        )
+
+    @property
+    def sessions(self) -> np.ndarray:
+        return self._table
+
+    def _bars(self, session_start: int, session_stop: int) -> np.ndarray:
+        return generate_session_bars(
+            self._table[session_start:session_stop], self._frequency, self._tz
+        )
+
+    def _session_of(self, position: int) -> int:
+        return int(np.searchsorted(self._offsets, position, "right")) - 1
+
+    def _label_locs(self, index: slice) -> Tuple[int, int]:
+        session_start, session_stop = 0, len(self._table)
+        if index.start is not None:
+            start_key = self._to_key(index.start)
+            session_start = int(np.searchsorted(self._last, start_key, "left"))
+        if index.stop is not None:
+            stop_key = self._to_key(index.stop)
+            session_stop = int(np.searchsorted(self._first, stop_key, "right"))
+        session_stop = max(session_start, session_stop)
+        bars = self._bars(session_start, session_stop)
+        start, stop = 0, len(bars)
+        if index.start is not None:
+            start = int(np.searchsorted(bars, start_key, "left"))
+        if index.stop is not None:
+            stop = int(np.searchsorted(bars, stop_key, "right"))
+        offset = int(self._offsets[session_start])
+        return offset + start, offset + max(start, stop)
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def _get_positions(self, start: int, stop: int) -> np.ndarray:
+        if start >= stop:
+            return np.array([], dtype=self.ARRAY_DTYPE)
+        session_start = self._session_of(start)
+        session_stop = self._session_of(stop - 1) + 1
+        offset = int(self._offsets[session_start])
+        bars = self._bars(session_start, session_stop)
+        return bars[slice(start - offset, stop - offset)].view(self.ARRAY_DTYPE)
+
+    def searchsorted(self, values: np.ndarray, side: str = "left") -> np.ndarray:
+        keys = np.asarray(values, dtype=self.ARRAY_DTYPE).view(np.int64)
+        if not len(keys):
+            return np.array([], dtype=np.int64)
+        session_start = int(np.searchsorted(self._last, keys.min(), "left"))
+        session_stop = int(np.searchsorted(self._first, keys.max(), "right"))
+        session_stop = max(session_start, session_stop)
+        bars = self._bars(session_start, session_stop)
+        return self._offsets[session_start] + np.searchsorted(bars, keys, side)
+
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return np.array([], dtype=self.ARRAY_DTYPE)
+        session_start = self._session_of(int(positions.min()))
+        session_stop = self._session_of(int(positions.max())) + 1
+        bars = self._bars(session_start, session_stop)
+        return bars[positions - self._offsets[session_start]].view(self.ARRAY_DTYPE)
+
+    def __delitem__(self, index: slice) -> None:
+        start, stop, _ = index.indices(len(self))
+        session_start, session_stop = np.searchsorted(self._offsets, [start, stop])
+        if self._offsets[session_start] != start or self._offsets[session_stop] != stop:
+            raise ValueError("Only whole sessions can be deleted")
+        self._table = np.delete(self._table, np.s_[session_start:session_stop], axis=0)
+
+    def extend_sessions(self, table: np.ndarray) -> None:
+        table = np.asarray(table, dtype=np.int64).reshape(-1, SESSION_TABLE_WIDTH)
+        if len(self._table):
+            table = table[table[:, SESSION_DAY] > self._table[-1, SESSION_DAY]]
+        self._table = np.concatenate([self._table, table])
+
+    def reload(self) -> None:
+        self._table = self.load()
+
+    def dump(self) -> None:
+        if len(self._table) == 0:
+            self._uri.unlink(missing_ok=True)
+        else:
+            self._table.tofile(self._uri)
@@ -0,0 +1,54 @@
+import os
+import pathlib
+import pickle
+from typing import List, Tuple
+
+import numpy as np
+
+from flumen.utils.path import fsync_dir
+
+WalRecord = Tuple[str, int, int, np.ndarray]
+
+
+class WriteAheadLog:
+    def __init__(self, uri: pathlib.Path) -> None:
+        self._uri = uri
+        self._size = 0
+
+    @property
+    def uri(self) -> pathlib.Path:
+        return self._uri
+
+    def __len__(self) -> int:
+        return self._size
+
+    def replay(self) -> List[WalRecord]:
+        records: List[WalRecord] = []
+        self._size = 0
+        if not self._uri.exists():
+            return records
+        with open(self._uri, "rb") as f:
+            while True:
+                try:
+                    records.append(pickle.load(f))
+                except (EOFError, pickle.UnpicklingError):
+                    break
+                self._size = f.tell()
+        return records
+
+    def append(self, records: List[WalRecord]) -> None:
+        created = not self._uri.exists()
+        with open(self._uri, "ab") as f:
+            f.truncate(self._size)
+            f.write(b"".join(pickle.dumps(record) for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+            self._size = f.tell()
+        if created:
+            fsync_dir(self._uri.parent)
+
+    def truncate(self) -> None:
+        if self._uri.exists():
+            self._uri.unlink()
+            fsync_dir(self._uri.parent)
+        self._size = 0
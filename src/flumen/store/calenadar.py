@@ -1,74 +1,331 @@
 import pathlib
-from typing import Dict, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import pendulum
+from pandas.tseries.frequencies import to_offset
 
-from flumen.frequency.datetime import date_range
-from flumen.models.frequency import Frequency
+from flumen.frequency.datetime import date_range, is_right_labelled, session_range
+from flumen.models.frequency import MARKET_FREQ_UNIT, Frequency, FrequencyUnit
+from flumen.storage.implicit_index_array import RangeIndexArrayStorage
 from flumen.storage.index_array import DatetimeIndexArrayStorage
+from flumen.storage.session_index_array import SessionIndexArrayStorage
 from flumen.store.base import Store
+from flumen.utils.executor import IOExecutor, get_io_executor
+from flumen.utils.lazy import LazyDict
+from flumen.utils.path import get_file_signature
+
+CalendarStorage = Union[
+    DatetimeIndexArrayStorage, RangeIndexArrayStorage, SessionIndexArrayStorage
+]
+RANGE_FREQ_UNITS = (FrequencyUnit.S, FrequencyUnit.T, FrequencyUnit.H, FrequencyUnit.D)
 
 
 class CalendarStore(Store):
     CALENDAR_STORAGE_EXTENSION = ".calendar"
+    RANGE_STORAGE_EXTENSION = ".range"
+    SESSION_STORAGE_EXTENSION = ".session"
 
     def __init__(
         self,
         root_uri: pathlib.Path,
+        io_executor: Optional[IOExecutor] = None,
     ) -> None:
         self._uri = self.get_uri(root_uri)
+        self._io_executor = io_executor or get_io_executor()
+        self._signatures: Dict[Frequency, Optional[Tuple[int, int, int]]] = {}
+        self._legacy_freqs: Set[Frequency] = set()
         self._data = self._load_exists_data()
 
-    def _load_exists_data(self) -> Dict[Frequency, DatetimeIndexArrayStorage]:
-        data: Dict[Frequency, DatetimeIndexArrayStorage] = {}
-        for calendar_file in self._uri.glob(f"*{self.CALENDAR_STORAGE_EXTENSION}"):
+    def _load_exists_data(self) -> LazyDict[Frequency, CalendarStorage]:
+        data: LazyDict[Frequency, CalendarStorage] = LazyDict()
+        for calendar_file in self._uri.iterdir():
             try:
                 freq = Frequency.from_str(calendar_file.stem)
             except ValueError:
                 continue
-            data[freq] = DatetimeIndexArrayStorage(calendar_file)
+            if calendar_file != self.get_freq_calendar_uri(freq):
+                if not self._is_legacy_calendar(freq, calendar_file):
+                    continue
+                self._legacy_freqs.add(freq)
+            data.register(freq, partial(self._load_calendar, freq))
+            self._signatures[freq] = get_file_signature(calendar_file)
         return data
 
+    def _is_legacy_calendar(self, freq: Frequency, calendar_file: pathlib.Path) -> bool:
+        # Stores written before session and range calendars existed keep every
+        # frequency as a plain datetime `.calendar` file, keep reading those as-is.
+        return (
+            calendar_file.suffix == self.CALENDAR_STORAGE_EXTENSION
+            and not self.get_freq_calendar_uri(freq).exists()
+        )
+
+    def _sync_calendar(self, freq: Frequency) -> None:
+        if not self._io_executor.process_lock:
+            return
+        signature = get_file_signature(self.get_freq_calendar_uri(freq))
+        if signature == self._signatures.get(freq):
+            return
+        if signature is None:
+            if freq in self._data:
+                del self._data[freq]
+        elif freq in self._data:
+            self._data.unload(freq)
+        else:
+            self._data.register(freq, partial(self._load_calendar, freq))
+        self._signatures[freq] = signature
+
+    def _mark_synced(self, freq: Frequency) -> None:
+        if self._io_executor.process_lock:
+            uri = self.get_freq_calendar_uri(freq)
+            self._signatures[freq] = get_file_signature(uri)
+
+    def _load_calendar(self, freq: Frequency) -> CalendarStorage:
+        with self._io_executor.lock(self.get_freq_calendar_uri(freq)):
+            return self._open_calendar(freq)
+
+    def _open_calendar(self, freq: Frequency) -> CalendarStorage:
+        uri = self.get_freq_calendar_uri(freq)
+        if freq in self._legacy_freqs:
+            return DatetimeIndexArrayStorage(uri, io_executor=self._io_executor)
+        if self.is_session_freq(freq):
+            return SessionIndexArrayStorage(
+                uri,
+                freq.unit.market_exchange,
+                freq.to_str(),
+                io_executor=self._io_executor,
+            )
+        if self.is_range_freq(freq):
+            return RangeIndexArrayStorage(
+                uri, self.get_range_step(freq), io_executor=self._io_executor
+            )
+        return DatetimeIndexArrayStorage(uri, io_executor=self._io_executor)
+
+    @staticmethod
+    def is_session_freq(freq: Frequency) -> bool:
+        return freq.unit.unit_type == MARKET_FREQ_UNIT
+
+    @staticmethod
+    def is_range_freq(freq: Frequency) -> bool:
+        return freq.unit in RANGE_FREQ_UNITS
+
+    @staticmethod
+    def get_range_step(freq: Frequency) -> int:
+        return to_offset(freq.raw_str).nanos
+
+    def unload_idle(self, max_idle: float) -> List[Frequency]:
+        return self._data.unload_idle(max_idle)
+
     def get_freq_calendar_uri(self, freq: Frequency) -> pathlib.Path:
+        if freq in self._legacy_freqs:
+            return self._uri / f"{freq.raw_str}{self.CALENDAR_STORAGE_EXTENSION}"
+        if self.is_session_freq(freq):
+            return self._uri / f"{freq.raw_str}{self.SESSION_STORAGE_EXTENSION}"
+        if self.is_range_freq(freq):
+            return self._uri / f"{freq.raw_str}{self.RANGE_STORAGE_EXTENSION}"
         return self._uri / f"{freq.raw_str}{self.CALENDAR_STORAGE_EXTENSION}"
 
-    async def insert(
+    def _extend_calendar(
         self,
         freq: Frequency,
         start_datetime: pendulum.DateTime,
         end_datetime: pendulum.DateTime,
+        skip_first: bool = False,
     ) -> None:
+        calendar = self._data[freq]
+        if isinstance(calendar, SessionIndexArrayStorage):
+            calendar.extend_sessions(session_range(freq, start_datetime, end_datetime))
+        elif isinstance(calendar, RangeIndexArrayStorage):
+            calendar.extend_range(
+                pd.Timestamp(start_datetime.in_tz("UTC").to_datetime_string()).value,
+                pd.Timestamp(end_datetime.in_tz("UTC").to_datetime_string()).value,
+            )
+        else:
+            calendar_values = date_range(freq, start_datetime, end_datetime).values
+            if skip_first:
+                calendar_values = calendar_values[calendar_values > calendar[-1]]
+            calendar.extend(calendar_values)
+        calendar.dump()
+        self._mark_synced(freq)
+
+    def _insert(
+        self,
+        freq: Frequency,
+        start_datetime: pendulum.DateTime,
+        end_datetime: pendulum.DateTime,
+    ) -> None:
+        self._sync_calendar(freq)
         if freq in self._data:
             raise ValueError(f"Calendar for {freq} already exists")
-        calendar_series = date_range(freq, start_datetime, end_datetime)
-        self._data[freq] = DatetimeIndexArrayStorage(self.get_freq_calendar_uri(freq))
-        self._data[freq].extend(calendar_series.values)
-        await self._data[freq].save()
+        self._data.register(freq, partial(self._load_calendar, freq))
+        self._data[freq] = self._load_calendar(freq)
+        self._extend_calendar(freq, start_datetime, end_datetime)
 
-    async def find(
+    async def insert(
+        self,
+        freq: Frequency,
+        start_datetime: pendulum.DateTime,
+        end_datetime: pendulum.DateTime,
+    ) -> None:
+        await self._io_executor.run(
+            self._insert,
+            freq,
+            start_datetime,
+            end_datetime,
+            uri=self.get_freq_calendar_uri(freq),
+            exclusive=True,
+        )
+
+    def _find(
         self,
         freq: Frequency,
         start_datetime: pendulum.DateTime,
         end_datetime: pendulum.DateTime,
     ) -> pd.Series:
+        self._sync_calendar(freq)
         if freq not in self._data:
             raise ValueError(f"Calendar for {freq} does not exist")
         return self._data[freq][start_datetime:end_datetime]
 
-    async def update(
+    async def find(
         self,
         freq: Frequency,
-        *,
-        start_datetime: Optional[pendulum.DateTime] = None,
+        start_datetime: pendulum.DateTime,
         end_datetime: pendulum.DateTime,
-        upsert: bool = False,
+    ) -> pd.Series:
+        return await self._io_executor.run(
+            self._find,
+            freq,
+            start_datetime,
+            end_datetime,
+            uri=self.get_freq_calendar_uri(freq),
+        )
+
+    def _slice_locs(
+        self, freq: Frequency, start_datetime: Any, end_datetime: Any
+    ) -> Tuple[int, int]:
+        self._sync_calendar(freq)
+        if freq not in self._data:
+            raise ValueError(f"Calendar for {freq} does not exist")
+        return self._data[freq].slice_locs(start_datetime, end_datetime)
+
+    async def slice_locs(
+        self, freq: Frequency, start_datetime: Any, end_datetime: Any
+    ) -> Tuple[int, int]:
+        return await self._io_executor.run(
+            self._slice_locs,
+            freq,
+            start_datetime,
+            end_datetime,
+            uri=self.get_freq_calendar_uri(freq),
+        )
+
+    def _find_datetimes(
+        self, freq: Frequency, start_index: int, end_index: int
+    ) -> np.ndarray:
+        self._sync_calendar(freq)
+        if freq not in self._data:
+            raise ValueError(f"Calendar for {freq} does not exist")
+        return self._data[freq][start_index:end_index]
+
+    async def find_datetimes(
+        self, freq: Frequency, start_index: int, end_index: int
+    ) -> np.ndarray:
+        return await self._io_executor.run(
+            self._find_datetimes,
+            freq,
+            start_index,
+            end_index,
+            uri=self.get_freq_calendar_uri(freq),
+        )
+
+    @staticmethod
+    def _to_datetime64(timestamps: Any) -> np.ndarray:
+        if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "M":
+            return timestamps.astype("datetime64[ns]", copy=False)
+        index = pd.DatetimeIndex(np.atleast_1d(timestamps))
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        return index.values
+
+    def _locate(
+        self, freq: Frequency, timestamps: Any, side: str, asof: bool
+    ) -> np.ndarray:
+        self._sync_calendar(freq)
+        if freq not in self._data:
+            raise ValueError(f"Calendar for {freq} does not exist")
+        if side not in ("left", "right"):
+            raise ValueError(f"Invalid side: {side}")
+        values = self._to_datetime64(timestamps)
+        if asof:
+            return self._data[freq].searchsorted(values, "right") - 1
+        return self._data[freq].searchsorted(values, side)
+
+    async def locate(
+        self,
+        freq: Frequency,
+        timestamps: Any,
+        side: str = "left",
+        asof: bool = False,
+    ) -> np.ndarray:
+        return await self._io_executor.run(
+            self._locate,
+            freq,
+            timestamps,
+            side,
+            asof,
+            uri=self.get_freq_calendar_uri(freq),
+        )
+
+    def _map(
+        self, freq_from: Frequency, freq_to: Frequency, positions: Any
+    ) -> np.ndarray:
+        self._sync_calendar(freq_from)
+        self._sync_calendar(freq_to)
+        for freq in (freq_from, freq_to):
+            if freq not in self._data:
+                raise ValueError(f"Calendar for {freq} does not exist")
+        calendar_from, calendar_to = self._data[freq_from], self._data[freq_to]
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) and (
+            positions.min() < 0 or positions.max() >= len(calendar_from)
+        ):
+            raise ValueError(f"Positions out of range for {freq_from} calendar")
+        values = calendar_from.take(positions)
+        if is_right_labelled(freq_to):
+            mapped = calendar_to.searchsorted(values, "left")
+            return np.where(mapped < len(calendar_to), mapped, -1)
+        return calendar_to.searchsorted(values, "right") - 1
+
+    async def map(
+        self, freq_from: Frequency, freq_to: Frequency, positions: Any
+    ) -> np.ndarray:
+        return await self._io_executor.run(
+            self._map,
+            freq_from,
+            freq_to,
+            positions,
+            uri=[
+                self.get_freq_calendar_uri(freq_from),
+                self.get_freq_calendar_uri(freq_to),
+            ],
+        )
+
+    def _update(
+        self,
+        freq: Frequency,
+        start_datetime: Optional[pendulum.DateTime],
+        end_datetime: pendulum.DateTime,
+        upsert: bool,
     ) -> None:
+        self._sync_calendar(freq)
         # TODO: Update the calendar start datetime without changing the existing
         #  calendar index
         if freq not in self._data:
             if upsert and start_datetime is not None:
-                return await self.insert(freq, start_datetime, end_datetime)
+                return self._insert(freq, start_datetime, end_datetime)
             else:
                 raise ValueError(f"Calendar for {freq} does not exist")
         current_end_datetime = pendulum.parse(self._data[freq][-1].astype(str))
@@ -77,16 +334,71 @@ class CalendarStore(Store):
                 f"End datetime {end_datetime} must be greater than"
                 f" current end datetime {current_end_datetime}"
             )
-        calendar_series = date_range(freq, current_end_datetime, end_datetime)
-        self._data[freq].extend(calendar_series.values[1:])
-        await self._data[freq].save()
+        self._extend_calendar(freq, current_end_datetime, end_datetime, skip_first=True)
 
-    async def delete(
+    async def update(
         self,
         freq: Frequency,
+        *,
+        start_datetime: Optional[pendulum.DateTime] = None,
+        end_datetime: pendulum.DateTime,
+        upsert: bool = False,
     ) -> None:
+        await self._io_executor.run(
+            self._update,
+            freq,
+            start_datetime,
+            end_datetime,
+            upsert,
+            uri=self.get_freq_calendar_uri(freq),
+            exclusive=True,
+        )
+
+    def _extend(
+        self,
+        freq: Frequency,
+        start_datetime: pendulum.DateTime,
+        end_datetime: pendulum.DateTime,
+    ) -> None:
+        self._sync_calendar(freq)
+        if freq not in self._data:
+            return self._insert(freq, start_datetime, end_datetime)
+        current_end_datetime = pendulum.parse(self._data[freq][-1].astype(str))
+        if end_datetime > current_end_datetime:
+            self._update(freq, None, end_datetime, False)
+
+    async def extend(
+        self,
+        freq: Frequency,
+        start_datetime: pendulum.DateTime,
+        end_datetime: pendulum.DateTime,
+    ) -> None:
+        await self._io_executor.run(
+            self._extend,
+            freq,
+            start_datetime,
+            end_datetime,
+            uri=self.get_freq_calendar_uri(freq),
+            exclusive=True,
+        )
+
+    def _delete(
+        self,
+        freq: Frequency,
+    ) -> None:
+        self._sync_calendar(freq)
         if freq not in self._data:
             raise ValueError(f"Calendar for {freq} does not exist")
         del self._data[freq][:]
-        await self._data[freq].save()
+        self._data[freq].dump()
         del self._data[freq]
+        self._legacy_freqs.discard(freq)
+        self._mark_synced(freq)
+
+    async def delete(
+        self,
+        freq: Frequency,
+    ) -> None:
+        await self._io_executor.run(
+            self._delete, freq, uri=self.get_freq_calendar_uri(freq), exclusive=True
+        )
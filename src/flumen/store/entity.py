@@ -1,24 +1,94 @@
 import pathlib
-from typing import Optional, Tuple
+from typing import Any, Optional, Sequence, Tuple
 
+import numpy as np
+import pandas as pd
 import pendulum
 
-from flumen.storage.dict import DictStorage
+from flumen.storage.dict import LogDictStorage
 from flumen.store.base import Store
+from flumen.utils.executor import IOExecutor, get_io_executor
+
+NanosRange = Tuple[int, int]
 
 
 class EntityStore(Store):
     ENTITY_STORAGE_EXTENSION = ".entity"
 
-    def __init__(self, root_uri: pathlib.Path) -> None:
+    def __init__(
+        self, root_uri: pathlib.Path, io_executor: Optional[IOExecutor] = None
+    ) -> None:
         self._uri = self.get_uri(root_uri)
+        self._io_executor = io_executor or get_io_executor()
         self._data = self._load_exists_data()
 
     def get_uri(self, root_uri: pathlib.Path) -> pathlib.Path:
         return root_uri / ("entities" + self.ENTITY_STORAGE_EXTENSION)
 
-    def _load_exists_data(self) -> DictStorage:
-        return DictStorage(self._uri)
+    def _load_exists_data(self) -> LogDictStorage:
+        return LogDictStorage(
+            self._uri, io_executor=self._io_executor, merge=self._merge_range
+        )
+
+    @staticmethod
+    def _to_range(value: Tuple[Any, Any]) -> NanosRange:
+        # Ranges are kept as UTC nanoseconds; entries written by older versions
+        # still hold pendulum datetimes and are converted when read.
+        start, end = value
+        if isinstance(start, int) and isinstance(end, int):
+            return start, end
+        return pd.Timestamp(start).value, pd.Timestamp(end).value
+
+    @classmethod
+    def _merge_range(
+        cls,
+        current: NanosRange,
+        item: NanosRange,
+        base: Optional[NanosRange],
+    ) -> NanosRange:
+        # Bounds this process extended are unioned with the stored range, bounds
+        # it narrowed win, and bounds it left alone keep the stored value.
+        current, item = cls._to_range(current), cls._to_range(item)
+        if base is None:
+            return min(current[0], item[0]), max(current[1], item[1])
+        base = cls._to_range(base)
+        start, end = current
+        if item[0] < base[0]:
+            start = min(start, item[0])
+        elif item[0] > base[0]:
+            start = item[0]
+        if item[1] > base[1]:
+            end = max(end, item[1])
+        elif item[1] < base[1]:
+            end = item[1]
+        return start, end
+
+    @staticmethod
+    def _to_datetime_index(datetimes: Sequence, size: int) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(pd.to_datetime(datetimes, utc=True))
+        if len(index) != size:
+            raise ValueError(f"Expected {size} datetimes, got {len(index)}")
+        return index
+
+    @staticmethod
+    def _to_pendulum(nanos: int) -> pendulum.DateTime:
+        return pendulum.instance(pd.Timestamp(nanos, tz="UTC").to_pydatetime())
+
+    def _get_ranges(self, entities: Sequence[str]) -> np.ndarray:
+        ranges = [self._to_range(self._data[entity]) for entity in entities]
+        return np.array(ranges, dtype=np.int64).reshape(-1, 2)
+
+    def _validate_entities(self, entities: Sequence[str], exists: bool) -> None:
+        if len(set(entities)) != len(entities):
+            raise ValueError("Entities must be unique")
+        for entity in entities:
+            if (entity in self._data) != exists:
+                if exists:
+                    raise ValueError(f"Entity {entity} does not exist")
+                raise ValueError(f"Entity {entity} already exists")
+
+    def __contains__(self, entity: object) -> bool:
+        return entity in self._data
 
     async def insert(
         self,
@@ -28,7 +98,7 @@ class EntityStore(Store):
     ) -> None:
         if entity in self._data:
             raise ValueError(f"Entity {entity} already exists")
-        self._data[entity] = (start_datetime, end_datetime)
+        self._data[entity] = self._to_range((start_datetime, end_datetime))
         await self._data.save()
 
     async def find(
@@ -37,7 +107,8 @@ class EntityStore(Store):
     ) -> Tuple[pendulum.DateTime, pendulum.DateTime]:
         if entity not in self._data:
             raise ValueError(f"Entity {entity} does not exist")
-        return self._data[entity]
+        start, end = self._to_range(self._data[entity])
+        return self._to_pendulum(start), self._to_pendulum(end)
 
     async def update(
         self,
@@ -48,10 +119,12 @@ class EntityStore(Store):
     ) -> None:
         if entity not in self._data:
             raise ValueError(f"Entity {entity} does not exist")
+        start, end = self._to_range(self._data[entity])
         if start_datetime is not None:
-            self._data[entity] = (start_datetime, self._data[entity][1])
+            start = pd.Timestamp(start_datetime).value
         if end_datetime is not None:
-            self._data[entity] = (self._data[entity][0], end_datetime)
+            end = pd.Timestamp(end_datetime).value
+        self._data[entity] = (start, end)
         await self._data.save()
 
     async def delete(self, entity: str) -> None:
@@ -59,3 +132,51 @@ class EntityStore(Store):
             raise ValueError(f"Entity {entity} does not exist")
         del self._data[entity]
         await self._data.save()
+
+    async def insert_many(
+        self,
+        entities: Sequence[str],
+        start_datetimes: Sequence,
+        end_datetimes: Sequence,
+    ) -> None:
+        self._validate_entities(entities, exists=False)
+        start_index = self._to_datetime_index(start_datetimes, len(entities))
+        end_index = self._to_datetime_index(end_datetimes, len(entities))
+        if (end_index < start_index).any():
+            raise ValueError("start_datetime must be less than end_datetime")
+        self._data.update(
+            zip(entities, zip(start_index.asi8.tolist(), end_index.asi8.tolist()))
+        )
+        await self._data.save()
+
+    async def find_many(
+        self,
+        entities: Sequence[str],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        self._validate_entities(entities, exists=True)
+        starts, ends = self._get_ranges(entities).T.astype("datetime64[ns]")
+        return starts, ends
+
+    async def update_many(
+        self,
+        entities: Sequence[str],
+        *,
+        start_datetimes: Optional[Sequence] = None,
+        end_datetimes: Optional[Sequence] = None,
+    ) -> None:
+        self._validate_entities(entities, exists=True)
+        starts, ends = self._get_ranges(entities).T
+        if start_datetimes is not None:
+            starts = self._to_datetime_index(start_datetimes, len(entities)).asi8
+        if end_datetimes is not None:
+            ends = self._to_datetime_index(end_datetimes, len(entities)).asi8
+        if (ends < starts).any():
+            raise ValueError("start_datetime must be less than end_datetime")
+        self._data.update(zip(entities, zip(starts.tolist(), ends.tolist())))
+        await self._data.save()
+
+    async def delete_many(self, entities: Sequence[str]) -> None:
+        self._validate_entities(entities, exists=True)
+        for entity in entities:
+            del self._data[entity]
+        await self._data.save()
@@ -1,26 +1,274 @@
+import asyncio
 import pathlib
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 
 import numpy as np
 
-from flumen.storage.big_array import BigArrayStorage
+from flumen.storage.big_array import BigArrayStorage, MemmapArrayStorage
+from flumen.storage.block_summary import BlockSummaryStorage, Predicate
+from flumen.storage.chunked_array import ChunkedArrayStorage
+from flumen.storage.codec import RAW_CODEC
+from flumen.storage.wal import WalRecord, WriteAheadLog
 from flumen.store.base import Store
+from flumen.utils.executor import IOExecutor, get_io_executor
+from flumen.utils.path import fsync_dir, fsync_path
+
+_R = TypeVar("_R")
 
 
 class FieldStore(Store):
     FIELD_STORAGE_EXTENSION = ".field"
+    FIELD_SUMMARY_EXTENSION = ".rollup"
     FIELD_DTYPE = np.dtype("float32")
+    WAL_FILE = "fields.wal"
+    WAL_REJECTED_FILE = "fields.wal.rejected"
 
-    def __init__(self, root_uri: pathlib.Path) -> None:
+    def __init__(
+        self,
+        root_uri: pathlib.Path,
+        mmap: bool = False,
+        chunk_size: Optional[int] = None,
+        block_size: int = BlockSummaryStorage.DEFAULT_BLOCK_SIZE,
+        io_executor: Optional[IOExecutor] = None,
+        wal: bool = False,
+    ) -> None:
         self._uri = self.get_uri(root_uri)
+        self._mmap = mmap
+        self._chunk_size = chunk_size
+        self._block_size = block_size
+        self._io_executor = io_executor or get_io_executor()
+        self._wal: Optional[WriteAheadLog] = None
+        self._wal_pending: List[Tuple[WalRecord, asyncio.Future]] = []
+        self._wal_unapplied: List[WalRecord] = []
+        self._wal_rejected: List[WalRecord] = []
+        self._wal_inflight = 0
+        self._wal_committer: Optional[asyncio.Future] = None
+        self._wal_applier: Optional[asyncio.Future] = None
+        if wal:
+            self._wal = WriteAheadLog(self._uri / self.WAL_FILE)
+            self._recover_wal()
 
     def get_field_uri(self, field: str) -> pathlib.Path:
         return self._uri / f"{field}{self.FIELD_STORAGE_EXTENSION}"
 
-    async def insert(self, field: str, values: np.array) -> None:
+    def get_field_summary_uri(self, field: str) -> pathlib.Path:
+        return self._uri / f"{field}{self.FIELD_SUMMARY_EXTENSION}"
+
+    def get_field_summary(self, field: str) -> BlockSummaryStorage:
+        uri = self.get_field_summary_uri(field)
+        return BlockSummaryStorage(uri, block_size=self._block_size)
+
+    def get_field_storage(
+        self, field: str, codec: Optional[str] = None
+    ) -> BigArrayStorage:
+        uri = self.get_field_uri(field)
+        if uri.is_dir():
+            return ChunkedArrayStorage(uri, dtype=self.FIELD_DTYPE)
+        if not uri.exists() and (self._chunk_size is not None or codec is not None):
+            return ChunkedArrayStorage(
+                uri,
+                dtype=self.FIELD_DTYPE,
+                chunk_size=self._chunk_size or ChunkedArrayStorage.DEFAULT_CHUNK_SIZE,
+                codec=codec or RAW_CODEC,
+            )
+        if self._mmap:
+            return MemmapArrayStorage(uri, dtype=self.FIELD_DTYPE)
+        return BigArrayStorage(uri, dtype=self.FIELD_DTYPE)
+
+    def _sync_field(self, field: str) -> None:
+        fsync_path(self.get_field_uri(field))
+        fsync_path(self.get_field_summary_uri(field))
+
+    def _reject_wal_records(self, records: List[WalRecord]) -> None:
+        rejected_wal = WriteAheadLog(self._uri / self.WAL_REJECTED_FILE)
+        rejected_wal.replay()
+        rejected_wal.append(records)
+
+    def _recover_wal(self) -> None:
+        assert self._wal is not None
+        with self._io_executor.lock(self._wal.uri, exclusive=True):
+            self._replay_wal()
+
+    def _replay_wal(self) -> None:
+        assert self._wal is not None
+        rejected: List[WalRecord] = []
+        for record in self._wal.replay():
+            field, start_index, end_index, values = record
+            if not self.get_field_uri(field).exists():
+                continue
+            try:
+                with self._io_executor.lock(self.get_field_uri(field), exclusive=True):
+                    self._update(field, start_index, end_index, values)
+                    self._sync_field(field)
+            except ValueError:
+                rejected.append(record)
+        if rejected:
+            self._reject_wal_records(rejected)
+        fsync_dir(self._uri)
+        self._wal.truncate()
+
+    @staticmethod
+    def _coalesce(records: List[WalRecord]) -> Dict[str, List[List[WalRecord]]]:
+        coalesced: Dict[str, List[List[WalRecord]]] = {}
+        for record in records:
+            field, start_index, end_index, values = record
+            field_runs = coalesced.setdefault(field, [])
+            if field_runs:
+                _, last_start, last_end, last_values = field_runs[-1][-1]
+                if (
+                    0 <= last_start <= last_end == start_index <= end_index
+                    and len(last_values) == last_end - last_start
+                    and len(values) == end_index - start_index
+                ):
+                    field_runs[-1].append(record)
+                    continue
+            field_runs.append([record])
+        return coalesced
+
+    @staticmethod
+    def _merge_run(run: List[WalRecord]) -> WalRecord:
+        field, start_index, _, _ = run[0]
+        end_index = run[-1][2]
+        values = np.concatenate([record[3] for record in run])
+        return field, start_index, end_index, values
+
+    async def _commit_wal(self) -> None:
+        assert self._wal is not None
+        while self._wal_pending:
+            batch, self._wal_pending = self._wal_pending, []
+            records = [record for record, _ in batch]
+            self._wal_inflight += 1
+            try:
+                await self._io_executor.run(
+                    self._wal.append, records, uri=self._wal.uri, exclusive=True
+                )
+            except Exception as e:
+                self._wal_inflight -= 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self._wal_unapplied.extend(records)
+            self._wal_inflight -= 1
+            if self._wal_applier is None or self._wal_applier.done():
+                self._wal_applier = asyncio.ensure_future(self._apply_wal())
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    def _apply_update(
+        self, field: str, start_index: int, end_index: int, values: np.array
+    ) -> None:
+        self._update(field, start_index, end_index, values)
+        self._sync_field(field)
+
+    async def _apply_record(self, record: WalRecord) -> None:
+        field, start_index, end_index, values = record
+        await self._io_executor.run(
+            self._apply_update,
+            field,
+            start_index,
+            end_index,
+            values,
+            uri=self.get_field_uri(field),
+            exclusive=True,
+        )
+
+    async def _apply_field_runs(
+        self, runs: List[List[WalRecord]]
+    ) -> List[Tuple[WalRecord, Exception]]:
+        failed: List[Tuple[WalRecord, Exception]] = []
+        for run in runs:
+            if len(run) > 1:
+                try:
+                    await self._apply_record(self._merge_run(run))
+                    continue
+                except Exception:
+                    # Apply the run record by record, so that only the records
+                    # that actually fail are rejected.
+                    pass
+            for record in run:
+                try:
+                    await self._apply_record(record)
+                except Exception as e:
+                    failed.append((record, e))
+        return failed
+
+    def _truncate_wal(self) -> None:
+        assert self._wal is not None
+        if self._wal_unapplied or self._wal_inflight:
+            return
+        if self._wal_rejected:
+            self._reject_wal_records(self._wal_rejected)
+            self._wal_rejected = []
+        fsync_dir(self._uri)
+        self._wal.truncate()
+
+    async def _apply_wal(self) -> None:
+        assert self._wal is not None
+        errors: List[Exception] = []
+        while self._wal_unapplied:
+            while self._wal_unapplied:
+                records, self._wal_unapplied = self._wal_unapplied, []
+                results = await asyncio.gather(
+                    *(
+                        self._apply_field_runs(field_runs)
+                        for field_runs in self._coalesce(records).values()
+                    )
+                )
+                for record, e in chain.from_iterable(results):
+                    self._wal_rejected.append(record)
+                    errors.append(e)
+            await self._io_executor.run(
+                self._truncate_wal, uri=self._wal.uri, exclusive=True
+            )
+        if errors:
+            raise errors[0]
+
+    async def flush(self) -> None:
+        while True:
+            tasks = [
+                task
+                for task in (self._wal_committer, self._wal_applier)
+                if task is not None and not task.done()
+            ]
+            if not tasks:
+                break
+            await asyncio.wait(tasks)
+        applier = self._wal_applier
+        if applier is not None and not applier.cancelled():
+            exc = applier.exception()
+            if exc is not None:
+                self._wal_applier = None
+                raise exc
+
+    def _insert(self, field: str, values: np.array, codec: Optional[str]) -> None:
         uri = self.get_field_uri(field)
         if uri.exists():
             raise ValueError(f"Field {field} already exists")
-        BigArrayStorage(uri, dtype=self.FIELD_DTYPE).extend(values)
+        storage = self.get_field_storage(field, codec=codec)
+        storage.extend(values)
+        self.get_field_summary(field).refresh(storage, 0, len(storage))
+
+    async def insert(
+        self, field: str, values: np.array, codec: Optional[str] = None
+    ) -> None:
+        await self.flush()
+        await self._io_executor.run(
+            self._insert,
+            field,
+            values,
+            codec,
+            uri=self.get_field_uri(field),
+            exclusive=True,
+        )
+
+    def _find(self, field: str, start_index: int, end_index: int) -> np.array:
+        uri = self.get_field_uri(field)
+        if not uri.exists():
+            raise ValueError(f"Field {field} does not exist")
+        return self.get_field_storage(field)[start_index:end_index]
 
     async def find(
         self,
@@ -28,10 +276,76 @@ class FieldStore(Store):
         start_index: int,
         end_index: int,
     ) -> np.array:
+        await self.flush()
+        return await self._io_executor.run(
+            self._find, field, start_index, end_index, uri=self.get_field_uri(field)
+        )
+
+    @staticmethod
+    def _broadcast_index(index: Union[int, Sequence[int]], size: int) -> List[int]:
+        if isinstance(index, int):
+            return [index] * size
+        if len(index) != size:
+            raise ValueError(f"Expected {size} indexes, got {len(index)}")
+        return list(index)
+
+    async def find_many(
+        self,
+        fields: Sequence[str],
+        start_index: Union[int, Sequence[int]],
+        end_index: Union[int, Sequence[int]],
+        as_dict: bool = False,
+    ) -> Union[np.array, Dict[str, np.array]]:
+        start_indexes = self._broadcast_index(start_index, len(fields))
+        end_indexes = self._broadcast_index(end_index, len(fields))
+        for field in fields:
+            if not self.get_field_uri(field).exists():
+                raise ValueError(f"Field {field} does not exist")
+        arrays = await asyncio.gather(
+            *(
+                self.find(field, start, end)
+                for field, start, end in zip(fields, start_indexes, end_indexes)
+            )
+        )
+        if as_dict:
+            return dict(zip(fields, arrays))
+        if len({len(array) for array in arrays}) > 1:
+            raise ValueError("Fields have different lengths, use as_dict=True")
+        if not arrays:
+            return np.empty((0, 0), dtype=self.FIELD_DTYPE)
+        return np.stack(arrays)
+
+    def _update(
+        self, field: str, start_index: int, end_index: int, values: np.array
+    ) -> None:
         uri = self.get_field_uri(field)
         if not uri.exists():
             raise ValueError(f"Field {field} does not exist")
-        return BigArrayStorage(uri, dtype=self.FIELD_DTYPE)[start_index:end_index]
+        storage = self.get_field_storage(field)
+        summary = self.get_field_summary(field)
+        synced = summary.is_synced(storage)
+        storage[start_index:end_index] = values
+        start, stop, _ = slice(start_index, end_index).indices(len(storage))
+        if not synced:
+            start, stop = 0, len(storage)
+        summary.refresh(storage, start, stop)
+
+    def _validate_update(
+        self, field: str, start_index: int, end_index: int, values: np.array
+    ) -> np.ndarray:
+        uri = self.get_field_uri(field)
+        if not uri.exists():
+            raise ValueError(f"Field {field} does not exist")
+        length = len(self.get_field_storage(field))
+        start, stop, _ = slice(start_index, end_index).indices(length)
+        values = np.asarray(values, dtype=self.FIELD_DTYPE)
+        try:
+            return np.array(np.broadcast_to(values, (max(stop - start, 0),)))
+        except ValueError:
+            raise ValueError(
+                f"Cannot update {field}[{start_index}:{end_index}] with"
+                f" {values.shape} values"
+            ) from None
 
     async def update(
         self,
@@ -41,13 +355,166 @@ class FieldStore(Store):
         end_index: int,
         values: np.array,
     ) -> None:
+        if self._wal is not None:
+            values = await self._io_executor.run(
+                self._validate_update,
+                field,
+                start_index,
+                end_index,
+                values,
+                uri=self.get_field_uri(field),
+            )
+            record = (field, start_index, end_index, values)
+            future = asyncio.get_running_loop().create_future()
+            self._wal_pending.append((record, future))
+            if self._wal_committer is None or self._wal_committer.done():
+                self._wal_committer = asyncio.ensure_future(self._commit_wal())
+            return await future
+        await self._io_executor.run(
+            self._update,
+            field,
+            start_index,
+            end_index,
+            values,
+            uri=self.get_field_uri(field),
+            exclusive=True,
+        )
+
+    def _write(
+        self, field: str, start_index: int, values: np.array, codec: Optional[str]
+    ) -> None:
+        if start_index < 0:
+            raise ValueError(f"Invalid start index: {start_index}")
+        values = np.asarray(values, dtype=self.FIELD_DTYPE)
+        storage = self.get_field_storage(field, codec=codec)
+        exists = self.get_field_uri(field).exists()
+        length = len(storage) if exists else 0
+        summary = self.get_field_summary(field)
+        start, stop = start_index, start_index + len(values)
+        if not exists or not summary.is_synced(storage):
+            start, stop = 0, max(length, stop)
+        overlap = min(max(length - start_index, 0), len(values))
+        if overlap:
+            storage[slice(start_index, start_index + overlap)] = values[:overlap]
+        if start_index > length:
+            storage.extend(np.full(start_index - length, np.nan, self.FIELD_DTYPE))
+        if overlap < len(values):
+            storage.extend(values[overlap:])
+        summary.refresh(storage, start, stop)
+
+    async def write(
+        self,
+        field: str,
+        start_index: int,
+        values: np.array,
+        codec: Optional[str] = None,
+    ) -> None:
+        await self.flush()
+        await self._io_executor.run(
+            self._write,
+            field,
+            start_index,
+            values,
+            codec,
+            uri=self.get_field_uri(field),
+            exclusive=True,
+        )
+
+    def _prepend(self, field: str, values: np.array) -> None:
         uri = self.get_field_uri(field)
         if not uri.exists():
             raise ValueError(f"Field {field} does not exist")
-        BigArrayStorage(uri, dtype=self.FIELD_DTYPE)[start_index:end_index] = values
+        storage = self.get_field_storage(field)
+        storage.insert(0, np.asarray(values, dtype=self.FIELD_DTYPE))
+        self.get_field_summary(field).refresh(storage, 0, len(storage))
 
-    async def delete(self, field: str) -> None:
+    async def prepend(self, field: str, values: np.array) -> None:
+        await self.flush()
+        await self._io_executor.run(
+            self._prepend, field, values, uri=self.get_field_uri(field), exclusive=True
+        )
+
+    def _sync_summary(self, field: str) -> None:
+        uri = self.get_field_uri(field)
+        if not uri.exists():
+            raise ValueError(f"Field {field} does not exist")
+        self.get_field_summary(field).sync(self.get_field_storage(field))
+
+    async def _run_summarized(
+        self, func: Callable[..., Optional[_R]], field: str, *args: Any
+    ) -> _R:
+        # Summary readers run under a shared lock and only report a stale
+        # sidecar, which is then rebuilt under the exclusive lock.
+        uri = self.get_field_uri(field)
+        rv = await self._io_executor.run(func, field, *args, uri=uri)
+        while rv is None:
+            await self._io_executor.run(
+                self._sync_summary, field, uri=uri, exclusive=True
+            )
+            rv = await self._io_executor.run(func, field, *args, uri=uri)
+        return rv
+
+    def _aggregate(
+        self, field: str, start_index: int, end_index: int, op: str
+    ) -> Optional[float]:
         uri = self.get_field_uri(field)
         if not uri.exists():
             raise ValueError(f"Field {field} does not exist")
-        del BigArrayStorage(uri, dtype=self.FIELD_DTYPE)[:]
+        storage = self.get_field_storage(field)
+        start, stop = storage.get_slice_index(slice(start_index, end_index))
+        stop = min(stop, len(storage))
+        summary = self.get_field_summary(field)
+        if not summary.is_synced(storage):
+            return None
+        return summary.aggregate(storage, start, max(start, stop), op)
+
+    async def aggregate(
+        self, field: str, start_index: int, end_index: int, op: str
+    ) -> float:
+        await self.flush()
+        return await self._run_summarized(
+            self._aggregate, field, start_index, end_index, op
+        )
+
+    def _scan(
+        self, field: str, start_index: int, end_index: int, predicate: Predicate
+    ) -> Optional[Tuple[np.array, np.array]]:
+        uri = self.get_field_uri(field)
+        if not uri.exists():
+            raise ValueError(f"Field {field} does not exist")
+        storage = self.get_field_storage(field)
+        start, stop = storage.get_slice_index(slice(start_index, end_index))
+        stop = min(stop, len(storage))
+        summary = self.get_field_summary(field)
+        if not summary.is_synced(storage):
+            return None
+        return summary.scan(storage, start, max(start, stop), predicate)
+
+    async def scan(
+        self,
+        field: str,
+        start_index: int,
+        end_index: int,
+        predicate: Predicate,
+        return_values: bool = False,
+    ) -> Union[np.array, Tuple[np.array, np.array]]:
+        await self.flush()
+        positions, values = await self._run_summarized(
+            self._scan, field, start_index, end_index, predicate
+        )
+        if return_values:
+            return positions, values
+        return positions
+
+    def _delete(self, field: str) -> None:
+        uri = self.get_field_uri(field)
+        if not uri.exists():
+            raise ValueError(f"Field {field} does not exist")
+        del self.get_field_storage(field)[:]
+        self.get_field_summary(field).delete()
+
+    async def delete(self, field: str) -> None:
+        await self.flush()
+        await self._io_executor.run(
+            self._delete, field, uri=self.get_field_uri(field), exclusive=True
+        )
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import pandas as pd
+import pendulum
+
+from flumen.frequency.datetime import index_bounds
+from flumen.models.frequency import Frequency
+from flumen.store.timeseries import TimeSeriesStore
+from flumen.utils.executor import IOExecutor
+
+
+class IngestTask(NamedTuple):
+    field: str
+    freq: str
+    loader: Callable[[], Union[pd.DataFrame, pd.Series]]
+    entity: Optional[str] = None
+
+    @property
+    def shard_key(self) -> str:
+        if self.entity is None:
+            return f"{self.field}.{self.freq}"
+        return f"{self.entity}.{self.field}.{self.freq}"
+
+
+def shard_tasks(tasks: Sequence[IngestTask], shards: int) -> List[List[IngestTask]]:
+    if shards <= 0:
+        raise ValueError(f"Invalid shards: {shards}")
+    wide_fields = {(task.field, task.freq) for task in tasks if task.entity is None}
+    for task in tasks:
+        if task.entity is not None and (task.field, task.freq) in wide_fields:
+            raise ValueError(
+                f"Field {task.field} at {task.freq} mixes entity and frame tasks"
+            )
+    sharded: List[List[IngestTask]] = [[] for _ in range(shards)]
+    for task in tasks:
+        sharded[zlib.crc32(task.shard_key.encode()) % shards].append(task)
+    return [shard for shard in sharded if shard]
+
+
+async def _ingest(
+    uri: str, tasks: Sequence[IngestTask], start_datetime: pendulum.DateTime
+) -> int:
+    store = TimeSeriesStore(uri, io_executor=IOExecutor(process_lock=True))
+    freqs: Dict[str, Frequency] = {}
+    written = 0
+    for task in tasks:
+        freq = freqs.setdefault(task.freq, Frequency.from_str(task.freq))
+        frame = task.loader()
+        if isinstance(frame, pd.Series):
+            frame = frame.to_frame(task.entity)
+        if index_bounds(freq, frame.index)[0] < start_datetime:
+            raise ValueError(
+                f"Task {task.shard_key} starts before start datetime {start_datetime}"
+            )
+        await store.insert_frame(task.field, freq, frame)
+        written += len(frame.columns)
+    return written
+
+
+def ingest_shard(
+    uri: str, tasks: Sequence[IngestTask], start_datetime: pendulum.DateTime
+) -> int:
+    return asyncio.run(_ingest(uri, tasks, start_datetime))
+
+
+async def _extend_calendars(
+    uri: str,
+    freqs: Sequence[str],
+    start_datetime: pendulum.DateTime,
+    end_datetime: pendulum.DateTime,
+) -> None:
+    store = TimeSeriesStore(uri, io_executor=IOExecutor(process_lock=True))
+    for freq in dict.fromkeys(freqs):
+        await store.calendar_store.extend(
+            Frequency.from_str(freq), start_datetime, end_datetime
+        )
+
+
+def ingest(
+    uri: str,
+    tasks: Sequence[IngestTask],
+    start_datetime: pendulum.DateTime,
+    end_datetime: pendulum.DateTime,
+    max_workers: Optional[int] = None,
+) -> int:
+    shards = shard_tasks(tasks, max_workers or os.cpu_count() or 1)
+    if not shards:
+        return 0
+    freqs = [task.freq for task in tasks]
+    asyncio.run(_extend_calendars(uri, freqs, start_datetime, end_datetime))
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        return sum(pool.map(ingest_shard, repeat(uri), shards, repeat(start_datetime)))
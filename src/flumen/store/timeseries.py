@@ -1,27 +1,312 @@
+import asyncio
 import pathlib
+from typing import AsyncIterator, Optional, Sequence, Union
 
+import numpy as np
+import pandas as pd
+import pendulum
+from pandas.tseries.frequencies import to_offset
+
+from flumen.frequency.datetime import date_range_bounds, date_range_values, index_bounds
+from flumen.frequency.resample import (
+    RESAMPLE_METHODS,
+    ResampleAccumulator,
+    get_bucket_ids,
+)
+from flumen.models.frequency import PANDAS_FREQ_UNIT, Frequency
 from flumen.models.timeseries import TimeSeries
+from flumen.storage.dict import LogDictStorage
 from flumen.store.calenadar import CalendarStore
+from flumen.store.entity import EntityStore
+from flumen.store.field import FieldStore
+from flumen.utils.datetime import utc_index
+from flumen.utils.executor import IOExecutor, get_io_executor
 
 
 class TimeSeriesStore:
-    def __init__(self, uri: str) -> None:
+    REGION_STORAGE_FILE = "regions.dict"
+    DEFAULT_CHUNK_ROWS = 1 << 16
+
+    def __init__(
+        self,
+        uri: str,
+        mmap: bool = True,
+        io_executor: Optional[IOExecutor] = None,
+    ) -> None:
         self.root_uri = pathlib.Path(uri)
-        self.calendar_store = CalendarStore(self.root_uri)
+        self._io_executor = io_executor or get_io_executor()
+        self.calendar_store = CalendarStore(
+            self.root_uri, io_executor=self._io_executor
+        )
+        self.field_store = FieldStore(
+            self.root_uri, mmap=mmap, io_executor=self._io_executor
+        )
+        self.entity_store = EntityStore(self.root_uri, io_executor=self._io_executor)
+        self._regions: LogDictStorage[str, int] = LogDictStorage(
+            self.root_uri / self.REGION_STORAGE_FILE, io_executor=self._io_executor
+        )
+
+    @staticmethod
+    def get_field_key(entity: str, field: str, freq: Frequency) -> str:
+        return f"{entity}.{field}.{freq.raw_str}"
+
+    @staticmethod
+    def _to_pendulum(value: int) -> pendulum.DateTime:
+        return pendulum.instance(pd.Timestamp(value, tz="UTC").to_pydatetime())
+
+    async def _locate(
+        self, freq: Frequency, datetimes: np.ndarray, exact: bool = True
+    ) -> Optional[int]:
+        calendar = await self.calendar_store.find(
+            freq, self._to_pendulum(datetimes[0]), self._to_pendulum(datetimes[-1])
+        )
+        calendar_datetimes = calendar.index.asi8
+        head = 0
+        if len(calendar_datetimes) and not exact:
+            head = int(np.searchsorted(datetimes, calendar_datetimes[0]))
+        if not np.array_equal(
+            calendar_datetimes,
+            datetimes[slice(head, head + len(calendar_datetimes))],
+        ) or (exact and len(calendar_datetimes) != len(datetimes)):
+            raise ValueError(f"Calendar for {freq} does not match the series index")
+        if not len(calendar_datetimes):
+            return None
+        return int(calendar.iloc[0]) - head
 
     async def insert_one(self, ts: TimeSeries) -> None:
-        await self.calendar_store.update(
-            ts.freq,
-            start_datetime=ts.start_datetime,
-            end_datetime=ts.end_datetime,
-            upsert=True,
-        )
-        # calendar_series = await self.calendar_store.find(
-        #     ts.freq,
-        #     start_datetime=ts.start_datetime,
-        #     end_datetime=ts.end_datetime,
-        # )
-        # print()
-
-    async def find_one(self, ts: TimeSeries) -> TimeSeries:
-        ...
+        await self.calendar_store.extend(ts.freq, ts.start_datetime, ts.end_datetime)
+        datetimes = ts.values.index.asi8
+        if not len(datetimes):
+            return
+        start_index = await self._locate(ts.freq, datetimes)
+        assert start_index is not None
+        key = self.get_field_key(ts.entity, ts.field, ts.freq)
+        await self._reserve_regions([key], start_index)
+        await self._register_entities(
+            [ts.entity],
+            datetimes[0].astype("datetime64[ns]"),
+            datetimes[-1].astype("datetime64[ns]"),
+        )
+        await self.field_store.write(
+            key, start_index - self._regions[key], ts.values.values
+        )
+
+    async def _reserve_regions(self, keys: Sequence[str], start_index: int) -> None:
+        changed = [
+            key
+            for key in keys
+            if key not in self._regions or start_index < self._regions[key]
+        ]
+        if not changed:
+            return
+        # Older data re-bases a stored series by padding its head with NaNs.
+        await asyncio.gather(
+            *(
+                self.field_store.prepend(
+                    key,
+                    np.full(
+                        self._regions[key] - start_index,
+                        np.nan,
+                        dtype=FieldStore.FIELD_DTYPE,
+                    ),
+                )
+                for key in changed
+                if key in self._regions and self.field_store.get_field_uri(key).exists()
+            )
+        )
+        self._regions.update(dict.fromkeys(changed, start_index))
+        await self._regions.save()
+
+    async def _register_entities(
+        self, entities: Sequence[str], start: np.datetime64, end: np.datetime64
+    ) -> None:
+        new_entities = [
+            entity for entity in entities if entity not in self.entity_store
+        ]
+        entities = [entity for entity in entities if entity in self.entity_store]
+        if new_entities:
+            await self.entity_store.insert_many(
+                new_entities, [start] * len(new_entities), [end] * len(new_entities)
+            )
+        if entities:
+            starts, ends = await self.entity_store.find_many(entities)
+            changed = (starts > start) | (ends < end)
+            if changed.any():
+                await self.entity_store.update_many(
+                    [entity for entity, c in zip(entities, changed) if c],
+                    start_datetimes=np.minimum(starts[changed], start),
+                    end_datetimes=np.maximum(ends[changed], end),
+                )
+
+    async def insert_frame(self, field: str, freq: Frequency, df: pd.DataFrame) -> None:
+        if not isinstance(df.index.dtype, pd.DatetimeTZDtype):
+            raise ValueError("frame index must be datetime with timezone")
+        if len(df.columns) != len(set(df.columns)):
+            raise ValueError("frame columns must be unique")
+        if not len(df.index) or not len(df.columns):
+            return
+        datetimes = df.index.asi8
+        await self.calendar_store.extend(freq, *index_bounds(freq, df.index))
+        start_index = await self._locate(freq, datetimes)
+        assert start_index is not None
+        entities = [str(entity) for entity in df.columns]
+        keys = [self.get_field_key(entity, field, freq) for entity in entities]
+        await self._reserve_regions(keys, start_index)
+        await self._register_entities(
+            entities,
+            datetimes[0].astype("datetime64[ns]"),
+            datetimes[-1].astype("datetime64[ns]"),
+        )
+        values = np.ascontiguousarray(df.to_numpy(dtype=FieldStore.FIELD_DTYPE).T)
+        await asyncio.gather(
+            *(
+                self.field_store.write(
+                    key, start_index - self._regions[key], column_values
+                )
+                for key, column_values in zip(keys, values)
+            )
+        )
+
+    async def _read_values(self, key: str, position: int, size: int) -> np.ndarray:
+        start = position - self._regions[key]
+        stop = start + size
+        if stop > 0:
+            stored = await self.field_store.find(key, max(start, 0), stop)
+            if start >= 0 and len(stored) == size:
+                return stored
+        values = np.full(size, np.nan, dtype=FieldStore.FIELD_DTYPE)
+        if stop > 0:
+            head = max(-start, 0)
+            values[slice(head, head + len(stored))] = stored
+        return values
+
+    async def _read_chunk(
+        self, key: str, freq: Frequency, start_index: int, end_index: int
+    ) -> pd.Series:
+        datetimes, values = await asyncio.gather(
+            self.calendar_store.find_datetimes(freq, start_index, end_index),
+            self._read_values(key, start_index, end_index - start_index),
+        )
+        return pd.Series(values, index=utc_index(datetimes), copy=False)
+
+    async def iter_range(
+        self,
+        entity: str,
+        field: str,
+        freq: Frequency,
+        start_datetime: pendulum.DateTime,
+        end_datetime: pendulum.DateTime,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> AsyncIterator[pd.Series]:
+        if chunk_rows <= 0:
+            raise ValueError(f"Invalid chunk rows: {chunk_rows}")
+        key = self.get_field_key(entity, field, freq)
+        if key not in self._regions:
+            raise ValueError(f"Time series {key} does not exist")
+        bounds = date_range_bounds(freq, start_datetime, end_datetime)
+        if bounds is None:
+            return
+        start_index, end_index = await self.calendar_store.slice_locs(
+            freq, *(pd.Timestamp(bound, tz="UTC") for bound in bounds)
+        )
+
+        def read_chunk(chunk_start: int) -> asyncio.Future:
+            chunk_end = min(chunk_start + chunk_rows, end_index)
+            return asyncio.ensure_future(
+                self._read_chunk(key, freq, chunk_start, chunk_end)
+            )
+
+        chunk_starts = range(start_index, end_index, chunk_rows)
+        next_chunk = read_chunk(start_index) if chunk_starts else None
+        try:
+            for next_start in chunk_starts[1:]:
+                chunk = await next_chunk
+                next_chunk = read_chunk(next_start)
+                yield chunk
+            if next_chunk is not None:
+                chunk, next_chunk = await next_chunk, None
+                yield chunk
+        finally:
+            if next_chunk is not None:
+                next_chunk.cancel()
+
+    async def find_one(
+        self,
+        entity: str,
+        field: str,
+        freq: Frequency,
+        start_datetime: pendulum.DateTime,
+        end_datetime: pendulum.DateTime,
+    ) -> TimeSeries:
+        key = self.get_field_key(entity, field, freq)
+        if key not in self._regions:
+            raise ValueError(f"Time series {key} does not exist")
+        datetimes = date_range_values(freq, start_datetime, end_datetime)
+        position = (
+            await self._locate(freq, datetimes, exact=False) if len(datetimes) else None
+        )
+        if position is None:
+            values = np.full(len(datetimes), np.nan, dtype=FieldStore.FIELD_DTYPE)
+        else:
+            values = await self._read_values(key, position, len(datetimes))
+        return TimeSeries.from_aligned(
+            entity,
+            field,
+            freq,
+            start_datetime,
+            end_datetime,
+            pd.Series(values, index=utc_index(datetimes), copy=False),
+            validate=False,
+        )
+
+    async def resample(
+        self,
+        entity: str,
+        field: str,
+        freq: Frequency,
+        target_freq: Frequency,
+        start_datetime: pendulum.DateTime,
+        end_datetime: pendulum.DateTime,
+        method: str = "last",
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        target_field: Optional[str] = None,
+    ) -> Union[pd.Series, pd.DataFrame]:
+        if method not in RESAMPLE_METHODS:
+            raise ValueError(f"Invalid resample method: {method}")
+        bucket_datetimes = date_range_values(target_freq, start_datetime, end_datetime)
+        source_end_datetime = end_datetime
+        if target_freq.unit.unit_type == PANDAS_FREQ_UNIT and len(bucket_datetimes):
+            bucket_end = pd.Timestamp(bucket_datetimes[-1], tz="UTC") + to_offset(
+                target_freq.raw_str
+            )
+            source_end_datetime = self._to_pendulum(
+                (bucket_end - pd.Timedelta(1, "us")).value
+            )
+        accumulator = ResampleAccumulator(len(bucket_datetimes))
+        async for chunk in self.iter_range(
+            entity, field, freq, start_datetime, source_end_datetime, chunk_rows
+        ):
+            bucket_ids = get_bucket_ids(target_freq, bucket_datetimes, chunk.index.asi8)
+            accumulator.update(bucket_ids, chunk.values)
+        result = accumulator.to_pandas(
+            method, utc_index(bucket_datetimes), FieldStore.FIELD_DTYPE
+        )
+        if target_field is not None:
+            columns = (
+                {target_field: result}
+                if isinstance(result, pd.Series)
+                else {f"{target_field}_{column}": result[column] for column in result}
+            )
+            for column, values in columns.items():
+                await self.insert_one(
+                    TimeSeries.from_aligned(
+                        entity,
+                        column,
+                        target_freq,
+                        start_datetime,
+                        end_datetime,
+                        values,
+                        validate=False,
+                    )
+                )
+        return result
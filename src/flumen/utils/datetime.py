@@ -0,0 +1,11 @@
+import numpy as np
+import pandas as pd
+
+UTC_DTYPE = pd.DatetimeTZDtype(tz="UTC")
+
+
+def utc_index(values: np.ndarray) -> pd.DatetimeIndex:
+    datetimes = pd.arrays.DatetimeArray(
+        values.view("datetime64[ns]"), dtype=UTC_DTYPE, copy=False
+    )
+    return pd.DatetimeIndex(datetimes, copy=False)
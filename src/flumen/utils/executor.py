@@ -0,0 +1,153 @@
+import asyncio
+import pathlib
+import weakref
+from concurrent.futures import Executor
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, nullcontext
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from flumen.utils.file_lock import file_lock
+
+_R = TypeVar("_R")
+
+
+class ReadWriteLock:
+    def __init__(self) -> None:
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._writer and not self._waiting_writers
+            )
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._writer and not self._readers
+                )
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class _LoopState:
+    def __init__(self, max_concurrency: int) -> None:
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def get_lock(self, uri: pathlib.Path) -> ReadWriteLock:
+        lock = self.locks.get(uri)
+        if lock is None:
+            lock = self.locks[uri] = ReadWriteLock()
+        return lock
+
+
+class IOExecutor:
+    DEFAULT_MAX_CONCURRENCY = 32
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        process_lock: bool = False,
+    ) -> None:
+        self._executor = executor
+        self._max_concurrency = max_concurrency
+        self._process_lock = process_lock
+        self._states: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def process_lock(self) -> bool:
+        return self._process_lock
+
+    def lock(self, uri: pathlib.Path, exclusive: bool = False) -> ContextManager:
+        if self._process_lock:
+            return file_lock(uri, exclusive=exclusive)
+        return nullcontext()
+
+    @staticmethod
+    def _run_locked(
+        func: Callable[..., _R], uris: List[pathlib.Path], exclusive: bool, *args: Any
+    ) -> _R:
+        with ExitStack() as stack:
+            for uri in uris:
+                stack.enter_context(file_lock(uri, exclusive=exclusive))
+            rv = func(*args)
+        return rv
+
+    def _get_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState(self._max_concurrency)
+        return state
+
+    async def run(
+        self,
+        func: Callable[..., _R],
+        *args: Any,
+        uri: Union[None, pathlib.Path, Sequence[pathlib.Path]] = None,
+        exclusive: bool = False,
+    ) -> _R:
+        state = self._get_state()
+        # Several uris are always locked in the same order to avoid deadlocks.
+        if uri is None:
+            uris = []
+        elif isinstance(uri, pathlib.Path):
+            uris = [uri]
+        else:
+            uris = sorted(set(uri))
+        async with AsyncExitStack() as stack:
+            for lock_uri in uris:
+                lock = state.get_lock(lock_uri)
+                await stack.enter_async_context(
+                    lock.write() if exclusive else lock.read()
+                )
+            await stack.enter_async_context(state.semaphore)
+            if uris and self._process_lock:
+                func, args = self._run_locked, (func, uris, exclusive, *args)
+            loop = asyncio.get_running_loop()
+            rv = await loop.run_in_executor(self._executor, func, *args)
+        return rv
+
+
+_io_executor = IOExecutor()
+
+
+def get_io_executor() -> IOExecutor:
+    return _io_executor
+
+
+def set_io_executor(io_executor: IOExecutor) -> None:
+    global _io_executor
+    _io_executor = io_executor
@@ -0,0 +1,49 @@
+import pathlib
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+LOCK_EXTENSION = ".lock"
+
+_held = threading.local()
+
+
+def get_lock_uri(uri: pathlib.Path) -> pathlib.Path:
+    return uri.with_name(uri.name + LOCK_EXTENSION)
+
+
+def _held_locks() -> Dict[pathlib.Path, bool]:
+    locks: Dict[pathlib.Path, bool] = _held.__dict__.setdefault("locks", {})
+    return locks
+
+
+if sys.platform == "win32":  # pragma: not covered
+
+    @contextmanager
+    def file_lock(uri: pathlib.Path, exclusive: bool = True) -> Iterator[None]:
+        yield
+
+else:
+    import fcntl
+
+    @contextmanager
+    def file_lock(uri: pathlib.Path, exclusive: bool = True) -> Iterator[None]:
+        lock_uri = get_lock_uri(uri)
+        held = _held_locks()
+        if lock_uri in held:
+            # The thread already holds this lock, e.g. a storage loading itself
+            # inside a locked store call.
+            if exclusive and not held[lock_uri]:
+                raise RuntimeError(f"Cannot upgrade shared lock on {uri}")
+            yield
+            return
+        lock_uri.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_uri, "a+b") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            held[lock_uri] = exclusive
+            try:
+                yield
+            finally:
+                del held[lock_uri]
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
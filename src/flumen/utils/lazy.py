@@ -0,0 +1,71 @@
+import threading
+import time
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Generic, Iterator, List, TypeVar
+
+_KT = TypeVar("_KT")
+_VT = TypeVar("_VT")
+
+
+class LazyDict(Generic[_KT, _VT], MutableMapping):
+    def __init__(self) -> None:
+        self._loaders: Dict[_KT, Callable[[], _VT]] = {}
+        self._data: Dict[_KT, _VT] = {}
+        self._last_access: Dict[_KT, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, key: _KT, loader: Callable[[], _VT]) -> None:
+        self._loaders[key] = loader
+
+    def is_loaded(self, key: _KT) -> bool:
+        return key in self._data
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data or key in self._loaders
+
+    def __getitem__(self, key: _KT) -> _VT:
+        if key not in self._data:
+            if key not in self._loaders:
+                raise KeyError(key)
+            with self._lock:
+                if key not in self._data:
+                    self._data[key] = self._loaders[key]()
+        self._last_access[key] = time.monotonic()
+        return self._data[key]
+
+    def __setitem__(self, key: _KT, item: _VT) -> None:
+        self._data[key] = item
+        self._last_access[key] = time.monotonic()
+
+    def __delitem__(self, key: _KT) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self._data:
+            del self._data[key]
+        self._loaders.pop(key, None)
+        self._last_access.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._loaders.keys() | self._data.keys())
+
+    def __iter__(self) -> Iterator[_KT]:
+        rv: Iterator[_KT] = iter(dict.fromkeys([*self._loaders, *self._data]))
+        return rv
+
+    def unload(self, key: _KT) -> bool:
+        if key not in self._loaders or key not in self._data:
+            return False
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+            self._last_access.pop(key, None)
+        return True
+
+    def unload_idle(self, max_idle: float) -> List[_KT]:
+        now = time.monotonic()
+        idle = [
+            key
+            for key, last_access in list(self._last_access.items())
+            if now - last_access >= max_idle
+        ]
+        return [key for key in idle if self.unload(key)]
@@ -1,7 +1,40 @@
+import os
 import pathlib
+import sys
+from typing import Optional, Tuple
 
 
 def ensure_dir_exists(path: pathlib.Path) -> pathlib.Path:
     if not path.exists():
-        path.mkdir(parents=True)
+        path.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def get_file_signature(path: pathlib.Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def fsync_dir(path: pathlib.Path) -> None:
+    if sys.platform == "win32":  # pragma: not covered
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_path(path: pathlib.Path) -> None:
+    if not path.exists():
+        return
+    if path.is_dir():
+        for child in path.iterdir():
+            fsync_path(child)
+        fsync_dir(path)
+        return
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
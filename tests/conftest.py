@@ -1,9 +1,12 @@
 import pathlib
 import random
 import string
+from typing import Iterator
 
 import pytest
 
+from flumen.frequency.session import set_cache_dir
+
 
 @pytest.fixture()
 def random_str() -> str:
@@ -16,3 +19,13 @@ def tmp_file(tmp_path: pathlib.Path, random_str: str) -> pathlib.Path:
     file = tmp_path / random_str
     file.touch()
     return file
+
+
+@pytest.fixture(autouse=True, scope="session")
+def session_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Iterator[pathlib.Path]:
+    cache_dir = tmp_path_factory.mktemp("cache")
+    set_cache_dir(cache_dir)
+    yield cache_dir
+    set_cache_dir(None)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -6,7 +6,12 @@ import pandas_market_calendars as mcal
 import pendulum
 import pytest
 
-from flumen.frequency.datetime import date_range
+from flumen.frequency.datetime import (
+    clear_date_range_cache,
+    date_range,
+    date_range_values,
+    index_bounds,
+)
 from flumen.models.frequency import Frequency
 
 
@@ -96,3 +101,69 @@ def test_freq_less_than_1d_market_date_range() -> None:
     end_datetime = pendulum.parse("2020-01-02 00:00:00")
     dts = date_range(freq, start_datetime, end_datetime)
     assert len(dts) == 4 * 60
+
+
+def test_index_bounds() -> None:
+    index = pd.DatetimeIndex(["2022-03-01 01:31", "2022-03-02 07:00"], tz="UTC")
+    assert index_bounds(Frequency.from_str("T"), index) == (
+        pendulum.parse("2022-03-01 01:31"),
+        pendulum.parse("2022-03-02 07:00"),
+    )
+    assert index_bounds(Frequency.from_str("SSET"), index) == (
+        pendulum.parse("2022-03-01"),
+        pendulum.parse("2022-03-02"),
+    )
+
+
+@pytest.mark.parametrize(
+    "freq, windows",
+    [
+        (
+            "2H",
+            [
+                ("2020-01-01 00:00", "2020-01-03 00:00"),
+                ("2020-01-01 04:00", "2020-01-02 08:30"),
+                ("2020-01-01 05:00", "2020-01-02 08:00"),
+                ("2020-01-02 00:00", "2020-01-05 00:00"),
+            ],
+        ),
+        (
+            "M",
+            [
+                ("2020-01-01", "2020-06-30"),
+                ("2020-02-15", "2020-04-30"),
+                ("2019-11-01", "2020-02-01"),
+            ],
+        ),
+        (
+            "1SSET",
+            [
+                ("2020-01-06", "2020-01-10"),
+                ("2020-01-07", "2020-01-08"),
+                ("2020-01-09", "2020-01-14"),
+            ],
+        ),
+    ],
+)
+def test_date_range_values(freq: str, windows: List[Tuple[str, str]]) -> None:
+    clear_date_range_cache()
+    frequency = Frequency.from_str(freq)
+    for start, end in windows:
+        start_datetime, end_datetime = pendulum.parse(start), pendulum.parse(end)
+        values = date_range_values(frequency, start_datetime, end_datetime)
+        expected = date_range(frequency, start_datetime, end_datetime).asi8
+        np.testing.assert_array_equal(values, expected)
+        assert not values.flags.writeable
+
+
+def test_date_range_values_shared() -> None:
+    clear_date_range_cache()
+    freq = Frequency.from_str("D")
+    full = date_range_values(
+        freq, pendulum.parse("2020-01-01"), pendulum.parse("2020-12-31")
+    )
+    window = date_range_values(
+        freq, pendulum.parse("2020-03-01"), pendulum.parse("2020-03-31")
+    )
+    assert len(window) == 31
+    assert np.shares_memory(full, window)
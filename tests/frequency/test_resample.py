@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from flumen.frequency.resample import OHLC_COLUMNS, ResampleAccumulator, get_bucket_ids
+from flumen.models.frequency import Frequency
+
+
+@pytest.mark.parametrize("method", ["first", "last", "min", "max", "sum", "mean"])
+def test_accumulator_matches_pandas(method: str) -> None:
+    index = pd.date_range("2020-01-01", periods=100, freq="T", tz="UTC")
+    values = np.random.default_rng(0).normal(size=100)
+    values[[3, 40, 41]] = np.nan
+    buckets = pd.date_range("2020-01-01", periods=10, freq="10T", tz="UTC")
+    accumulator = ResampleAccumulator(len(buckets))
+    for chunk in np.array_split(np.arange(100), 7):
+        bucket_ids = get_bucket_ids(
+            Frequency.from_str("10T"), buckets.asi8, index.asi8[chunk]
+        )
+        accumulator.update(bucket_ids, values[chunk])
+    expected = getattr(pd.Series(values, index).resample("10T"), method)()
+    actual = accumulator.to_pandas(method, buckets, np.dtype("float64"))
+    pd.testing.assert_series_equal(actual, expected, check_freq=False)
+
+
+def test_accumulator_ohlc_and_empty_buckets() -> None:
+    accumulator = ResampleAccumulator(3)
+    accumulator.update(np.array([0, 0, 2, 2, 5]), np.array([1.0, 3, 2, 0, 9]))
+    result = accumulator.result("ohlc")
+    assert list(result) == OHLC_COLUMNS
+    np.testing.assert_array_equal(result["open"], [1, np.nan, 2])
+    np.testing.assert_array_equal(result["high"], [3, np.nan, 2])
+    np.testing.assert_array_equal(result["low"], [1, np.nan, 0])
+    np.testing.assert_array_equal(result["close"], [3, np.nan, 0])
+    with pytest.raises(ValueError):
+        accumulator.result("median")
+
+
+def test_bucket_ids_right_labelled() -> None:
+    buckets = np.array([10, 20, 30])
+    datetimes = np.array([1, 10, 11, 20, 30])
+    np.testing.assert_array_equal(
+        get_bucket_ids(Frequency.from_str("30SSET"), buckets, datetimes),
+        [0, 0, 1, 1, 2],
+    )
+    np.testing.assert_array_equal(
+        get_bucket_ids(Frequency.from_str("10T"), buckets, datetimes),
+        [-1, 0, 0, 1, 2],
+    )
@@ -0,0 +1,69 @@
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pandas_market_calendars as mcal
+import pendulum
+import pytest
+
+from flumen.frequency.datetime import date_range
+from flumen.frequency.session import (
+    SESSION_DAY,
+    clear_cache,
+    get_session_table_uri,
+    get_year_sessions,
+)
+from flumen.models.frequency import Frequency
+
+
+@pytest.mark.parametrize("exchange", ["SSE", "HKEX"])
+def test_year_sessions_persisted(
+    exchange: str, session_cache_dir: pathlib.Path
+) -> None:
+    table = get_year_sessions(exchange, 2019)
+    uri = get_session_table_uri(exchange, 2019)
+    assert uri.exists()
+    assert session_cache_dir in uri.parents
+    schedule = mcal.get_calendar(exchange).schedule("2019-01-01", "2019-12-31")
+    np.testing.assert_array_equal(table[:, SESSION_DAY], schedule.index.asi8)
+    clear_cache()
+    np.testing.assert_array_equal(get_year_sessions(exchange, 2019), table)
+
+
+def test_year_sessions_served_from_disk(monkeypatch: pytest.MonkeyPatch) -> None:
+    table = get_year_sessions("SSE", 2018)
+    clear_cache()
+
+    def schedule(*args: object, **kwargs: object) -> None:
+        raise AssertionError("schedule should be served from the cache")
+
+    monkeypatch.setattr(mcal.MarketCalendar, "schedule", schedule)
+    np.testing.assert_array_equal(get_year_sessions("SSE", 2018), table)
+
+
+@pytest.mark.parametrize(
+    "freq, start_datetime, end_datetime",
+    [
+        ("SSED", "2019-12-20 00:00:00", "2020-01-10 00:00:00"),
+        ("HKEXD", "2019-12-20 00:00:00", "2020-01-10 00:00:00"),
+        ("1SSET", "2019-12-30 00:00:00", "2020-01-03 00:00:00"),
+        ("5SSET", "2020-01-02 16:00:00", "2020-01-06 01:00:00"),
+        ("7SSET", "2019-12-30 00:00:00", "2020-01-03 00:00:00"),
+        ("1HKEXD", "2020-06-01 00:00:00", "2020-06-01 00:00:00"),
+    ],
+)
+def test_cached_date_range_matches_market_calendar(
+    freq: str, start_datetime: str, end_datetime: str
+) -> None:
+    frequency = Frequency.from_str(freq)
+    exchange = mcal.get_calendar(frequency.unit.market_exchange)
+    if pd.Timedelta(frequency.to_str()) >= pd.Timedelta("1D"):
+        expected = exchange.valid_days(start_datetime, end_datetime, tz=exchange.tz)
+    else:
+        schedule = exchange.schedule(start_datetime, end_datetime)
+        expected = mcal.date_range(schedule, frequency=frequency.to_str())
+    for _ in range(2):
+        actual = date_range(
+            frequency, pendulum.parse(start_datetime), pendulum.parse(end_datetime)
+        )
+        assert actual.equals(expected.tz_convert("UTC"))
@@ -1,6 +1,9 @@
+import copy
+import pickle
 import typing
 
 import pytest
+from pydantic import BaseModel, ValidationError
 
 from flumen.models.frequency import Frequency, FrequencyUnit
 
@@ -55,3 +58,48 @@ def test_parse_frequency_invalid() -> None:
     with pytest.raises(ValueError) as excinfo:
         Frequency.from_str("2")
     assert "Invalid frequency: 2" == str(excinfo.value)
+
+
+def test_frequency_interned() -> None:
+    freq = Frequency.from_str("5t")
+    assert freq is Frequency.from_str("5T")
+    assert freq is Frequency(raw_str="5T", step=5, unit=FrequencyUnit.T)
+    assert freq is pickle.loads(pickle.dumps(freq))
+    assert freq is copy.deepcopy(freq)
+    assert {freq: 1}[Frequency.from_str("5T")] == 1
+    assert freq != Frequency.from_str("T")
+
+
+def test_frequency_aliases_not_interned() -> None:
+    daily = Frequency.from_str("1d")
+    assert daily.raw_str == "1D"
+    with pytest.raises(ValueError):
+        Frequency(raw_str="1D", step=5, unit=FrequencyUnit.T)
+    with pytest.raises(ValueError):
+        Frequency(raw_str="1d", step=5, unit=FrequencyUnit.T)
+    with pytest.raises(ValueError):
+        Frequency(raw_str="7T", step=1, unit="D")
+    assert Frequency.from_str("7T").step == 7
+    assert Frequency(raw_str="1d", step=1, unit="D") is daily
+    assert Frequency.from_str("1d") is daily
+    assert Frequency.from_str("1D") is daily
+
+
+def test_frequency_immutable() -> None:
+    freq = Frequency.from_str("D")
+    with pytest.raises(AttributeError):
+        freq.step = 2  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        freq.other = 1  # type: ignore[attr-defined]
+
+
+def test_frequency_pydantic_field() -> None:
+    class Model(BaseModel):
+        freq: Frequency
+
+    assert Model(freq="ssed").freq is Frequency.from_str("SSED")
+    assert Model(freq=Frequency.from_str("D")).freq is Frequency.from_str("D")
+    with pytest.raises(ValidationError):
+        Model(freq="INVALID")
+    with pytest.raises(ValidationError):
+        Model(freq=1)
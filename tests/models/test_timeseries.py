@@ -1,7 +1,10 @@
+from typing import Any
+
 import pandas as pd
 import pendulum
 import pytest
 
+from flumen.frequency import datetime
 from flumen.models.frequency import Frequency
 from flumen.models.timeseries import TimeSeries
 
@@ -80,3 +83,53 @@ def test_convert_timezone() -> None:
         ),
     )
     assert str(ts.values.index.tz) == "UTC"
+
+
+def test_validate_values_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    date_range = datetime.date_range
+
+    def counting_date_range(*args: Any, **kwargs: Any) -> pd.DatetimeIndex:
+        calls.append(args)
+        return date_range(*args, **kwargs)
+
+    datetime.clear_date_range_cache()
+    monkeypatch.setattr(datetime, "date_range", counting_date_range)
+    index = pd.DatetimeIndex(
+        ["2021-01-01", "2021-01-02", "2021-01-03"], dtype="datetime64[ns, UTC]"
+    )
+    for _ in range(3):
+        ts = TimeSeries(
+            entity="entity_id",
+            field="field_id",
+            freq=Frequency.from_str("D"),
+            start_datetime=pendulum.parse("2021-01-01"),
+            end_datetime=pendulum.parse("2021-01-03"),
+            values=pd.Series([1, 2, 3], index=index),
+        )
+        assert ts.values.index is index
+    assert len(calls) == 1
+
+
+def test_from_aligned() -> None:
+    values = pd.Series(
+        [1, 2, 3],
+        index=pd.DatetimeIndex(
+            ["2020-01-01", "2020-01-02", "2020-01-03"],
+            dtype="datetime64[ns, US/Eastern]",
+        ),
+    )
+    kwargs = dict(
+        entity="entity_id",
+        field="field_id",
+        freq=Frequency.from_str("D"),
+        start_datetime=pendulum.parse("2020-01-01"),
+        end_datetime=pendulum.parse("2020-01-03"),
+    )
+    ts = TimeSeries.from_aligned(**kwargs, values=values)
+    assert str(ts.values.index.tz) == "UTC"
+    assert ts.freq is Frequency.from_str("D")
+    with pytest.raises(ValueError):
+        TimeSeries.from_aligned(**kwargs, values=values.iloc[1:])
+    trusted = TimeSeries.from_aligned(**kwargs, values=values.iloc[1:], validate=False)
+    assert len(trusted.values) == 2
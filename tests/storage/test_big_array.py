@@ -1,9 +1,10 @@
 import pathlib
+from typing import cast
 
 import numpy as np
 import pytest
 
-from flumen.storage.big_array import BigArrayStorage
+from flumen.storage.big_array import BigArrayStorage, MemmapArrayStorage
 
 
 @pytest.fixture()
@@ -11,6 +12,11 @@ def big_array_storage(tmp_file: pathlib.Path) -> BigArrayStorage:
     return BigArrayStorage(tmp_file, dtype=np.dtype("f"))
 
 
+@pytest.fixture()
+def memmap_array_storage(tmp_file: pathlib.Path) -> MemmapArrayStorage:
+    return MemmapArrayStorage(tmp_file, dtype=np.dtype("f"))
+
+
 @pytest.fixture()
 def array() -> np.array:
     return np.array([1.0, 2.0, 3.0, 4.0, 5.0], dtype=np.dtype("f"))
@@ -80,3 +86,28 @@ def test_get_slice_index(big_array_storage: BigArrayStorage, array: np.array) ->
     assert big_array_storage.get_slice_index(slice(2, None)) == (2, len(array) + 1)
     assert big_array_storage.get_slice_index(slice(None, None)) == (0, len(array) + 1)
     assert big_array_storage.get_slice_index(slice(0, -2)) == (0, len(array) - 1)
+
+
+def test_get_memmap_array(
+    memmap_array_storage: MemmapArrayStorage, array: np.array
+) -> None:
+    assert np.array_equal(memmap_array_storage[:], np.array([]))
+    memmap_array_storage.extend(array)
+    data = cast(np.ndarray, memmap_array_storage[1:3])
+    assert isinstance(data, np.memmap)
+    assert np.array_equal(data, np.array([2.0, 3.0]))
+    assert memmap_array_storage[-1] == 5.0
+    assert np.array_equal(memmap_array_storage[0:-1], array)
+
+
+def test_set_memmap_array(
+    memmap_array_storage: MemmapArrayStorage, array: np.array
+) -> None:
+    memmap_array_storage.extend(array)
+    memmap_array_storage[0] = 6.0
+    memmap_array_storage[3:5] = np.array([7.0, 8.0], dtype=np.dtype("f"))
+    assert np.array_equal(memmap_array_storage[:], np.array([6.0, 2.0, 3.0, 7.0, 8.0]))
+    assert np.array_equal(
+        BigArrayStorage(memmap_array_storage._uri, dtype=np.dtype("f"))[:],
+        np.array([6.0, 2.0, 3.0, 7.0, 8.0]),
+    )
@@ -0,0 +1,124 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from flumen.storage.big_array import BigArrayStorage
+from flumen.storage.block_summary import (
+    BlockSummaryStorage,
+    Predicate,
+    match_values,
+    parse_predicate,
+    read_values,
+    summarize,
+)
+
+
+@pytest.fixture()
+def storage(tmp_path: pathlib.Path) -> BigArrayStorage:
+    storage: BigArrayStorage[float] = BigArrayStorage(
+        tmp_path / "close.field", dtype=np.dtype("float32")
+    )
+    values = np.arange(10, dtype="float32")
+    values[3] = np.nan
+    storage.extend(values)
+    return storage
+
+
+def test_refresh(tmp_path: pathlib.Path, storage: BigArrayStorage) -> None:
+    summary = BlockSummaryStorage(tmp_path / "close.rollup", block_size=4)
+    summary.sync(storage)
+    np.testing.assert_array_equal(
+        summary.blocks, summarize(read_values(storage, 0, len(storage)), 4)
+    )
+    storage[5:7] = np.array([np.nan, 100], dtype="float32")
+    summary.refresh(storage, 5, 7)
+    storage.extend(np.array([-1, -2, -3], dtype="float32"))
+    summary.refresh(storage, 10, 13)
+    np.testing.assert_array_equal(
+        summary.blocks, summarize(read_values(storage, 0, len(storage)), 4)
+    )
+    reloaded = BlockSummaryStorage(tmp_path / "close.rollup", block_size=4)
+    assert len(reloaded) == 13
+    np.testing.assert_array_equal(reloaded.blocks, summary.blocks)
+    assert len(BlockSummaryStorage(tmp_path / "close.rollup", block_size=8)) == 0
+
+
+def test_is_synced(tmp_path: pathlib.Path, storage: BigArrayStorage) -> None:
+    summary = BlockSummaryStorage(tmp_path / "close.rollup", block_size=4)
+    assert not summary.is_synced(storage)
+    summary.sync(storage)
+    assert summary.is_synced(storage)
+    reloaded = BlockSummaryStorage(tmp_path / "close.rollup", block_size=4)
+    assert reloaded.is_synced(storage)
+    storage.extend(np.array([1], dtype="float32"))
+    assert not reloaded.is_synced(storage)
+
+
+@pytest.mark.parametrize("op", ["count", "sum", "mean", "min", "max"])
+@pytest.mark.parametrize("start, stop", [(0, 10), (1, 9), (2, 3), (4, 8), (5, 5)])
+def test_aggregate(
+    tmp_path: pathlib.Path, storage: BigArrayStorage, op: str, start: int, stop: int
+) -> None:
+    summary = BlockSummaryStorage(tmp_path / "close.rollup", block_size=4)
+    summary.sync(storage)
+    values = read_values(storage, start, stop)
+    valid = values[~np.isnan(values)].astype("float64")
+    expected = {
+        "count": len(valid),
+        "sum": valid.sum(),
+        "mean": valid.mean() if len(valid) else np.nan,
+        "min": valid.min() if len(valid) else np.nan,
+        "max": valid.max() if len(valid) else np.nan,
+    }[op]
+    np.testing.assert_allclose(summary.aggregate(storage, start, stop, op), expected)
+    with pytest.raises(ValueError):
+        summary.aggregate(storage, start, stop, "median")
+
+
+@pytest.mark.parametrize(
+    "predicate",
+    [(">", 6), (">=", 9), ("<", 1), ("<=", 4), ("==", 5), ("!=", 0), "isnan", "notnan"],
+)
+@pytest.mark.parametrize("start, stop", [(0, 10), (1, 9), (5, 5)])
+def test_scan(
+    tmp_path: pathlib.Path,
+    storage: BigArrayStorage,
+    predicate: Predicate,
+    start: int,
+    stop: int,
+) -> None:
+    summary = BlockSummaryStorage(tmp_path / "close.rollup", block_size=4)
+    summary.sync(storage)
+    values = read_values(storage, 0, len(storage))
+    op, value = parse_predicate(predicate)
+    expected = np.flatnonzero(match_values(values, op, value))
+    expected = expected[(expected >= start) & (expected < stop)]
+    positions, matched = summary.scan(storage, start, stop, predicate)
+    np.testing.assert_array_equal(positions, expected)
+    np.testing.assert_array_equal(matched, values[expected])
+
+
+def test_scan_skips_blocks(
+    tmp_path: pathlib.Path, storage: BigArrayStorage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    summary = BlockSummaryStorage(tmp_path / "close.rollup", block_size=4)
+    summary.sync(storage)
+    reads = []
+    getitem = BigArrayStorage.__getitem__
+
+    def recording_getitem(self: BigArrayStorage, index: slice) -> np.ndarray:
+        reads.append((index.start, index.stop))
+        return np.asarray(getitem(self, index))
+
+    monkeypatch.setattr(BigArrayStorage, "__getitem__", recording_getitem)
+    positions, _ = summary.scan(storage, 0, 10, (">", 8))
+    np.testing.assert_array_equal(positions, [9])
+    assert reads == [(8, 10)]
+    positions, _ = summary.scan(storage, 0, 10, "isnan")
+    np.testing.assert_array_equal(positions, [3])
+    assert reads[1:] == [(0, 4)]
+    with pytest.raises(ValueError):
+        summary.scan(storage, 0, 10, (">", np.nan))
+    with pytest.raises(ValueError):
+        summary.scan(storage, 0, 10, "between")
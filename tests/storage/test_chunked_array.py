@@ -0,0 +1,156 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from flumen.storage.big_array import BigArrayStorage
+from flumen.storage.chunked_array import ChunkedArrayStorage
+
+
+@pytest.fixture()
+def chunked_array_storage(tmp_path: pathlib.Path) -> ChunkedArrayStorage:
+    return ChunkedArrayStorage(tmp_path / "array", dtype=np.dtype("f"), chunk_size=2)
+
+
+@pytest.fixture()
+def array() -> np.array:
+    return np.array([1.0, 2.0, 3.0, 4.0, 5.0], dtype=np.dtype("f"))
+
+
+def test_extend_chunked_array(
+    chunked_array_storage: ChunkedArrayStorage, array: np.array
+) -> None:
+    chunked_array_storage.extend(array)
+    assert np.array_equal(chunked_array_storage[:], array)
+    assert chunked_array_storage._chunk_lengths == [2, 2, 1]
+    chunked_array_storage.extend(np.array([6.0, 7.0], dtype=np.dtype("f")))
+    assert np.array_equal(
+        chunked_array_storage[:], np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+    )
+    assert chunked_array_storage._chunk_lengths == [2, 2, 2, 1]
+
+
+def test_append_chunked_array(chunked_array_storage: ChunkedArrayStorage) -> None:
+    chunked_array_storage.append(1.0)
+    chunked_array_storage.append(2.0)
+    chunked_array_storage.append(3.0)
+    assert np.array_equal(chunked_array_storage[:], np.array([1.0, 2.0, 3.0]))
+    assert chunked_array_storage._chunk_lengths == [2, 1]
+
+
+def test_get_chunked_array(
+    chunked_array_storage: ChunkedArrayStorage, array: np.array
+) -> None:
+    assert np.array_equal(chunked_array_storage[:], np.array([]))
+    chunked_array_storage.extend(array)
+    assert chunked_array_storage[0] == 1.0
+    assert chunked_array_storage[-1] == 5.0
+    assert np.array_equal(chunked_array_storage[1:4], np.array([2.0, 3.0, 4.0]))
+    assert np.array_equal(chunked_array_storage[0:-1], array)
+    with pytest.raises(IndexError):
+        _ = chunked_array_storage[5]
+
+
+def test_set_chunked_array(
+    chunked_array_storage: ChunkedArrayStorage, array: np.array
+) -> None:
+    chunked_array_storage.extend(array)
+    chunked_array_storage[0] = 6.0
+    chunked_array_storage[1:4] = np.array([7.0, 8.0, 9.0], dtype=np.dtype("f"))
+    assert np.array_equal(chunked_array_storage[:], np.array([6.0, 7.0, 8.0, 9.0, 5.0]))
+
+
+def test_insert_chunked_array(
+    chunked_array_storage: ChunkedArrayStorage, array: np.array
+) -> None:
+    chunked_array_storage.insert(0, array)
+    assert np.array_equal(chunked_array_storage[:], array)
+    chunk_ids = list(chunked_array_storage._chunk_ids)
+    chunked_array_storage.insert(2, 6.0)
+    assert np.array_equal(
+        chunked_array_storage[:], np.array([1.0, 2.0, 6.0, 3.0, 4.0, 5.0])
+    )
+    assert chunked_array_storage._chunk_ids[0] == chunk_ids[0]
+    assert chunked_array_storage._chunk_ids[2] == chunk_ids[2]
+    chunked_array_storage.insert(2, np.array([7.0, 8.0], dtype=np.dtype("f")))
+    assert chunked_array_storage._chunk_lengths == [2, 2, 2, 1, 1]
+    chunked_array_storage.insert(len(chunked_array_storage), 9.0)
+    assert chunked_array_storage[-1] == 9.0
+
+
+def test_del_chunked_array(
+    chunked_array_storage: ChunkedArrayStorage, array: np.array
+) -> None:
+    chunked_array_storage.extend(array)
+    del chunked_array_storage[0]
+    assert np.array_equal(chunked_array_storage[:], np.array([2.0, 3.0, 4.0, 5.0]))
+    assert chunked_array_storage._chunk_lengths == [1, 2, 1]
+    del chunked_array_storage[1:3]
+    assert np.array_equal(chunked_array_storage[:], np.array([2.0, 5.0]))
+    assert chunked_array_storage._chunk_lengths == [1, 1]
+    del chunked_array_storage[:]
+    assert len(chunked_array_storage) == 0
+    assert not chunked_array_storage._uri.exists()
+
+
+@pytest.mark.parametrize(
+    "index", [slice(0, -1), slice(1, -2), slice(2, None), slice(None, 3)]
+)
+def test_chunked_array_slice_parity(
+    tmp_path: pathlib.Path,
+    chunked_array_storage: ChunkedArrayStorage,
+    array: np.array,
+    index: slice,
+) -> None:
+    big_array_storage: BigArrayStorage = BigArrayStorage(
+        tmp_path / "array.bin", dtype=np.dtype("f")
+    )
+    for storage in (chunked_array_storage, big_array_storage):
+        storage.extend(array)
+    assert np.array_equal(chunked_array_storage[index], big_array_storage[index])
+    values = np.arange(len(range(*index.indices(len(array)))), dtype=np.dtype("f"))
+    chunked_array_storage[index] = values
+    big_array_storage[index] = values
+    assert np.array_equal(chunked_array_storage[:], big_array_storage[:])
+    del chunked_array_storage[index]
+    del big_array_storage[index]
+    assert len(chunked_array_storage) == len(big_array_storage)
+
+
+def test_del_chunked_array_rebalance(tmp_path: pathlib.Path) -> None:
+    storage: ChunkedArrayStorage = ChunkedArrayStorage(
+        tmp_path / "array", dtype=np.dtype("f"), chunk_size=4
+    )
+    storage.extend(np.arange(12, dtype=np.dtype("f")))
+    del storage[0:3]
+    assert storage._chunk_lengths == [5, 4]
+    assert np.array_equal(storage[:], np.arange(3, 12, dtype=np.dtype("f")))
+
+
+def test_load_chunked_array(
+    chunked_array_storage: ChunkedArrayStorage, array: np.array
+) -> None:
+    chunked_array_storage.extend(array)
+    del chunked_array_storage[1]
+    loaded_storage: ChunkedArrayStorage = ChunkedArrayStorage(
+        chunked_array_storage._uri, dtype=np.dtype("f")
+    )
+    assert loaded_storage.chunk_size == 2
+    assert np.array_equal(loaded_storage[:], np.array([1.0, 3.0, 4.0, 5.0]))
+    assert len(list(loaded_storage._uri.glob("*.chunk"))) == len(
+        loaded_storage._chunk_ids
+    )
+
+
+def test_codec_chunked_array(tmp_path: pathlib.Path, array: np.array) -> None:
+    storage: ChunkedArrayStorage = ChunkedArrayStorage(
+        tmp_path / "array", dtype=np.dtype("f"), chunk_size=2, codec="xor+zlib"
+    )
+    storage.extend(array)
+    storage[1:3] = np.array([7.0, 8.0], dtype=np.dtype("f"))
+    del storage[0]
+    loaded_storage: ChunkedArrayStorage = ChunkedArrayStorage(
+        tmp_path / "array", dtype=np.dtype("f")
+    )
+    assert loaded_storage.codec == "xor+zlib"
+    assert np.array_equal(loaded_storage[:], np.array([7.0, 8.0, 4.0, 5.0]))
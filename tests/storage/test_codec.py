@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from flumen.storage.codec import Codec, Filter
+
+
+@pytest.fixture()
+def array() -> np.array:
+    prices = 1800 + np.cumsum(np.random.default_rng(0).integers(-5, 6, 4096)) / 100
+    prices = prices.astype("float32")
+    prices[[3, 7]] = np.nan
+    return prices
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["raw", "zlib", "lzma", "xor+zlib", "delta+lzma", "xor+shuffle+zlib", "shuffle"],
+)
+def test_codec_roundtrip(name: str, array: np.array) -> None:
+    codec = Codec(name)
+    decoded = codec.decode(codec.encode(array), array.dtype)
+    assert decoded.flags.writeable
+    np.testing.assert_array_equal(decoded.view("u4"), array.view("u4"))
+
+
+def test_codec_roundtrip_empty() -> None:
+    codec = Codec("xor+shuffle+zlib")
+    empty = np.array([], dtype="float32")
+    assert codec.decode(codec.encode(empty), empty.dtype).size == 0
+
+
+@pytest.mark.parametrize("name", ["xor+zlib", "lzma"])
+def test_codec_compression(name: str, array: np.array) -> None:
+    assert len(Codec(name).encode(array)) * 3 < array.nbytes
+
+
+def test_codec_invalid() -> None:
+    with pytest.raises(ValueError) as excinfo:
+        Codec("snappy")
+    assert "Invalid codec: snappy" == str(excinfo.value)
+    with pytest.raises(ValueError) as excinfo:
+        Codec("gzip+zlib")
+    assert "Invalid codec filter: gzip" == str(excinfo.value)
+
+
+def test_filter_requires_encode_and_decode() -> None:
+    class EncodeOnlyFilter(Filter):
+        def encode(self, data: np.ndarray) -> np.ndarray:
+            return data
+
+    with pytest.raises(TypeError):
+        EncodeOnlyFilter()  # type: ignore[abstract]
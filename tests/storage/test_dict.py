@@ -1,9 +1,12 @@
 import pathlib
+import threading
 from typing import Dict
 
 import pytest
 
-from flumen.storage.dict import DictStorage
+from flumen.storage.dict import DictStorage, LogDictStorage
+from flumen.utils.executor import IOExecutor
+from flumen.utils.file_lock import file_lock
 
 
 @pytest.fixture()
@@ -75,3 +78,102 @@ async def test_save_dict(dict_storage: DictStorage, dict_: Dict[str, tuple]) ->
     dict_storage.update(dict_)
     await dict_storage.save()
     assert dict_storage.load() == dict_
+
+
+async def test_save_dict_replaces_file(
+    dict_storage: DictStorage, dict_: Dict[str, tuple], tmp_file: pathlib.Path
+) -> None:
+    inode = tmp_file.stat().st_ino
+    dict_storage.update(dict_)
+    await dict_storage.save()
+    assert tmp_file.stat().st_ino != inode
+    assert [path.name for path in tmp_file.parent.iterdir()] == [tmp_file.name]
+
+
+def test_load_dict_waits_for_lock(tmp_file: pathlib.Path) -> None:
+    loaded = threading.Event()
+
+    def load() -> None:
+        DictStorage[str, tuple](tmp_file, io_executor=IOExecutor(process_lock=True))
+        loaded.set()
+
+    thread = threading.Thread(target=load)
+    with file_lock(tmp_file):
+        thread.start()
+        assert not loaded.wait(0.1)
+    thread.join()
+    assert loaded.is_set()
+
+
+@pytest.fixture()
+def log_dict_storage(tmp_file: pathlib.Path) -> LogDictStorage:
+    return LogDictStorage[str, tuple](tmp_file, compact_threshold=1024)
+
+
+async def test_save_log_dict(
+    log_dict_storage: LogDictStorage, dict_: Dict[str, tuple]
+) -> None:
+    log_dict_storage.update(dict_)
+    await log_dict_storage.save()
+    del log_dict_storage["600519.XSHG"]
+    log_dict_storage["600036.XSHG"] = ("2022-01-01", "2022-09-02")
+    await log_dict_storage.save()
+    assert log_dict_storage._uri.stat().st_size == 0
+    assert log_dict_storage._log_uri.exists()
+    assert log_dict_storage.load() == {
+        "600036.XSHG": ("2022-01-01", "2022-09-02"),
+        "600000.XSHG": ("2022-01-01", "2022-09-01"),
+    }
+
+
+async def test_reload_log_dict(
+    log_dict_storage: LogDictStorage, dict_: Dict[str, tuple]
+) -> None:
+    log_dict_storage.update(dict_)
+    await log_dict_storage.save()
+    log_dict_storage["600519.XSHG"] = ("2022-01-01", "2022-09-02")
+    log_dict_storage.reload()
+    assert log_dict_storage["600519.XSHG"] == ("2022-01-01", "2022-09-01")
+    await log_dict_storage.save()
+    assert log_dict_storage.load() == dict_
+
+
+async def test_compact_log_dict(log_dict_storage: LogDictStorage) -> None:
+    for i in range(100):
+        log_dict_storage[f"{i:06d}.XSHG"] = ("2022-01-01", "2022-09-01")
+        await log_dict_storage.save()
+    assert log_dict_storage._log_size < 1024
+    assert log_dict_storage._uri.stat().st_size > 0
+    assert len(log_dict_storage.load()) == 100
+
+
+async def test_load_log_dict_torn_record(
+    log_dict_storage: LogDictStorage, dict_: Dict[str, tuple]
+) -> None:
+    log_dict_storage.update(dict_)
+    await log_dict_storage.save()
+    with open(log_dict_storage._log_uri, "ab") as f:
+        f.write(b"\x80\x04\x95")
+    loaded_storage = LogDictStorage[str, tuple](log_dict_storage._uri)
+    assert dict(loaded_storage) == dict_
+    loaded_storage["600001.XSHG"] = ("2022-01-01", "2022-09-01")
+    await loaded_storage.save()
+    assert len(loaded_storage.load()) == 4
+
+
+@pytest.mark.parametrize("storage_cls", [DictStorage, LogDictStorage])
+async def test_save_dict_merges_external_changes(
+    tmp_file: pathlib.Path, storage_cls: type
+) -> None:
+    first = storage_cls(tmp_file, merge=lambda current, item, base: max(current, item))
+    second = storage_cls(tmp_file)
+    first["a"], first["b"] = 1, 5
+    await first.save()
+    second["c"] = 3
+    second["b"] = 2
+    await second.save()
+    first["a"] = 4
+    first["b"] = 0
+    await first.save()
+    assert dict(first) == {"a": 4, "b": 2, "c": 3}
+    assert storage_cls(tmp_file).load() == {"a": 4, "b": 2, "c": 3}
@@ -0,0 +1,110 @@
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from flumen.storage.implicit_index_array import (
+    ImplicitIndexArrayStorage,
+    RangeIndexArrayStorage,
+)
+from flumen.storage.index_array import DatetimeIndexArrayStorage
+
+STEP = pd.Timedelta("5T").value
+
+
+@pytest.fixture()
+def datetimes() -> pd.DatetimeIndex:
+    return pd.date_range("2020-01-01", "2020-01-02", freq="5T")
+
+
+@pytest.fixture()
+def range_storage(
+    tmp_path: pathlib.Path, datetimes: pd.DatetimeIndex
+) -> RangeIndexArrayStorage:
+    storage = RangeIndexArrayStorage(tmp_path / "5T.range", STEP)
+    storage.extend_range(datetimes[0].value, datetimes[-1].value)
+    return storage
+
+
+@pytest.fixture()
+def datetime_storage(
+    tmp_path: pathlib.Path, datetimes: pd.DatetimeIndex
+) -> DatetimeIndexArrayStorage:
+    storage = DatetimeIndexArrayStorage(tmp_path / "5T.calendar")
+    storage.extend(datetimes.values)
+    return storage
+
+
+@pytest.mark.parametrize(
+    "start, stop",
+    [
+        (None, None),
+        ("2020-01-01 01:00:00", "2020-01-01 02:00:00"),
+        ("2020-01-01 01:02:00", "2020-01-01 02:03:00"),
+        (pd.Timestamp("2020-01-01 09:00", tz="Asia/Shanghai"), None),
+        ("2019-12-31 00:00:00", "2020-01-01 00:00:00"),
+        ("2020-01-01 23:58:00", "2020-01-03 00:00:00"),
+        ("2020-01-03 00:00:00", "2020-01-04 00:00:00"),
+        ("2020-01-01 02:00:00", "2020-01-01 01:00:00"),
+    ],
+)
+def test_range_storage_matches_datetime_storage(
+    range_storage: RangeIndexArrayStorage,
+    datetime_storage: DatetimeIndexArrayStorage,
+    start: object,
+    stop: object,
+) -> None:
+    assert len(range_storage) == len(datetime_storage)
+    pd.testing.assert_series_equal(
+        range_storage[start:stop], datetime_storage[start:stop]
+    )
+    assert range_storage.slice_locs(start, stop) == datetime_storage.slice_locs(
+        start, stop
+    )
+
+
+def test_range_storage_positions(
+    range_storage: RangeIndexArrayStorage, datetimes: pd.DatetimeIndex
+) -> None:
+    assert range_storage[0] == datetimes.values[0]
+    assert range_storage[-1] == datetimes.values[-1]
+    np.testing.assert_array_equal(range_storage[10:20], datetimes.values[10:20])
+    assert range_storage[pd.Timestamp("2020-01-01 00:10:00", tz="UTC")] == 2
+    with pytest.raises(KeyError):
+        _ = range_storage[pd.Timestamp("2020-01-01 00:11:00")]
+    with pytest.raises(IndexError):
+        _ = range_storage[len(datetimes)]
+
+
+def test_range_storage_persist(
+    range_storage: RangeIndexArrayStorage, datetimes: pd.DatetimeIndex
+) -> None:
+    range_storage.dump()
+    assert range_storage._uri.stat().st_size == 3 * 8
+    loaded = RangeIndexArrayStorage(range_storage._uri, STEP)
+    pd.testing.assert_series_equal(loaded[:], range_storage[:])
+    loaded.extend_range(datetimes[0].value, pd.Timestamp("2020-01-03").value)
+    assert len(loaded) == 2 * len(datetimes) - 1
+    with pytest.raises(ValueError):
+        RangeIndexArrayStorage(range_storage._uri, 2 * STEP)
+
+
+def test_range_storage_delete(
+    range_storage: RangeIndexArrayStorage, datetimes: pd.DatetimeIndex
+) -> None:
+    del range_storage[:2]
+    assert range_storage[0] == datetimes.values[2]
+    del range_storage[-2:]
+    assert range_storage[-1] == datetimes.values[-3]
+    with pytest.raises(ValueError):
+        del range_storage[1:2]
+    del range_storage[:]
+    range_storage.dump()
+    assert len(range_storage) == 0
+    assert not range_storage._uri.exists()
+
+
+def test_implicit_index_array_is_abstract(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(TypeError):
+        ImplicitIndexArrayStorage(tmp_path / "abstract")  # type: ignore[abstract]
@@ -1,3 +1,4 @@
+import os
 import pathlib
 from typing import List
 
@@ -167,3 +168,91 @@ def test_datetime_index_array(tmp_file: pathlib.Path, array: List[str]) -> None:
         dt_index_array.get_data_series(array, dt_index_array.SERIES_DTYPE),
     )
     assert dt_index_array[:].index.dtype == dt_index_array.SERIES_DTYPE
+
+
+def test_slice_locs_array(array_storage: IndexArrayStorage, array: List[str]) -> None:
+    array_storage.extend(array)
+    assert array_storage.slice_locs("2022-01-02", "2022-01-04") == (1, 4)
+    assert array_storage.slice_locs("2021-12-31", "2022-01-01 12:00") == (0, 1)
+    assert array_storage.slice_locs(None, None) == (0, 5)
+    assert array_storage.slice_locs("2022-01-06", "2022-01-07") == (5, 5)
+    array_storage[0] = "2022-01-06"
+    with pytest.raises(ValueError):
+        array_storage.slice_locs("2022-01-02", "2022-01-04")
+
+
+def test_sorted_array(array_storage: IndexArrayStorage, array: List[str]) -> None:
+    array_storage.extend(array)
+    assert array_storage._is_sorted
+    array_storage.append("2022-01-04")
+    assert not array_storage._is_sorted
+    assert array_storage["2022-01-05"] == 4
+    del array_storage[-1]
+    assert array_storage._is_sorted
+    array_storage.insert(5, "2022-01-06")
+    assert array_storage._is_sorted
+    assert array_storage["2022-01-06"] == 5
+
+
+def test_append_array_capacity(array_storage: IndexArrayStorage) -> None:
+    for day in range(1, 29):
+        array_storage.append(np.datetime64(f"2022-02-{day:02d}", "ns"))
+    assert len(array_storage) == 28
+    assert len(array_storage._buffer) >= 28
+    assert array_storage["2022-02-28"] == 27
+    assert array_storage[-1] == np.datetime64("2022-02-28", "ns")
+
+
+def test_get_datetime_index_array_tz(tmp_file: pathlib.Path, array: List[str]) -> None:
+    dt_index_array = DatetimeIndexArrayStorage(tmp_file)
+    dt_index_array.extend(array)
+    assert dt_index_array[pd.Timestamp("2022-01-02 08:00", tz="Asia/Shanghai")] == 1
+    with pytest.raises(KeyError):
+        _ = dt_index_array[pd.Timestamp("2022-01-02", tz="Asia/Shanghai")]
+    start, end = pd.Timestamp("2022-01-02", tz="UTC"), pd.Timestamp("2022-01-03")
+    actual_series = dt_index_array[start:end]
+    np.testing.assert_array_equal(actual_series.values, [1, 2])
+    assert actual_series.index.dtype == dt_index_array.SERIES_DTYPE
+
+
+async def test_save_array_tail_append(
+    array_storage: IndexArrayStorage, array: List[str]
+) -> None:
+    array_storage.extend(array[:3])
+    await array_storage.save()
+    array_storage.extend(array[3:4])
+    await array_storage.save()
+    np.testing.assert_array_equal(array_storage.load(), array[:4])
+    with open(array_storage._uri, "r+b") as f:
+        f.write(np.array(["2000-01-01"], dtype=array_storage._dtype).tobytes())
+    stat = array_storage._uri.stat()
+    os.utime(array_storage._uri, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    array_storage.extend(array[4:])
+    await array_storage.save()
+    np.testing.assert_array_equal(array_storage.load(), array)
+
+
+async def test_save_array_rewrite(
+    array_storage: IndexArrayStorage, array: List[str]
+) -> None:
+    array_storage.extend(array)
+    await array_storage.save()
+    array_storage[0] = "2021-12-31"
+    array_storage.append("2022-01-06")
+    await array_storage.save()
+    np.testing.assert_array_equal(array_storage.load(), array_storage[0:6])
+    del array_storage[1]
+    await array_storage.save()
+    np.testing.assert_array_equal(array_storage.load(), array_storage[0:5])
+    array_storage._uri.unlink()
+    array_storage.append("2022-01-07")
+    await array_storage.save()
+    np.testing.assert_array_equal(array_storage.load(), array_storage[0:6])
+
+
+def test_datetime_index_array_zero_copy_slice(tmp_path: pathlib.Path) -> None:
+    storage = DatetimeIndexArrayStorage(tmp_path / "calendar")
+    storage.extend(pd.date_range("2020-01-01", periods=5, freq="D").values)
+    series = storage[slice(pd.Timestamp("2020-01-02", tz="UTC"), None)]
+    assert str(series.index.dtype) == DatetimeIndexArrayStorage.SERIES_DTYPE
+    assert np.shares_memory(series.index.asi8, storage._buffer)
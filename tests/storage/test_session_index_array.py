@@ -0,0 +1,75 @@
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pendulum
+import pytest
+
+from flumen.frequency.datetime import date_range, session_range
+from flumen.models.frequency import Frequency
+from flumen.storage.session_index_array import SessionIndexArrayStorage
+
+
+@pytest.fixture()
+def freq() -> Frequency:
+    return Frequency.from_str("SSET")
+
+
+@pytest.fixture()
+def session_storage(
+    tmp_path: pathlib.Path, freq: Frequency
+) -> SessionIndexArrayStorage:
+    storage = SessionIndexArrayStorage(
+        tmp_path / "SSET.session", freq.unit.market_exchange, freq.to_str()
+    )
+    storage.extend_sessions(
+        session_range(freq, pendulum.parse("2020-01-01"), pendulum.parse("2020-01-10"))
+    )
+    return storage
+
+
+def test_session_storage_matches_date_range(
+    session_storage: SessionIndexArrayStorage, freq: Frequency
+) -> None:
+    expected = date_range(
+        freq, pendulum.parse("2020-01-01"), pendulum.parse("2020-01-10")
+    )
+    assert len(session_storage) == len(expected) == 7 * 240
+    np.testing.assert_array_equal(session_storage[:].index, expected)
+    np.testing.assert_array_equal(session_storage[0:], expected.values)
+    assert session_storage[-1] == expected.values[-1]
+    assert session_storage[241] == expected.values[241]
+
+
+def test_session_storage_label_slice(session_storage: SessionIndexArrayStorage) -> None:
+    start, stop = pd.Timestamp("2020-01-03 03:00:00"), pd.Timestamp("2020-01-06 02:00")
+    actual = session_storage[start:stop]
+    assert actual.index[0] == pd.Timestamp("2020-01-03 03:00:00", tz="UTC")
+    assert actual.index[-1] == pd.Timestamp("2020-01-06 02:00:00", tz="UTC")
+    assert actual.iloc[0] == 240 + 89
+    np.testing.assert_array_equal(actual.values, np.arange(329, 329 + len(actual)))
+    assert session_storage.slice_locs(start, stop) == (329, 329 + len(actual))
+    assert session_storage[pd.Timestamp("2020-01-02 01:31:00", tz="UTC")] == 0
+    with pytest.raises(KeyError):
+        _ = session_storage[pd.Timestamp("2020-01-02 04:00:00")]
+
+
+def test_session_storage_persist(
+    session_storage: SessionIndexArrayStorage, freq: Frequency, tmp_path: pathlib.Path
+) -> None:
+    session_storage.dump()
+    assert session_storage._uri.stat().st_size == 7 * 5 * 8
+    loaded = SessionIndexArrayStorage(
+        session_storage._uri, freq.unit.market_exchange, freq.to_str()
+    )
+    pd.testing.assert_series_equal(loaded[:], session_storage[:])
+    loaded.extend_sessions(
+        session_range(freq, pendulum.parse("2020-01-09"), pendulum.parse("2020-01-13"))
+    )
+    assert len(loaded) == 8 * 240
+    with pytest.raises(ValueError):
+        del loaded[1:]
+    del loaded[:]
+    loaded.dump()
+    assert len(loaded) == 0
+    assert not loaded._uri.exists()
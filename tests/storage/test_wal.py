@@ -0,0 +1,28 @@
+import pathlib
+
+import numpy as np
+
+from flumen.storage.wal import WriteAheadLog
+
+
+def test_wal_replay(tmp_path: pathlib.Path) -> None:
+    wal = WriteAheadLog(tmp_path / "fields.wal")
+    assert wal.replay() == []
+    wal.append([("open", 0, 2, np.array([1, 2], dtype="float32"))])
+    wal.append([("close", 1, 2, np.array([3], dtype="float32"))] * 2)
+    with open(wal.uri, "ab") as f:
+        f.write(b"\x80\x04torn")
+    records = WriteAheadLog(wal.uri).replay()
+    assert [record[:3] for record in records] == [
+        ("open", 0, 2),
+        ("close", 1, 2),
+        ("close", 1, 2),
+    ]
+    np.testing.assert_array_equal(records[0][3], [1, 2])
+    reopened = WriteAheadLog(wal.uri)
+    reopened.replay()
+    reopened.append([("high", 0, 1, np.array([4], dtype="float32"))])
+    assert len(WriteAheadLog(wal.uri).replay()) == 4
+    reopened.truncate()
+    assert not wal.uri.exists()
+    assert len(reopened) == 0
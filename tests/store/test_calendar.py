@@ -5,7 +5,9 @@ import pandas as pd
 import pendulum
 import pytest
 
+from flumen.frequency.datetime import date_range
 from flumen.models.frequency import Frequency
+from flumen.storage.implicit_index_array import RangeIndexArrayStorage
 from flumen.storage.index_array import DatetimeIndexArrayStorage
 from flumen.store.calenadar import CalendarStore
 
@@ -54,8 +56,9 @@ async def test_insert_calendar(
         "2020-01-01", "2020-01-31", freq=freq_1d.to_str(), tz="UTC"
     )
     np.testing.assert_array_equal(actual_calendar, expected_calendar)
-    actual_storage = DatetimeIndexArrayStorage(
+    actual_storage = RangeIndexArrayStorage(
         calendar_store_created.get_freq_calendar_uri(freq_1d),
+        CalendarStore.get_range_step(freq_1d),
     )[:]
     pd.testing.assert_series_equal(
         calendar_store_created._data[freq_1d][:], actual_storage
@@ -170,3 +173,170 @@ async def test_delete_calendar_not_created(
 ) -> None:
     with pytest.raises(ValueError):
         await calendar_store.delete(freq_1d)
+
+
+async def test_lazy_load_calendar(
+    freq_1d: Frequency, calendar_store_created: CalendarStore, tmp_path: pathlib.Path
+) -> None:
+    calendar_store = CalendarStore(tmp_path)
+    assert freq_1d in calendar_store._data
+    assert not calendar_store._data.is_loaded(freq_1d)
+    actual_calendar = await calendar_store.find(
+        freq_1d,
+        pendulum.parse("2020-01-05"),
+        pendulum.parse("2020-01-10"),
+    )
+    assert len(actual_calendar) == 6
+    assert calendar_store._data.is_loaded(freq_1d)
+    assert calendar_store.unload_idle(0) == [freq_1d]
+    assert not calendar_store._data.is_loaded(freq_1d)
+    assert freq_1d in calendar_store._data
+
+
+async def test_session_calendar(calendar_store: CalendarStore) -> None:
+    freq = Frequency.from_str("SSET")
+    await calendar_store.insert(
+        freq, pendulum.parse("2020-01-01"), pendulum.parse("2020-01-03")
+    )
+    await calendar_store.update(freq, end_datetime=pendulum.parse("2020-01-07"))
+    uri = calendar_store.get_freq_calendar_uri(freq)
+    assert uri.suffix == CalendarStore.SESSION_STORAGE_EXTENSION
+    assert uri.stat().st_size == 4 * 5 * 8
+    actual_calendar = await calendar_store.find(
+        freq, pendulum.parse("2020-01-01"), pendulum.parse("2020-01-08")
+    )
+    expected_calendar = date_range(
+        freq, pendulum.parse("2020-01-01"), pendulum.parse("2020-01-07")
+    )
+    np.testing.assert_array_equal(actual_calendar.index, expected_calendar)
+    np.testing.assert_array_equal(actual_calendar.values, np.arange(4 * 240))
+    assert freq in CalendarStore(calendar_store._uri.parent)._data
+
+
+async def test_range_calendar(calendar_store: CalendarStore) -> None:
+    freq = Frequency.from_str("5T")
+    await calendar_store.insert(
+        freq, pendulum.parse("2020-01-01"), pendulum.parse("2020-01-02")
+    )
+    await calendar_store.update(freq, end_datetime=pendulum.parse("2020-01-03"))
+    uri = calendar_store.get_freq_calendar_uri(freq)
+    assert uri.suffix == CalendarStore.RANGE_STORAGE_EXTENSION
+    assert uri.stat().st_size == 3 * 8
+    actual_calendar = await calendar_store.find(
+        freq, pendulum.parse("2020-01-01 23:58"), pendulum.parse("2020-01-02 01:00")
+    )
+    expected_calendar = pd.date_range(
+        "2020-01-02 00:00", "2020-01-02 01:00", freq="5T", tz="UTC"
+    )
+    np.testing.assert_array_equal(actual_calendar.index, expected_calendar)
+    assert actual_calendar[0] == 288
+
+
+@pytest.mark.parametrize("raw_freq", ["5T", "W", "SSET"])
+async def test_locate_calendar(calendar_store: CalendarStore, raw_freq: str) -> None:
+    freq = Frequency.from_str(raw_freq)
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-03-01")
+    await calendar_store.insert(freq, start, end)
+    calendar = date_range(freq, start, end).tz_convert("UTC").tz_localize(None)
+    timestamps = pd.date_range("2019-12-31", "2020-03-02", periods=5001).values
+    timestamps = np.concatenate([timestamps, calendar.values[::7]])
+    for side in ("left", "right"):
+        actual = await calendar_store.locate(freq, timestamps, side=side)
+        assert actual.dtype == np.int64
+        np.testing.assert_array_equal(
+            actual, np.searchsorted(calendar.values, timestamps, side)
+        )
+    actual = await calendar_store.locate(
+        freq,
+        pd.DatetimeIndex(timestamps, tz="UTC").tz_convert("Asia/Shanghai"),
+        asof=True,
+    )
+    np.testing.assert_array_equal(
+        actual, np.searchsorted(calendar.values, timestamps, "right") - 1
+    )
+    with pytest.raises(ValueError):
+        await calendar_store.locate(freq, timestamps, side="middle")
+
+
+async def test_map_calendar(calendar_store: CalendarStore) -> None:
+    minutely, half_hourly, daily = (
+        Frequency.from_str(raw_freq) for raw_freq in ("SSET", "30SSET", "SSED")
+    )
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-01-10")
+    for freq in (minutely, half_hourly, daily):
+        await calendar_store.insert(freq, start, end)
+    positions = np.arange(7 * 240)
+    np.testing.assert_array_equal(
+        await calendar_store.map(minutely, half_hourly, positions), positions // 30
+    )
+    np.testing.assert_array_equal(
+        await calendar_store.map(minutely, daily, positions), positions // 240
+    )
+    np.testing.assert_array_equal(
+        await calendar_store.map(daily, minutely, np.arange(7)),
+        np.arange(7) * 240,
+    )
+    with pytest.raises(ValueError):
+        await calendar_store.map(minutely, daily, [7 * 240])
+
+
+async def test_legacy_session_calendar(tmp_path: pathlib.Path) -> None:
+    freq = Frequency.from_str("SSET")
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-01-03")
+    legacy_uri = tmp_path / "CalendarStore" / f"{freq.raw_str}.calendar"
+    legacy_uri.parent.mkdir()
+    legacy_storage = DatetimeIndexArrayStorage(legacy_uri)
+    legacy_storage.extend(date_range(freq, start, end).values)
+    legacy_storage.dump()
+    calendar_store = CalendarStore(tmp_path)
+    assert calendar_store.get_freq_calendar_uri(freq) == legacy_uri
+    await calendar_store.update(freq, end_datetime=pendulum.parse("2020-01-07"))
+    actual_calendar = await calendar_store.find(
+        freq, start, pendulum.parse("2020-01-08")
+    )
+    expected_calendar = date_range(freq, start, pendulum.parse("2020-01-07"))
+    np.testing.assert_array_equal(actual_calendar.index, expected_calendar)
+    np.testing.assert_array_equal(actual_calendar.values, np.arange(4 * 240))
+    assert not calendar_store._uri.joinpath(f"{freq.raw_str}.session").exists()
+    reopened = CalendarStore(tmp_path)
+    assert len(reopened._data[freq]) == 4 * 240
+
+
+async def test_legacy_range_calendar(tmp_path: pathlib.Path) -> None:
+    freq = Frequency.from_str("5T")
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-01-02")
+    legacy_uri = tmp_path / "CalendarStore" / f"{freq.raw_str}.calendar"
+    legacy_uri.parent.mkdir()
+    legacy_storage = DatetimeIndexArrayStorage(legacy_uri)
+    legacy_storage.extend(date_range(freq, start, end).values)
+    legacy_storage.dump()
+    calendar_store = CalendarStore(tmp_path)
+    assert calendar_store.get_freq_calendar_uri(freq) == legacy_uri
+    await calendar_store.update(freq, end_datetime=pendulum.parse("2020-01-03"))
+    actual_calendar = await calendar_store.find(
+        freq, pendulum.parse("2020-01-01 23:58"), pendulum.parse("2020-01-02 01:00")
+    )
+    expected_calendar = pd.date_range(
+        "2020-01-02 00:00", "2020-01-02 01:00", freq="5T", tz="UTC"
+    )
+    np.testing.assert_array_equal(actual_calendar.index, expected_calendar)
+    assert actual_calendar[0] == 288
+    assert not calendar_store._uri.joinpath(f"{freq.raw_str}.range").exists()
+    assert len(CalendarStore(tmp_path)._data[freq]) == 2 * 288 + 1
+
+
+async def test_delete_legacy_calendar(tmp_path: pathlib.Path) -> None:
+    freq = Frequency.from_str("SSET")
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-01-03")
+    legacy_uri = tmp_path / "CalendarStore" / f"{freq.raw_str}.calendar"
+    legacy_uri.parent.mkdir()
+    legacy_storage = DatetimeIndexArrayStorage(legacy_uri)
+    legacy_storage.extend(date_range(freq, start, end).values)
+    legacy_storage.dump()
+    calendar_store = CalendarStore(tmp_path)
+    await calendar_store.delete(freq)
+    assert not legacy_uri.exists()
+    assert calendar_store.get_freq_calendar_uri(freq).suffix == ".session"
+    await calendar_store.insert(freq, start, end)
+    assert calendar_store._uri.joinpath(f"{freq.raw_str}.session").exists()
+    assert len(CalendarStore(tmp_path)._data[freq]) == 2 * 240
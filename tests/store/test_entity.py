@@ -1,5 +1,8 @@
 import pathlib
+from typing import List
 
+import numpy as np
+import pandas as pd
 import pendulum
 import pytest
 
@@ -31,8 +34,8 @@ async def test_load_exists_data(
     data = entity_store_created._load_exists_data()
     assert "XSHG.600519" in data
     assert data["XSHG.600519"] == (
-        pendulum.parse("2020-01-01"),
-        pendulum.parse("2020-01-31"),
+        pd.Timestamp("2020-01-01", tz="UTC").value,
+        pd.Timestamp("2020-01-31", tz="UTC").value,
     )
 
 
@@ -43,8 +46,8 @@ async def test_insert_entity(entity_store: EntityStore) -> None:
         pendulum.parse("2020-01-31"),
     )
     assert entity_store._data["XSHG.600519"] == (
-        pendulum.parse("2020-01-01"),
-        pendulum.parse("2020-01-31"),
+        pd.Timestamp("2020-01-01", tz="UTC").value,
+        pd.Timestamp("2020-01-31", tz="UTC").value,
     )
 
 
@@ -76,8 +79,8 @@ async def test_update_entity(entity_store_created: EntityStore) -> None:
         end_datetime=pendulum.parse("2020-11-30"),
     )
     assert entity_store_created._data["XSHG.600519"] == (
-        pendulum.parse("2020-10-01"),
-        pendulum.parse("2020-11-30"),
+        pd.Timestamp("2020-10-01", tz="UTC").value,
+        pd.Timestamp("2020-11-30", tz="UTC").value,
     )
 
 
@@ -98,3 +101,154 @@ async def test_delete_entity(entity_store_created: EntityStore) -> None:
 async def test_delete_entity_not_exists(entity_store_created: EntityStore) -> None:
     with pytest.raises(ValueError):
         await entity_store_created.delete("XSHG.6005191")
+
+
+@pytest.fixture()
+def entities() -> List[str]:
+    return ["XSHG.600519", "XSHG.600036", "XSHG.600000"]
+
+
+@pytest.fixture()
+def start_datetimes() -> np.array:
+    return np.array(["2020-01-01", "2020-02-01", "2020-03-01"], dtype="datetime64[ns]")
+
+
+@pytest.fixture()
+def end_datetimes() -> np.array:
+    return np.array(["2020-01-31", "2020-02-29", "2020-03-31"], dtype="datetime64[ns]")
+
+
+async def test_insert_many_entity(
+    entity_store: EntityStore,
+    entities: List[str],
+    start_datetimes: np.array,
+    end_datetimes: np.array,
+) -> None:
+    await entity_store.insert_many(entities, start_datetimes, end_datetimes)
+    assert await entity_store.find("XSHG.600036") == (
+        pendulum.parse("2020-02-01"),
+        pendulum.parse("2020-02-29"),
+    )
+    assert set(entity_store._load_exists_data()) == set(entities)
+
+
+async def test_insert_many_entity_invalid(
+    entity_store_created: EntityStore,
+    entities: List[str],
+    start_datetimes: np.array,
+    end_datetimes: np.array,
+) -> None:
+    with pytest.raises(ValueError):
+        await entity_store_created.insert_many(entities, start_datetimes, end_datetimes)
+    with pytest.raises(ValueError):
+        await entity_store_created.insert_many(
+            ["XSHG.600036", "XSHG.600036"], start_datetimes[1:], end_datetimes[1:]
+        )
+    with pytest.raises(ValueError):
+        await entity_store_created.insert_many(
+            entities[1:], end_datetimes[1:], start_datetimes[1:]
+        )
+    with pytest.raises(ValueError):
+        await entity_store_created.insert_many(
+            entities[1:], start_datetimes, end_datetimes
+        )
+    assert list(entity_store_created._data) == ["XSHG.600519"]
+
+
+async def test_find_many_entity(
+    entity_store: EntityStore,
+    entities: List[str],
+    start_datetimes: np.array,
+    end_datetimes: np.array,
+) -> None:
+    await entity_store.insert_many(entities, start_datetimes, end_datetimes)
+    actual_start, actual_end = await entity_store.find_many(entities[::-1])
+    np.testing.assert_array_equal(actual_start, start_datetimes[::-1])
+    np.testing.assert_array_equal(actual_end, end_datetimes[::-1])
+    with pytest.raises(ValueError):
+        await entity_store.find_many(["XSHG.6005191"])
+
+
+async def test_update_many_entity(
+    entity_store: EntityStore,
+    entities: List[str],
+    start_datetimes: np.array,
+    end_datetimes: np.array,
+) -> None:
+    await entity_store.insert_many(entities, start_datetimes, end_datetimes)
+    new_end_datetimes = pd.DatetimeIndex(
+        ["2020-12-31 08:00", "2020-12-31 08:00", "2020-12-31 08:00"],
+        tz="Asia/Shanghai",
+    )
+    await entity_store.update_many(entities, end_datetimes=new_end_datetimes)
+    assert await entity_store.find("XSHG.600000") == (
+        pendulum.parse("2020-03-01"),
+        pendulum.parse("2020-12-31"),
+    )
+    with pytest.raises(ValueError):
+        await entity_store.update_many(
+            ["XSHG.6005191"], end_datetimes=new_end_datetimes[:1]
+        )
+    with pytest.raises(ValueError):
+        await entity_store.update_many(
+            entities[:1], start_datetimes=pd.DatetimeIndex(["2021-01-01"])
+        )
+    assert (await entity_store.find(entities[0]))[0] == pendulum.parse(
+        start_datetimes[0].astype(str)
+    )
+
+
+async def test_delete_many_entity(
+    entity_store: EntityStore,
+    entities: List[str],
+    start_datetimes: np.array,
+    end_datetimes: np.array,
+) -> None:
+    await entity_store.insert_many(entities, start_datetimes, end_datetimes)
+    await entity_store.delete_many(entities[:2])
+    assert list(entity_store._load_exists_data()) == ["XSHG.600000"]
+    with pytest.raises(ValueError):
+        await entity_store.delete_many(entities[:2])
+
+
+async def test_concurrent_entity_updates(
+    tmp_path: pathlib.Path, entity_store_created: EntityStore
+) -> None:
+    other = EntityStore(tmp_path)
+    await entity_store_created.update(
+        "XSHG.600519", end_datetime=pendulum.parse("2020-02-29")
+    )
+    await other.update("XSHG.600519", start_datetime=pendulum.parse("2020-01-15"))
+    assert await EntityStore(tmp_path).find("XSHG.600519") == (
+        pendulum.parse("2020-01-15"),
+        pendulum.parse("2020-02-29"),
+    )
+    await entity_store_created.update(
+        "XSHG.600519", start_datetime=pendulum.parse("2019-12-01")
+    )
+    await other.update("XSHG.600519", end_datetime=pendulum.parse("2020-01-20"))
+    assert await EntityStore(tmp_path).find("XSHG.600519") == (
+        pendulum.parse("2019-12-01"),
+        pendulum.parse("2020-01-20"),
+    )
+
+
+async def test_legacy_entity_ranges(tmp_path: pathlib.Path) -> None:
+    entity_store = EntityStore(tmp_path)
+    entity_store._data["XSHG.600519"] = (
+        pendulum.parse("2020-01-01"),
+        pendulum.parse("2020-01-31"),
+    )
+    await entity_store._data.save()
+    entity_store = EntityStore(tmp_path)
+    assert await entity_store.find("XSHG.600519") == (
+        pendulum.parse("2020-01-01"),
+        pendulum.parse("2020-01-31"),
+    )
+    starts, ends = await entity_store.find_many(["XSHG.600519"])
+    np.testing.assert_array_equal(starts, np.array(["2020-01-01"], "datetime64[ns]"))
+    await entity_store.update("XSHG.600519", end_datetime=pendulum.parse("2020-02-29"))
+    assert await EntityStore(tmp_path).find("XSHG.600519") == (
+        pendulum.parse("2020-01-01"),
+        pendulum.parse("2020-02-29"),
+    )
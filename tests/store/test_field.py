@@ -1,9 +1,17 @@
+import asyncio
+import os
 import pathlib
 
 import numpy as np
 import pytest
+from pytest import MonkeyPatch
 
+from flumen.storage.big_array import MemmapArrayStorage
+from flumen.storage.chunked_array import ChunkedArrayStorage
+from flumen.storage.codec import Codec
+from flumen.storage.wal import WriteAheadLog
 from flumen.store.field import FieldStore
+from flumen.utils.path import fsync_path
 
 
 @pytest.fixture()
@@ -86,3 +94,279 @@ async def test_delete_field_not_exists(
 ) -> None:
     with pytest.raises(ValueError):
         await field_store_created.delete("close")
+
+
+async def test_mmap_field(tmp_path: pathlib.Path, field_values: np.array) -> None:
+    field_store = FieldStore(tmp_path, mmap=True)
+    assert isinstance(field_store.get_field_storage("open"), MemmapArrayStorage)
+    await field_store.insert("open", field_values)
+    await field_store.update(
+        "open", start_index=1, end_index=2, values=np.array([1800], dtype="float32")
+    )
+    actual_array = await field_store.find("open", 0, -1)
+    np.testing.assert_array_equal(
+        actual_array, np.array([1858.48, 1800, 1779.18, 1753.2], dtype="float32")
+    )
+
+
+async def test_chunked_field(tmp_path: pathlib.Path, field_values: np.array) -> None:
+    field_store = FieldStore(tmp_path, chunk_size=2)
+    assert isinstance(field_store.get_field_storage("open"), ChunkedArrayStorage)
+    await field_store.insert("open", field_values)
+    assert field_store.get_field_uri("open").is_dir()
+    await field_store.update(
+        "open", start_index=1, end_index=3, values=np.array([1, 2], dtype="float32")
+    )
+    actual_array = await FieldStore(tmp_path).find("open", 0, -1)
+    np.testing.assert_array_equal(
+        actual_array, np.array([1858.48, 1, 2, 1753.2], dtype="float32")
+    )
+    await field_store.delete("open")
+    assert not field_store.get_field_uri("open").exists()
+
+
+async def test_codec_field(
+    tmp_path: pathlib.Path, field_values: np.array, monkeypatch: MonkeyPatch
+) -> None:
+    field_store = FieldStore(tmp_path, chunk_size=2)
+    await field_store.insert("open", field_values, codec="xor+zlib")
+    storage = field_store.get_field_storage("open")
+    assert isinstance(storage, ChunkedArrayStorage)
+    assert storage.codec == "xor+zlib"
+
+    decoded = []
+    decode = Codec.decode
+
+    def counting_decode(self: Codec, buffer: bytes, dtype: np.dtype) -> np.ndarray:
+        decoded.append(buffer)
+        return decode(self, buffer, dtype)
+
+    monkeypatch.setattr(Codec, "decode", counting_decode)
+    actual_array = await field_store.find("open", 2, 4)
+    np.testing.assert_array_equal(actual_array, field_values[2:4])
+    assert len(decoded) == 1
+
+
+async def test_find_many_field(
+    field_store_created: FieldStore, field_values: np.array
+) -> None:
+    await field_store_created.insert("close", field_values[::-1])
+    actual_array = await field_store_created.find_many(["open", "close"], 1, 3)
+    np.testing.assert_array_equal(
+        actual_array, np.stack([field_values[1:3], field_values[::-1][1:3]])
+    )
+    actual_dict = await field_store_created.find_many(
+        ["open", "close"], [0, 2], [1, -1], as_dict=True
+    )
+    np.testing.assert_array_equal(actual_dict["open"], field_values[0:1])
+    np.testing.assert_array_equal(actual_dict["close"], field_values[::-1][2:])
+    with pytest.raises(ValueError):
+        await field_store_created.find_many(["open", "close"], [0, 2], [1, -1])
+
+
+async def test_find_many_field_not_exists(field_store_created: FieldStore) -> None:
+    with pytest.raises(ValueError):
+        await field_store_created.find_many(["open", "close"], 0, -1)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3])
+async def test_aggregate_field(tmp_path: pathlib.Path, chunk_size: int) -> None:
+    field_store = FieldStore(tmp_path, chunk_size=chunk_size, block_size=4)
+    values = np.arange(20, dtype="float32")
+    await field_store.insert("open", values)
+    await field_store.update(
+        "open", start_index=2, end_index=4, values=np.array([50, np.nan])
+    )
+    await field_store.write("open", 22, np.array([7, 8], dtype="float32"))
+    expected = np.concatenate(
+        [[0, 1, 50, np.nan], np.arange(4, 20), [np.nan, np.nan, 7, 8]]
+    )
+    for start, stop in [(0, -1), (1, 18), (3, 6), (21, 24)]:
+        window = expected[slice(start, len(expected) if stop == -1 else stop)]
+        assert await field_store.aggregate("open", start, stop, "sum") == np.nansum(
+            window
+        )
+        assert await field_store.aggregate("open", start, stop, "max") == np.nanmax(
+            window
+        )
+    assert await field_store.aggregate("open", 0, -1, "count") == 21
+    field_store.get_field_summary("open").delete()
+    assert await field_store.aggregate("open", 0, -1, "mean") == np.nanmean(expected)
+    await field_store.delete("open")
+    assert len(field_store.get_field_summary("open")) == 0
+    with pytest.raises(ValueError):
+        await field_store.aggregate("open", 0, -1, "sum")
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3])
+async def test_aggregate_field_external_change(
+    tmp_path: pathlib.Path, chunk_size: int
+) -> None:
+    field_store = FieldStore(tmp_path, chunk_size=chunk_size, block_size=4)
+    await field_store.insert("open", np.arange(8, dtype="float32"))
+    assert await field_store.aggregate("open", 0, -1, "sum") == 28
+    # A same-length rewrite that bypasses the rollup must not be served stale.
+    field_store.get_field_storage("open")[0:1] = np.array([100], dtype="float32")
+    uri = field_store.get_field_uri("open")
+    for path in [uri, *(uri.iterdir() if uri.is_dir() else [])]:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert await field_store.aggregate("open", 0, -1, "sum") == 128
+    assert field_store.get_field_summary("open").is_synced(
+        field_store.get_field_storage("open")
+    )
+
+
+async def test_scan_field(tmp_path: pathlib.Path) -> None:
+    field_store = FieldStore(tmp_path, block_size=4)
+    values = np.arange(20, dtype="float32")
+    values[[2, 15]] = np.nan
+    await field_store.insert("volume", values[:10])
+    await field_store.write("volume", 10, values[10:])
+    positions = await field_store.scan("volume", 0, -1, (">", 16))
+    np.testing.assert_array_equal(positions, [17, 18, 19])
+    positions, matched = await field_store.scan(
+        "volume", 1, 16, "isnan", return_values=True
+    )
+    np.testing.assert_array_equal(positions, [2, 15])
+    assert np.isnan(matched).all()
+    with pytest.raises(ValueError):
+        await field_store.scan("close", 0, -1, "isnan")
+
+
+async def test_update_field_wal(
+    tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    field_store = FieldStore(tmp_path, wal=True)
+    await field_store.insert("open", np.zeros(100, dtype="float32"))
+    synced = []
+    fsync = os.fsync
+
+    def counting_fsync(fd: int) -> None:
+        synced.append(fd)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+    await asyncio.gather(
+        *(
+            field_store.update(
+                "open", start_index=i, end_index=i + 1, values=np.array([i + 1])
+            )
+            for i in range(100)
+        )
+    )
+    assert 0 < len(synced) < 100
+    np.testing.assert_array_equal(
+        await field_store.find("open", 0, -1), np.arange(1, 101, dtype="float32")
+    )
+    assert not (tmp_path / "FieldStore" / FieldStore.WAL_FILE).exists()
+    assert await field_store.aggregate("open", 0, -1, "sum") == 5050
+    with pytest.raises(ValueError):
+        await field_store.update(
+            "close", start_index=0, end_index=1, values=np.array([1])
+        )
+    with pytest.raises(ValueError):
+        await field_store.update(
+            "open", start_index=0, end_index=2, values=np.array([1, 2, 3])
+        )
+    assert not (tmp_path / "FieldStore" / FieldStore.WAL_FILE).exists()
+    await field_store.update("open", start_index=0, end_index=2, values=0)
+    assert await field_store.aggregate("open", 0, -1, "sum") == 5047
+
+
+async def test_update_field_wal_apply_error(
+    tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    field_store = FieldStore(tmp_path, wal=True)
+    await field_store.insert("open", np.zeros(10, dtype="float32"))
+    update = field_store._update
+
+    def failing_update(
+        field: str, start_index: int, end_index: int, values: np.array
+    ) -> None:
+        if start_index <= 3 < end_index:
+            raise ValueError("Disk error")
+        update(field, start_index, end_index, values)
+
+    monkeypatch.setattr(field_store, "_update", failing_update)
+    await asyncio.gather(
+        *(
+            field_store.update(
+                "open", start_index=i, end_index=i + 1, values=np.array([i + 1])
+            )
+            for i in range(10)
+        )
+    )
+    with pytest.raises(ValueError, match="Disk error"):
+        await field_store.flush()
+    expected = np.arange(1, 11, dtype="float32")
+    expected[3] = 0
+    np.testing.assert_array_equal(await field_store.find("open", 0, -1), expected)
+    assert not (tmp_path / "FieldStore" / FieldStore.WAL_FILE).exists()
+    rejected = WriteAheadLog(
+        tmp_path / "FieldStore" / FieldStore.WAL_REJECTED_FILE
+    ).replay()
+    assert [record[1:3] for record in rejected] == [(3, 4)]
+
+
+async def test_update_field_wal_durable(
+    tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    field_store = FieldStore(tmp_path, wal=True)
+    await field_store.insert("open", np.zeros(10, dtype="float32"))
+    events = []
+    truncate = WriteAheadLog.truncate
+
+    def recording_fsync_path(path: pathlib.Path) -> None:
+        events.append(path.name)
+        fsync_path(path)
+
+    def recording_truncate(wal: WriteAheadLog) -> None:
+        events.append("truncate")
+        truncate(wal)
+
+    monkeypatch.setattr("flumen.store.field.fsync_path", recording_fsync_path)
+    monkeypatch.setattr(WriteAheadLog, "truncate", recording_truncate)
+    await field_store.update("open", start_index=0, end_index=1, values=1)
+    await field_store.flush()
+    assert events == ["open.field", "open.rollup", "truncate"]
+
+
+async def test_recover_field_wal(
+    tmp_path: pathlib.Path, field_values: np.array
+) -> None:
+    await FieldStore(tmp_path).insert("open", field_values)
+    wal = WriteAheadLog(tmp_path / "FieldStore" / FieldStore.WAL_FILE)
+    wal.append(
+        [
+            ("open", 1, 3, np.array([1, 2], dtype="float32")),
+            ("open", 2, 3, np.array([3], dtype="float32")),
+            ("close", 0, 1, np.array([4], dtype="float32")),
+        ]
+    )
+    field_store = FieldStore(tmp_path, wal=True)
+    assert not wal.uri.exists()
+    np.testing.assert_array_equal(
+        await field_store.find("open", 0, -1),
+        np.array([field_values[0], 1, 3, field_values[3]], dtype="float32"),
+    )
+
+
+async def test_recover_field_wal_rejected(
+    tmp_path: pathlib.Path, field_values: np.array
+) -> None:
+    await FieldStore(tmp_path).insert("open", field_values)
+    wal = WriteAheadLog(tmp_path / "FieldStore" / FieldStore.WAL_FILE)
+    bad_record = ("open", 0, 2, np.array([1, 2, 3], dtype="float32"))
+    wal.append([bad_record, ("open", 3, 4, np.array([4], dtype="float32"))])
+    field_store = FieldStore(tmp_path, wal=True)
+    assert not wal.uri.exists()
+    np.testing.assert_array_equal(
+        await field_store.find("open", 0, -1),
+        np.array([*field_values[:3], 4], dtype="float32"),
+    )
+    rejected = WriteAheadLog(
+        tmp_path / "FieldStore" / FieldStore.WAL_REJECTED_FILE
+    ).replay()
+    assert len(rejected) == 1
+    np.testing.assert_array_equal(rejected[0][3], bad_record[3])
@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pendulum
+import pytest
+
+from flumen.models.frequency import Frequency
+from flumen.storage.dict import LogDictStorage
+from flumen.store.ingest import IngestTask, ingest, shard_tasks
+from flumen.store.timeseries import TimeSeriesStore
+from flumen.utils.executor import IOExecutor
+
+
+def load_frame(entities: int, start: str, end: str, scale: float) -> pd.DataFrame:
+    index = pd.date_range(start, end, freq="D", tz="UTC")
+    return pd.DataFrame(
+        {f"{i:06d}.XSHG": (index.dayofyear - 1) * scale + i for i in range(entities)},
+        index=index,
+    )
+
+
+def load_series(entity: int, start: str, end: str) -> pd.Series:
+    return load_frame(entity + 1, start, end, 1.0).iloc[:, -1]
+
+
+def test_shard_tasks() -> None:
+    tasks = [
+        IngestTask(field, "D", functools.partial(load_frame, 1, "2020", "2020", 1.0))
+        for field in ("open", "high", "low", "close")
+    ]
+    shards = shard_tasks(tasks, 2)
+    assert sorted(task.field for shard in shards for task in shard) == sorted(
+        task.field for task in tasks
+    )
+    assert shard_tasks(tasks * 2, 3) == shard_tasks(tasks * 2, 3)
+    with pytest.raises(ValueError):
+        shard_tasks(tasks + [tasks[0]._replace(entity="a")], 2)
+
+
+def test_ingest(tmp_path: pathlib.Path) -> None:
+    uri = str(tmp_path)
+    tasks = [
+        IngestTask(field, "D", functools.partial(load_frame, 20, start, end, scale))
+        for field, scale in (("open", 1.0), ("close", 2.0), ("volume", 3.0))
+        for start, end in (("2020-01-01", "2020-01-20"), ("2020-01-15", "2020-02-10"))
+    ] + [
+        IngestTask("vwap", "D", functools.partial(load_series, i, "2020-01-05", end), e)
+        for i, (e, end) in enumerate([("a", "2020-01-09"), ("b", "2020-02-01")])
+    ]
+    written = ingest(
+        uri,
+        tasks,
+        pendulum.parse("2020-01-01"),
+        pendulum.parse("2020-01-02"),
+        max_workers=4,
+    )
+    assert written == 3 * 2 * 20 + 2
+    with pytest.raises(ValueError):
+        ingest(
+            uri,
+            tasks[:1],
+            pendulum.parse("2020-01-02"),
+            pendulum.parse("2020-01-20"),
+            max_workers=1,
+        )
+
+    async def check() -> None:
+        store = TimeSeriesStore(uri)
+        freq = Frequency.from_str("D")
+        start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-02-10")
+        for field, scale in (("open", 1.0), ("close", 2.0), ("volume", 3.0)):
+            expected = load_frame(20, "2020-01-01", "2020-02-10", scale)
+            for entity in expected.columns:
+                actual = await store.find_one(entity, field, freq, start, end)
+                np.testing.assert_array_equal(
+                    actual.values.values, expected[entity].to_numpy("float32")
+                )
+        actual = await store.find_one("b", "vwap", freq, start, end)
+        assert np.isnan(actual.values.values).sum() == 4 + 9
+        starts, ends = await store.entity_store.find_many(["000019.XSHG", "b"])
+        np.testing.assert_array_equal(
+            ends, pd.DatetimeIndex(["2020-02-10", "2020-02-01"]).values
+        )
+
+    asyncio.run(check())
+
+
+def append_keys(uri: pathlib.Path, worker: int) -> None:
+    async def run() -> None:
+        storage = LogDictStorage[str, int](
+            uri, io_executor=IOExecutor(process_lock=True), compact_threshold=2048
+        )
+        for i in range(50):
+            storage[f"{worker}.{i}"] = i
+            await storage.save()
+
+    asyncio.run(run())
+
+
+def test_concurrent_log_dict_writers(tmp_path: pathlib.Path) -> None:
+    uri = tmp_path / "regions.dict"
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(append_keys, [uri] * 4, range(4)))
+    assert len(LogDictStorage[str, int](uri)) == 200
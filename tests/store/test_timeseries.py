@@ -1,9 +1,13 @@
+import asyncio
 import pathlib
+from typing import Any
 
+import numpy as np
 import pandas as pd
 import pendulum
 import pytest
 
+from flumen.frequency.datetime import date_range_values
 from flumen.models.frequency import Frequency
 from flumen.models.timeseries import TimeSeries
 from flumen.store.timeseries import TimeSeriesStore
@@ -42,6 +46,257 @@ def store(tmp_path: pathlib.Path) -> TimeSeriesStore:
     return TimeSeriesStore(str(tmp_path))
 
 
+def make_ts(entity: str, start: str, end: str, values: list) -> TimeSeries:
+    freq = Frequency.from_str("D")
+    return TimeSeries(
+        entity=entity,
+        field="close",
+        freq=freq,
+        start_datetime=pendulum.parse(start),
+        end_datetime=pendulum.parse(end),
+        values=pd.Series(
+            values,
+            dtype="float32",
+            index=pd.date_range(start, end, freq="D", tz="UTC"),
+        ),
+    )
+
+
 async def test_insert_one(store: TimeSeriesStore, ts: TimeSeries) -> None:
     await store.insert_one(ts)
-    print(ts)
+    actual = await store.find_one(
+        ts.entity, ts.field, ts.freq, ts.start_datetime, ts.end_datetime
+    )
+    pd.testing.assert_series_equal(actual.values, ts.values)
+    actual = await TimeSeriesStore(str(store.root_uri)).find_one(
+        ts.entity,
+        ts.field,
+        ts.freq,
+        pendulum.parse("2022-03-03"),
+        pendulum.parse("2022-03-15"),
+    )
+    np.testing.assert_array_equal(
+        actual.values.values,
+        np.array(
+            [1779.18, 1753.2, 1707, 1780.5, 1800, 1844.88] + [np.nan] * 3,
+            dtype="float32",
+        ),
+    )
+
+
+async def test_insert_one_offsets(store: TimeSeriesStore) -> None:
+    await store.insert_one(make_ts("a", "2020-01-01", "2020-01-03", [1, 2, 3]))
+    await store.insert_one(make_ts("b", "2020-01-05", "2020-01-06", [5, 6]))
+    await store.insert_one(make_ts("a", "2020-01-03", "2020-01-05", [7, 8, 9]))
+    await store.insert_one(make_ts("a", "2020-01-08", "2020-01-08", [10]))
+    assert store._regions[store.get_field_key("b", "close", Frequency.from_str("D"))]
+    actual = await store.find_one(
+        "a",
+        "close",
+        Frequency.from_str("D"),
+        pendulum.parse("2020-01-01"),
+        pendulum.parse("2020-01-08"),
+    )
+    np.testing.assert_array_equal(
+        actual.values.values,
+        np.array([1, 2, 7, 8, 9, np.nan, np.nan, 10], dtype="float32"),
+    )
+    actual = await store.find_one(
+        "b",
+        "close",
+        Frequency.from_str("D"),
+        pendulum.parse("2020-01-01"),
+        pendulum.parse("2020-01-06"),
+    )
+    np.testing.assert_array_equal(
+        actual.values.values,
+        np.array([np.nan] * 4 + [5, 6], dtype="float32"),
+    )
+    await store.insert_one(make_ts("b", "2020-01-03", "2020-01-03", [3]))
+    actual = await store.find_one(
+        "b",
+        "close",
+        Frequency.from_str("D"),
+        pendulum.parse("2020-01-01"),
+        pendulum.parse("2020-01-06"),
+    )
+    np.testing.assert_array_equal(
+        actual.values.values,
+        np.array([np.nan] * 2 + [3, np.nan, 5, 6], dtype="float32"),
+    )
+    assert (
+        store._regions[store.get_field_key("b", "close", Frequency.from_str("D"))] == 2
+    )
+
+
+async def test_insert_frame_backfill(store: TimeSeriesStore) -> None:
+    freq = Frequency.from_str("D")
+    index = pd.date_range("2020-01-01", "2020-01-10", freq="D", tz="UTC")
+    frame = pd.DataFrame({"a": np.arange(10), "b": np.arange(10) + 10}, index=index)
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-01-10")
+    await store.calendar_store.insert(freq, start, end)
+    await store.insert_frame("close", freq, frame.iloc[5:])
+    await store.insert_frame("close", freq, frame.iloc[:2])
+    for entity in frame.columns:
+        actual = await store.find_one(entity, "close", freq, start, end)
+        expected = frame[entity].to_numpy("float32")
+        expected[2:5] = np.nan
+        np.testing.assert_array_equal(actual.values.values, expected)
+    starts, _ = await store.entity_store.find_many(["a", "b"])
+    np.testing.assert_array_equal(starts, pd.DatetimeIndex(["2020-01-01"] * 2).values)
+
+
+async def test_find_one_not_exists(store: TimeSeriesStore) -> None:
+    with pytest.raises(ValueError):
+        await store.find_one(
+            "a",
+            "close",
+            Frequency.from_str("D"),
+            pendulum.parse("2020-01-01"),
+            pendulum.parse("2020-01-08"),
+        )
+
+
+async def test_find_one_zero_copy(store: TimeSeriesStore) -> None:
+    await store.insert_one(make_ts("a", "2020-01-01", "2020-01-05", [1, 2, 3, 4, 5]))
+    actual = await store.find_one(
+        "a",
+        "close",
+        Frequency.from_str("D"),
+        pendulum.parse("2020-01-02"),
+        pendulum.parse("2020-01-04"),
+    )
+    values = actual.values.values
+    assert isinstance(values.base, np.memmap) or isinstance(values, np.memmap)
+    assert not values.flags.writeable
+    np.testing.assert_array_equal(values, np.array([2, 3, 4], dtype="float32"))
+    index = date_range_values(
+        Frequency.from_str("D"),
+        pendulum.parse("2020-01-02"),
+        pendulum.parse("2020-01-04"),
+    )
+    assert np.shares_memory(actual.values.index.asi8, index)
+
+
+async def test_insert_frame(store: TimeSeriesStore, ts: TimeSeries) -> None:
+    freq = Frequency.from_str("SSED")
+    index = ts.values.index
+    df = pd.DataFrame(
+        {"a": np.arange(8), "b": np.arange(8) * 2.0, "c": np.full(8, np.nan)},
+        index=index,
+    )
+    await store.insert_frame("close", freq, df.iloc[:5])
+    await store.insert_frame("close", freq, df.iloc[3:])
+    for entity in df.columns:
+        actual = await store.find_one(
+            entity, "close", freq, ts.start_datetime, ts.end_datetime
+        )
+        np.testing.assert_array_equal(
+            actual.values.values, df[entity].to_numpy(dtype="float32")
+        )
+    starts, ends = await store.entity_store.find_many(["a", "c"])
+    np.testing.assert_array_equal(starts, index[[0, 0]].tz_localize(None).values)
+    np.testing.assert_array_equal(ends, index[[-1, -1]].tz_localize(None).values)
+    await store.insert_one(ts)
+    assert "XSHG.600519" in store.entity_store
+
+
+async def test_insert_frame_invalid(store: TimeSeriesStore) -> None:
+    freq = Frequency.from_str("D")
+    index = pd.date_range("2020-01-01", "2020-01-03", freq="D")
+    with pytest.raises(ValueError):
+        await store.insert_frame("close", freq, pd.DataFrame({"a": [1, 2, 3]}, index))
+    with pytest.raises(ValueError):
+        await store.insert_frame(
+            "close",
+            freq,
+            pd.DataFrame({"a": [1, 2]}, index[[0, 2]].tz_localize("UTC")),
+        )
+
+
+async def test_iter_range(
+    store: TimeSeriesStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    freq = Frequency.from_str("D")
+    await store.insert_one(make_ts("b", "2020-01-01", "2020-01-02", [1, 2]))
+    await store.insert_one(make_ts("a", "2020-01-03", "2020-01-10", list(range(8))))
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-01-09 12:00")
+    chunks = [
+        chunk async for chunk in store.iter_range("a", "close", freq, start, end, 3)
+    ]
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3]
+    expected = await store.find_one("a", "close", freq, start, end)
+    pd.testing.assert_series_equal(pd.concat(chunks), expected.values)
+
+    read_chunk = store._read_chunk
+    started = []
+
+    async def recording_read_chunk(*args: Any) -> pd.Series:
+        started.append(args[2])
+        return await read_chunk(*args)
+
+    monkeypatch.setattr(store, "_read_chunk", recording_read_chunk)
+    chunks_iter = store.iter_range("a", "close", freq, start, end, chunk_rows=2)
+    first_chunk = await chunks_iter.__anext__()
+    assert len(first_chunk) == 2
+    await asyncio.sleep(0)
+    assert started == [0, 2]
+    await chunks_iter.aclose()
+    assert started == [0, 2]
+
+
+@pytest.mark.filterwarnings("error:Discarding nonzero nanoseconds")
+async def test_resample(store: TimeSeriesStore) -> None:
+    freq, target_freq = Frequency.from_str("1T"), Frequency.from_str("1H")
+    start, end = pendulum.parse("2020-01-01"), pendulum.parse("2020-01-01 23:59")
+    index = pd.date_range("2020-01-01", "2020-01-01 23:59", freq="T", tz="UTC")
+    values = pd.Series(np.arange(len(index)), index=index, dtype="float32")
+    await store.insert_one(
+        TimeSeries(
+            entity="a",
+            field="close",
+            freq=freq,
+            start_datetime=start,
+            end_datetime=end,
+            values=values,
+        )
+    )
+    target_end = pendulum.parse("2020-01-01 23:00")
+    actual = await store.resample(
+        "a", "close", freq, target_freq, start, target_end, "ohlc", 100, "hourly"
+    )
+    expected = values.resample("1H").ohlc()
+    pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+    stored = await store.find_one("a", "hourly_high", target_freq, start, target_end)
+    pd.testing.assert_series_equal(
+        stored.values, expected["high"], check_freq=False, check_names=False
+    )
+    with pytest.raises(ValueError):
+        await store.resample("a", "close", freq, target_freq, start, end, "median")
+
+
+async def test_resample_market_sessions(store: TimeSeriesStore) -> None:
+    freq, target_freq = Frequency.from_str("SSET"), Frequency.from_str("SSED")
+    start, end = pendulum.parse("2022-03-01"), pendulum.parse("2022-03-03")
+    index = pd.DatetimeIndex(date_range_values(freq, start, end), tz="UTC")
+    values = pd.Series(np.arange(len(index)), index=index, dtype="float32")
+    await store.insert_one(
+        TimeSeries(
+            entity="a",
+            field="close",
+            freq=freq,
+            start_datetime=start,
+            end_datetime=end,
+            values=values,
+        )
+    )
+    actual = await store.resample("a", "close", freq, target_freq, start, end, "sum")
+    expected = values.groupby(index.tz_convert("Asia/Shanghai").date).sum()
+    np.testing.assert_array_equal(actual.values, expected.values)
+    half_hourly = await store.resample(
+        "a", "close", freq, Frequency.from_str("30SSET"), start, end, "last", 7
+    )
+    assert len(half_hourly) == 3 * 8
+    np.testing.assert_array_equal(
+        half_hourly.values, values.values[29::30].astype("float32")
+    )
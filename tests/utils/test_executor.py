@@ -0,0 +1,83 @@
+import asyncio
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from flumen.utils.executor import IOExecutor, get_io_executor, set_io_executor
+
+
+@pytest.fixture()
+def io_executor() -> IOExecutor:
+    return IOExecutor(ThreadPoolExecutor(max_workers=4), max_concurrency=4)
+
+
+def sleep(seconds: float) -> int:
+    time.sleep(seconds)
+    return threading.get_ident()
+
+
+async def test_run_off_event_loop(io_executor: IOExecutor) -> None:
+    assert await io_executor.run(sleep, 0) != threading.get_ident()
+
+
+async def test_run_reads_overlap(
+    io_executor: IOExecutor, tmp_file: pathlib.Path
+) -> None:
+    start = time.perf_counter()
+    await asyncio.gather(*(io_executor.run(sleep, 0.1, uri=tmp_file) for _ in range(4)))
+    assert time.perf_counter() - start < 0.3
+
+
+async def test_run_writes_exclusive(
+    io_executor: IOExecutor, tmp_file: pathlib.Path
+) -> None:
+    events: List[str] = []
+
+    def write(name: str) -> None:
+        events.append(f"{name}-start")
+        time.sleep(0.05)
+        events.append(f"{name}-end")
+
+    await asyncio.gather(
+        io_executor.run(write, "a", uri=tmp_file, exclusive=True),
+        io_executor.run(write, "b", uri=tmp_file, exclusive=True),
+        io_executor.run(sleep, 0.05, uri=tmp_file),
+    )
+    assert events == ["a-start", "a-end", "b-start", "b-end"]
+
+
+async def test_run_locks_many_uris(
+    io_executor: IOExecutor, tmp_path: pathlib.Path
+) -> None:
+    events: List[str] = []
+    uris = [tmp_path / "a", tmp_path / "b"]
+
+    def write(name: str) -> None:
+        events.append(f"{name}-start")
+        time.sleep(0.05)
+        events.append(f"{name}-end")
+
+    await asyncio.gather(
+        io_executor.run(write, "a", uri=uris[::-1], exclusive=True),
+        io_executor.run(write, "b", uri=uris[1], exclusive=True),
+        io_executor.run(write, "c", uri=uris, exclusive=True),
+    )
+    assert events == ["a-start", "a-end", "b-start", "b-end", "c-start", "c-end"]
+
+
+async def test_run_max_concurrency(tmp_file: pathlib.Path) -> None:
+    io_executor = IOExecutor(ThreadPoolExecutor(max_workers=4), max_concurrency=1)
+    start = time.perf_counter()
+    await asyncio.gather(*(io_executor.run(sleep, 0.05) for _ in range(3)))
+    assert time.perf_counter() - start >= 0.15
+
+
+def test_set_io_executor(io_executor: IOExecutor) -> None:
+    default_io_executor = get_io_executor()
+    set_io_executor(io_executor)
+    assert get_io_executor() is io_executor
+    set_io_executor(default_io_executor)
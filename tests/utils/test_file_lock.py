@@ -0,0 +1,46 @@
+import fcntl
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from flumen.utils.file_lock import file_lock, get_lock_uri
+
+
+def probe_lock(uri: pathlib.Path, exclusive: bool) -> bool:
+    with open(get_lock_uri(uri), "a+b") as f:
+        try:
+            fcntl.flock(
+                f.fileno(),
+                (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB,
+            )
+        except BlockingIOError:
+            return False
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return True
+
+
+def test_file_lock(tmp_path: pathlib.Path) -> None:
+    uri = tmp_path / "D.range"
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        with file_lock(uri, exclusive=True):
+            assert not pool.submit(probe_lock, uri, False).result()
+            assert not pool.submit(probe_lock, uri, True).result()
+        with file_lock(uri, exclusive=False):
+            assert pool.submit(probe_lock, uri, False).result()
+            assert not pool.submit(probe_lock, uri, True).result()
+        assert pool.submit(probe_lock, uri, True).result()
+    assert get_lock_uri(uri).exists()
+    assert not uri.exists()
+
+
+def test_file_lock_reentrant(tmp_path: pathlib.Path) -> None:
+    uri = tmp_path / "D.range"
+    with file_lock(uri):
+        with file_lock(uri, exclusive=False):
+            with file_lock(uri):
+                pass
+    with file_lock(uri, exclusive=False):
+        with pytest.raises(RuntimeError):
+            with file_lock(uri):
+                pass
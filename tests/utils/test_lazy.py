@@ -0,0 +1,59 @@
+from typing import List
+
+import pytest
+
+from flumen.utils.lazy import LazyDict
+
+
+@pytest.fixture()
+def loads() -> List[str]:
+    return []
+
+
+@pytest.fixture()
+def lazy_dict(loads: List[str]) -> LazyDict:
+    data = LazyDict[str, str]()
+    data.register("a", lambda: loads.append("a") or "A")  # type: ignore
+    data.register("b", lambda: loads.append("b") or "B")  # type: ignore
+    return data
+
+
+def test_get_lazy_dict(lazy_dict: LazyDict, loads: List[str]) -> None:
+    assert "a" in lazy_dict
+    assert "c" not in lazy_dict
+    assert loads == []
+    assert lazy_dict["a"] == "A"
+    assert lazy_dict["a"] == "A"
+    assert loads == ["a"]
+    assert lazy_dict.is_loaded("a")
+    assert not lazy_dict.is_loaded("b")
+    with pytest.raises(KeyError):
+        _ = lazy_dict["c"]
+
+
+def test_set_lazy_dict(lazy_dict: LazyDict) -> None:
+    lazy_dict["c"] = "C"
+    assert lazy_dict["c"] == "C"
+    assert list(lazy_dict) == ["a", "b", "c"]
+    assert len(lazy_dict) == 3
+
+
+def test_del_lazy_dict(lazy_dict: LazyDict) -> None:
+    del lazy_dict["a"]
+    assert "a" not in lazy_dict
+    assert len(lazy_dict) == 1
+    with pytest.raises(KeyError):
+        del lazy_dict["a"]
+
+
+def test_unload_lazy_dict(lazy_dict: LazyDict, loads: List[str]) -> None:
+    lazy_dict["c"] = "C"
+    assert not lazy_dict.unload("a")
+    _ = lazy_dict["a"]
+    _ = lazy_dict["b"]
+    assert lazy_dict.unload("a")
+    assert not lazy_dict.is_loaded("a")
+    assert lazy_dict.unload_idle(0) == ["b"]
+    assert lazy_dict.is_loaded("c")
+    assert lazy_dict["a"] == "A"
+    assert loads == ["a", "b", "a"]